@@ -0,0 +1,122 @@
+"""
+Session analytics queue flushed to Google Analytics once per script run.
+
+Events are queued in session_state (bounded, oldest dropped first) and sent
+together by a single component render at the end of the run, so analytics
+costs one iframe per page no matter how many events a run produced. Events
+queued by a run that ends in st.rerun() go out with the next run.
+
+Page-view style events (rendered, not clicked) are sent once per page visit
+with track_view(); the session-start page view is sent once per session.
+
+With a server-side exporter (ANALYTICS_SINK) the drained events are handed to
+it instead and nothing is rendered.
+"""
+import os
+import time
+from collections import deque
+import streamlit as st
+import streamlit.components.v1 as components
+
+try:
+    from app.utils import metrics
+except ImportError:
+    from utils import metrics
+
+QUEUE_KEY = "analytics_queue"
+BATCH_KEY = "analytics_batch"
+VIEW_PAGE_KEY = "analytics_view_page"
+VIEWS_SENT_KEY = "analytics_views_sent"
+SESSION_STARTED_KEY = "analytics_session_started"
+# The queue is drained every run, so this only bites when runs keep ending in st.rerun()
+MAX_EVENTS = 50
+
+_component = components.declare_component(
+    "analytics_batch", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "analytics_frontend")
+)
+
+EVENTS_QUEUED = metrics.REGISTRY.counter(
+    "analytics_events_queued_total", "Analytics events queued.", ("event_name",)
+)
+EVENTS_DROPPED = metrics.REGISTRY.counter(
+    "analytics_events_dropped_total", "Analytics events dropped because a session's queue was full."
+)
+
+
+def _state(state):
+    return st.session_state if state is None else state
+
+
+def _queue(state):
+    queue = state.get(QUEUE_KEY)
+    if queue is None:
+        queue = state[QUEUE_KEY] = deque(maxlen=MAX_EVENTS)
+    return queue
+
+
+def _event(event_name, event_category, event_label, value):
+    return {
+        "name": event_name,
+        "params": {"event_category": event_category, "event_label": event_label, "value": value},
+        "time": time.time(),
+    }
+
+
+def track(event_category, event_label="", value=1, event_name="custom_event", state=None):
+    """Queue an event (e.g. a click) for the next flush."""
+    queue = _queue(_state(state))
+    if len(queue) == queue.maxlen:
+        EVENTS_DROPPED.inc()
+    queue.append(_event(event_name, event_category, event_label, value))
+    EVENTS_QUEUED.inc(event_name=event_name)
+
+
+def track_view(page, event_category, event_label="", value=1, event_name="custom_event", state=None):
+    """Queue an event once per visit to page; reruns of the same page do not repeat it."""
+    state = _state(state)
+    if state.get(VIEW_PAGE_KEY) != page:
+        state[VIEW_PAGE_KEY] = page
+        state[VIEWS_SENT_KEY] = set()
+    sent = state[VIEWS_SENT_KEY]
+    key = (event_name, event_category, event_label)
+    if key in sent:
+        return
+    sent.add(key)
+    track(event_category, event_label, value, event_name, state)
+
+
+def track_session_start(state=None):
+    """Queue the app's page view once per session."""
+    state = _state(state)
+    if state.get(SESSION_STARTED_KEY):
+        return
+    state[SESSION_STARTED_KEY] = True
+    track("send_page_view", "send_page_view", event_name="app_main_page", state=state)
+
+
+def drain(state=None):
+    """Remove and return all queued events, oldest first."""
+    queue = _state(state).get(QUEUE_KEY)
+    if not queue:
+        return []
+    events = list(queue)
+    queue.clear()
+    return events
+
+
+def flush(ga_id, key="analytics", exporter=None, client_id=None):
+    """
+    Send every queued event: to exporter when given (never blocks), otherwise
+    with one component render. Without either the queue is just emptied.
+    """
+    events = drain()
+    if exporter is not None:
+        if events:
+            exporter.submit(client_id, events)
+        return
+    if not ga_id:
+        return
+    if events:
+        st.session_state[BATCH_KEY] = st.session_state.get(BATCH_KEY, 0) + 1
+    # Rendered on every run, events or not, so the iframe stays mounted
+    _component(id=ga_id, events=events, batch=st.session_state.get(BATCH_KEY, 0), key=key, default=None)
@@ -10,11 +10,15 @@ if app_dir not in sys.path:
 try:
     from app.utils.i18n import t
     from app.config.constants import SUPPORTED_LANGUAGES, DEFAULT_LANGUAGE
+    from app.utils.static_assets import static_serving_available, stylesheet
+    from app.utils.image_assets import picture_html
 except ImportError:
     # Fallback imports for deployment environments
     try:
         from utils.i18n import t
         from config.constants import SUPPORTED_LANGUAGES, DEFAULT_LANGUAGE
+        from utils.static_assets import static_serving_available, stylesheet
+        from utils.image_assets import picture_html
     except ImportError:
         # Final fallback with hardcoded values
         def t(key, lang="he", **kwargs):
@@ -26,7 +30,17 @@ except ImportError:
         SUPPORTED_LANGUAGES = ["en", "he", "fr", "ru"]
         DEFAULT_LANGUAGE = "he"
 
-import streamlit.components.v1 as components
+        def stylesheet(name):
+            pass
+
+        def static_serving_available():
+            return False
+
+        def picture_html(name, alt="", css_class=""):
+            return None
+
+# Used when static/ is not served (see app/utils/static_assets.py)
+BANNER_URL = "https://icvcosdvagxhxfniwpko.supabase.co/storage/v1/object/public/muni/website/compressed_banner.jpg"
 
 def render_header(current_language=DEFAULT_LANGUAGE, on_language_change=None, search_query="", on_search=None):
     """
@@ -35,90 +49,7 @@ def render_header(current_language=DEFAULT_LANGUAGE, on_language_change=None, se
     2. Banner image
     3. Search box
     """
-    # Mobile-optimized CSS for header
-    st.markdown(
-        """
-        <style>
-        /* Force light theme - override dark mode */
-        .stApp {
-            background-color: white !important;
-            color: black !important;
-        }
-        
-        .main .block-container {
-            background-color: white !important;
-            color: black !important;
-        }
-                
-        /* Ensure buttons and inputs stay light */
-        button[data-testid="stBaseButton-secondary"] {
-            background-color: #f0f2f6 !important;
-            color: black !important;
-            border: 1px solid #ddd !important;
-        }
-        
-        input[type="text"] {
-            background-color: white !important;
-            color: black !important;
-            border: 1px solid #ddd !important;
-        }
-        
-        /* Remove default Streamlit padding/margin from top */
-        .main .block-container { padding-top: 0rem; padding-bottom: 0rem; }
-        .stApp > header { height: 0rem; }
-        .stMainBlockContainer {padding: 4rem 1rem 10rem;} 
-        .header-lang-row { display: flex; flex-direction: row; justify-content: center; gap: 0.5em; margin-bottom: 0.5em; }
-        .header-banner { display: flex; justify-content: center; margin-bottom: 0.5em; }
-        .header-search-row { display: flex; justify-content: center; margin-bottom: 1em; }
-        .header-search-row input { font-size: 1.2em; padding: 0.7em; border-radius: 0.5em; }
-        /* Center align language buttons */         
-         .st-key-lang_he,
-         .st-key-lang_en,
-         .st-key-lang_fr,
-         .st-key-lang_ru{
-             text-align: center !important;
-             margin: 0 auto !important;
-         }
-
-        @media (max-width: 640px) {
-            .header-banner, .header-search-row { flex-direction: column; align-items: center; }
-
-                     ### Mandatory for lang flags button will be horizontaly in mobile view
-         .stColumn[data-testid="stColumn"]:has(div[data-testid="stVerticalBlock"]):has(div[class*="st-key-lang"]) {
-             min-width: auto !important;
-         }
-         div[data-testid="stColumn"]:has(div[data-testid="stVerticalBlock"]):has(div[class*="st-key-lang"]) {
-             min-width: auto !important;
-         }
-                  
-         /* Hide the parent container for this CSS-only markdown */
-         div[data-testid="stElementContainer"]:has(.header-container1) {
-             display: none !important;
-             height: 0 !important;
-             margin: 0 !important;
-             padding: 0 !important;
-         }
-
-         div[data-testid="stElementContainer"]:has(.header-container2) {
-             display: none !important;
-             height: 0 !important;
-             margin: 0 !important;
-             padding: 0 !important;
-         }
-
-         div[data-testid="stElementContainer"]:has(.header-container3) {
-             display: none !important;
-             height: 0 !important;
-             margin: 0 !important;
-             padding: 0 !important;
-         }
-
-         }
-         </style>
-         <div class="header-container1"></div>
-         """,
-        unsafe_allow_html=True,
-    )
+    stylesheet("app.css")
     # 1. Language icons row
     lang_labels = {"en": "🇬🇧", "he": "🇮🇱", "fr": "🇫🇷", "ru": "🇷🇺"}
     lang_cols = st.columns(len(SUPPORTED_LANGUAGES))
@@ -127,64 +58,19 @@ def render_header(current_language=DEFAULT_LANGUAGE, on_language_change=None, se
             if st.button(lang_labels.get(lang, lang), key=f"lang_{lang}"):
                 if on_language_change:
                     on_language_change(lang)
-    # 2. Banner image (clickable with persistent JavaScript)
-
-
-    components.html(f"""
-<style>
-.clickable-banner {{
-    width: 100%;
-    cursor: pointer;
-    display: block;
-    max-height: none;
-    height: 140px;
-    object-fit: contain;
-}}
-.clickable-banner:hover {{
-    opacity: 0.9;
-}}
-@media (max-width: 600px) {{
-    .clickable-banner {{
-        height: 140px;
-    }}
-}}
-</style>
-
-<img src="https://icvcosdvagxhxfniwpko.supabase.co/storage/v1/object/public/muni/website/compressed_banner.jpg" 
-     class="clickable-banner"
-     onclick="window.parent.location.reload()" 
-     title="Click to refresh page" />
+    # 2. Banner image; clicking it starts over
+    banner = picture_html("banner", css_class="clickable-banner") if static_serving_available() else None
+    if banner is None:
+        banner = f'<img src="{BANNER_URL}" class="clickable-banner" />'
+    st.markdown(
+        f'<a href="./" target="_self" class="banner-link" title="Click to refresh page">{banner}</a>',
+        unsafe_allow_html=True,
+    )
 
-<script>
-// Auto-adjust height and ensure click works
-window.onload = function() {{
-    const img = document.querySelector('.clickable-banner');
-    if (img) {{
-        img.addEventListener('click', function(e) {{
-            e.preventDefault();
-            if (window.parent && window.parent !== window) {{
-                window.parent.location.reload();
-            }} else {{
-                window.location.reload();
-            }}
-        }});
-    }}
-}};
-</script>
-""", height=140)
-    
     # Anonymous ticket text paragraph
     st.markdown(
-        f"""
-        <div style="text-align: center; margin: 1rem 0; padding: 0.8rem; 
-                    background-color: #f8f9fa; border-radius: 8px; 
-                    border-left: 4px solid #007bff;">
-            <p style="margin: 0; font-size: 1.1rem; color: #495057; font-weight: 500;">
-                {t('common.anonymous_ticket', current_language)}
-            </p>
-        </div>
-        """, 
-        unsafe_allow_html=True
+        f'<div class="anonymous-ticket"><p>{t("common.anonymous_ticket", current_language)}</p></div>',
+        unsafe_allow_html=True,
     )
     
     # 3. Search box (simple and compact)
@@ -203,17 +89,4 @@ window.onload = function() {{
         st.markdown('</div>', unsafe_allow_html=True)
     # RTL styling for Hebrew
     if current_language == "he":
-        st.markdown("""
-                 <style>
-         .stApp { direction: rtl; text-align: right; }
-         
-         /* Hide the parent container for this CSS-only markdown */
-         div[data-testid="stElementContainer"]:has(.header-container2) {
-             display: none !important;
-             height: 0 !important;
-             margin: 0 !important;
-             padding: 0 !important;
-         }
-         </style>
-         <div class="header-container2"></div>
-         """, unsafe_allow_html=True) 
\ No newline at end of file
+        stylesheet("rtl.css")
@@ -1,30 +1,289 @@
+"""
+Application settings.
+
+get_config() reads the environment (with .env filling in unset variables)
+once per process into a frozen AppConfig and validates it; an invalid value
+raises ConfigError naming the variable. The same object is returned until a
+reload:
+
+- reload_config(), or SIGHUP once install_reload_signal() was called
+  (app/serve.py does; Streamlit's script threads cannot install handlers)
+- with CONFIG_RELOAD=1, an edited .env (checked at most every
+  CONFIG_RELOAD_INTERVAL seconds)
+
+A reload that fails validation keeps the current config. When the config
+changes, the callbacks registered with on_change() get (old, new) so pooled
+clients and caches built from it are rebuilt then, not on every run.
+"""
 import os
-from dataclasses import dataclass
+import re
+import signal
+import threading
+import time
+from dataclasses import dataclass, fields
+from urllib.parse import urlparse
+from dotenv import dotenv_values
+from app.utils.logger import get_logger
 
 def str2bool(v):
     return str(v).lower() in ("yes", "true", "t", "1")
 
-@dataclass
+RELOAD = str2bool(os.getenv("CONFIG_RELOAD", "False"))
+RELOAD_INTERVAL = float(os.getenv("CONFIG_RELOAD_INTERVAL", "2"))
+
+def get_env_path():
+    """.env of this checkout, or of the working directory when run from elsewhere."""
+    package_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+    if os.path.isfile(package_path):
+        return package_path
+    return os.path.abspath(".env")
+
+ENV_PATH = os.getenv("ENV_FILE") or get_env_path()
+
+class ConfigError(ValueError):
+    """The environment does not describe a usable configuration."""
+
+@dataclass(frozen=True)
 class AppConfig:
     supabase_url: str
     supabase_key: str
     api_endpoint: str
     api_timeout: int = 30
+    api_payload_schema: str = "auto"
+    api_warmup_interval: int = 240
+    submit_dedup_window: int = 300
+    rate_limit_session: str = "5/60"
+    rate_limit_phone: str = "20/3600"
+    rate_limit_global: str = "600/60"
+    rate_limit_redis_url: str = ""
+    supabase_slow_query_ms: float = 500.0
+    catalog_ttl: float = 300.0
+    warmup_retry_interval: float = 5.0
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 9464
+    profile_sample_rate: float = 0.0
+    profile_secret: str = ""
+    profile_dir: str = "profiles"
+    profile_format: str = "speedscope"
+    profile_interval_ms: float = 5.0
+    profile_keep_recent: int = 100
+    profile_keep_slowest: int = 5
+    memory_session_budget_mb: float = 50.0
+    memory_sample_interval: float = 30.0
     debug_mode: bool = False
     app_mode: str = "release"
     enable_file_upload: bool = False
     enable_ticket_history: bool = True
     ga_id: str = ""
+    analytics_sink: str = ""
+    analytics_api_secret: str = ""
+    analytics_batch_size: int = 25
+    analytics_flush_interval: float = 2.0
+    analytics_queue_size: int = 10000
+
+# field: (environment variable, default, type)
+ENVIRONMENT = {
+    "supabase_url": ("SUPABASE_URL", "", str),
+    "supabase_key": ("SUPABASE_KEY", "", str),
+    "api_endpoint": ("API_ENDPOINT", "", str),
+    "api_timeout": ("API_TIMEOUT", "30", int),
+    "api_payload_schema": ("API_PAYLOAD_SCHEMA", "auto", str),
+    "api_warmup_interval": ("API_WARMUP_INTERVAL", "240", int),
+    "submit_dedup_window": ("SUBMIT_DEDUP_WINDOW", "300", int),
+    "rate_limit_session": ("RATE_LIMIT_SESSION", "5/60", str),
+    "rate_limit_phone": ("RATE_LIMIT_PHONE", "20/3600", str),
+    "rate_limit_global": ("RATE_LIMIT_GLOBAL", "600/60", str),
+    "rate_limit_redis_url": ("RATE_LIMIT_REDIS_URL", "", str),
+    "supabase_slow_query_ms": ("SUPABASE_SLOW_QUERY_MS", "500", float),
+    "catalog_ttl": ("CATALOG_TTL", "300", float),
+    "warmup_retry_interval": ("WARMUP_RETRY_INTERVAL", "5", float),
+    "metrics_host": ("METRICS_HOST", "127.0.0.1", str),
+    "metrics_port": ("METRICS_PORT", "9464", int),
+    "profile_sample_rate": ("PROFILE_SAMPLE_RATE", "0", float),
+    "profile_secret": ("PROFILE_SECRET", "", str),
+    "profile_dir": ("PROFILE_DIR", "profiles", str),
+    "profile_format": ("PROFILE_FORMAT", "speedscope", str),
+    "profile_interval_ms": ("PROFILE_INTERVAL_MS", "5", float),
+    "profile_keep_recent": ("PROFILE_KEEP_RECENT", "100", int),
+    "profile_keep_slowest": ("PROFILE_KEEP_SLOWEST", "5", int),
+    "memory_session_budget_mb": ("MEMORY_SESSION_BUDGET_MB", "50", float),
+    "memory_sample_interval": ("MEMORY_SAMPLE_INTERVAL", "30", float),
+    "debug_mode": ("DEBUG", "False", bool),
+    "app_mode": ("APP_MODE", "", str),
+    "enable_file_upload": ("ENABLE_FILE_UPLOAD", "False", bool),
+    "enable_ticket_history": ("ENABLE_TICKET_HISTORY", "True", bool),
+    "ga_id": ("GA_ID", "", str),
+    "analytics_sink": ("ANALYTICS_SINK", "", str),
+    "analytics_api_secret": ("ANALYTICS_API_SECRET", "", str),
+    "analytics_batch_size": ("ANALYTICS_BATCH_SIZE", "25", int),
+    "analytics_flush_interval": ("ANALYTICS_FLUSH_INTERVAL", "2", float),
+    "analytics_queue_size": ("ANALYTICS_QUEUE_SIZE", "10000", int),
+}
+
+_RATE_LIMIT = re.compile(r"^(0|\d+(\.\d+)?(/\d+(\.\d+)?)?)?$")
+
+def _parse(field, environ):
+    name, default, kind = ENVIRONMENT[field]
+    raw = environ.get(name)
+    raw = default if raw is None else raw.strip()
+    if kind is bool:
+        return str2bool(raw)
+    if kind is not str and not raw:
+        return kind(0)  # set but empty: disabled (METRICS_PORT=, PROFILE_SAMPLE_RATE=)
+    try:
+        return kind(raw)
+    except ValueError:
+        raise ConfigError(f"{name}: expected {kind.__name__}, got {raw!r}") from None
+
+def _is_url(value, schemes=("http", "https")):
+    parsed = urlparse(value)
+    return parsed.scheme in schemes and bool(parsed.netloc)
+
+def validate(config) -> list:
+    """Problems with config, one message per variable; empty when it is usable."""
+    problems = []
+
+    def check(field, ok, expected):
+        if not ok:
+            name = ENVIRONMENT[field][0]
+            problems.append(f"{name}: expected {expected}, got {getattr(config, field)!r}")
+
+    check("supabase_url", _is_url(config.supabase_url), "an http(s) URL")
+    check("supabase_key", bool(config.supabase_key), "the project's API key")
+    check("api_endpoint", not config.api_endpoint or _is_url(config.api_endpoint), "an http(s) URL or nothing")
+    check("api_timeout", config.api_timeout > 0, "seconds > 0")
+    check("api_payload_schema", config.api_payload_schema in ("auto", "compact", "full"), "auto, compact or full")
+    check("api_warmup_interval", config.api_warmup_interval >= 0, "seconds >= 0")
+    check("submit_dedup_window", config.submit_dedup_window >= 0, "seconds >= 0")
+    for field in ("rate_limit_session", "rate_limit_phone", "rate_limit_global"):
+        check(field, _RATE_LIMIT.match(getattr(config, field)), "<count>/<seconds>, or 0 to disable")
+    check(
+        "rate_limit_redis_url",
+        not config.rate_limit_redis_url or urlparse(config.rate_limit_redis_url).scheme in ("redis", "rediss", "unix"),
+        "a redis:// URL or nothing",
+    )
+    check("supabase_slow_query_ms", config.supabase_slow_query_ms > 0, "milliseconds > 0")
+    check("catalog_ttl", config.catalog_ttl > 0, "seconds > 0")
+    check("warmup_retry_interval", config.warmup_retry_interval > 0, "seconds > 0")
+    check("metrics_port", 0 <= config.metrics_port <= 65535, "a port, or 0 to disable")
+    check("profile_sample_rate", 0 <= config.profile_sample_rate <= 1, "a fraction between 0 and 1")
+    check("profile_format", config.profile_format in ("speedscope", "collapsed"), "speedscope or collapsed")
+    check("profile_interval_ms", config.profile_interval_ms > 0, "milliseconds > 0")
+    check("memory_session_budget_mb", config.memory_session_budget_mb > 0, "megabytes > 0")
+    check("memory_sample_interval", config.memory_sample_interval > 0, "seconds > 0")
+    check("analytics_batch_size", config.analytics_batch_size > 0, "a count > 0")
+    check("analytics_flush_interval", config.analytics_flush_interval > 0, "seconds > 0")
+    check("analytics_queue_size", config.analytics_queue_size > 0, "a count > 0")
+    return problems
+
+def load_config(environ=None) -> AppConfig:
+    """A new AppConfig from environ (default os.environ); raises ConfigError when invalid."""
+    environ = os.environ if environ is None else environ
+    problems, values = [], {}
+    for field in fields(AppConfig):
+        try:
+            values[field.name] = _parse(field.name, environ)
+        except ConfigError as e:
+            problems.append(str(e))
+    if problems:
+        raise ConfigError("Invalid configuration: " + "; ".join(problems))
+    config = AppConfig(**values)
+    problems = validate(config)
+    if problems:
+        raise ConfigError("Invalid configuration: " + "; ".join(problems))
+    return config
+
+# Variables this process took from .env; the real environment always wins
+_dotenv_keys = set()
+
+def load_env(path=None):
+    """Set the variables of .env that the environment does not set itself (again, after an edit)."""
+    values = {k: v for k, v in dotenv_values(path or ENV_PATH).items() if v is not None}
+    for key in _dotenv_keys - values.keys():
+        os.environ.pop(key, None)
+        _dotenv_keys.discard(key)
+    for key, value in values.items():
+        if key not in os.environ or key in _dotenv_keys:
+            os.environ[key] = value
+            _dotenv_keys.add(key)
+
+def _env_stamp():
+    try:
+        stat = os.stat(ENV_PATH)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+load_env()
+# After load_env(), so LOG_LEVEL from .env applies
+logger = get_logger(__name__)
+
+_config = None
+_config_lock = threading.Lock()
+_checked_at = 0.0
+_stamp = _env_stamp()
+_reload_requested = False
+_listeners = {}
+
+def on_change(name, callback):
+    """Call callback(old, new) after each config change; registering a name again replaces it."""
+    _listeners[name] = callback
+
+def get_config() -> AppConfig:
+    """The process's config, loaded on first use; raises ConfigError when it is invalid."""
+    global _config, _checked_at
+    config = _config
+    if config is not None and not _reload_requested and not (RELOAD and time.monotonic() - _checked_at >= RELOAD_INTERVAL):
+        return config
+    with _config_lock:
+        if _config is None:
+            _config = load_config()
+            _checked_at = time.monotonic()
+            return _config
+    if _reload_requested:
+        return reload_config()
+    if RELOAD and time.monotonic() - _checked_at >= RELOAD_INTERVAL:
+        _checked_at = time.monotonic()
+        if _env_stamp() != _stamp:
+            return reload_config()
+    return _config
+
+def reload_config() -> AppConfig:
+    """Re-read .env and the environment; an invalid result is logged and the current config kept."""
+    global _config, _stamp, _reload_requested
+    with _config_lock:
+        _reload_requested = False
+        _stamp = _env_stamp()
+        load_env()
+        old = _config
+        try:
+            new = load_config()
+        except ConfigError as e:
+            if old is None:
+                raise
+            logger.error("Config reload failed, keeping the current config", extra={"error": str(e)})
+            return old
+        if new == old:
+            return old
+        _config = new
+    changed = sorted(f.name for f in fields(AppConfig) if old is None or getattr(old, f.name) != getattr(new, f.name))
+    logger.info("Config reloaded", extra={"changed": changed})
+    if old is not None:
+        for name, callback in list(_listeners.items()):
+            try:
+                callback(old, new)
+            except Exception as e:
+                logger.error("Config change callback failed", extra={"callback": name, "error": str(e)})
+    return new
+
+def install_reload_signal(signum=getattr(signal, "SIGHUP", None)):
+    """Reload on signum (SIGHUP); the next get_config() does the work. Main thread only."""
+    if signum is None:
+        return False
+
+    def request_reload(*_):
+        global _reload_requested
+        _reload_requested = True
 
-def load_config() -> AppConfig:
-    return AppConfig(
-        supabase_url=os.getenv("SUPABASE_URL", ""),
-        supabase_key=os.getenv("SUPABASE_KEY", ""),
-        api_endpoint=os.getenv("API_ENDPOINT", ""),
-        api_timeout=int(os.getenv("API_TIMEOUT", "30")),
-        debug_mode=str2bool(os.getenv("DEBUG", "False")),
-        app_mode=os.getenv("APP_MODE", ""),
-        enable_file_upload=str2bool(os.getenv("ENABLE_FILE_UPLOAD", "False")),
-        enable_ticket_history=str2bool(os.getenv("ENABLE_TICKET_HISTORY", "True")),
-        ga_id=os.getenv("GA_ID", ""),
-    ) 
\ No newline at end of file
+    signal.signal(signum, request_reload)
+    return True
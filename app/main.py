@@ -1,12 +1,10 @@
 import streamlit as st
-from streamlit_gtag import st_gtag
+import atexit
 import os
 import sys
-from dotenv import load_dotenv
 import random
 import streamlit.components.v1 as components
-
-load_dotenv()
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 # Add current directory to Python path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,29 +16,44 @@ if parent_dir not in sys.path:
 
 # Try different import strategies for deployment compatibility
 try:
+    # First: applies .env before other modules read their environment variables
+    from app.config.settings import ConfigError, get_config, on_change
     from app.components.header import render_header
     from app.components.grid_view import create_grid_view
     from app.components.popups import show_data_collection_popup, show_success_popup, show_error_popup
+    from app.components import analytics
+    from app.services.analytics_exporter import AnalyticsExporter, create_sink
     from app.services.api_service import APIService
-    from app.services.supabase_service import SupabaseService
+    from app.services import catalog_service, warmup
     from app.services.storage_service import StorageService
-    from app.config.settings import load_config
-    from app.utils.i18n import t
+    from app.services.dedup_service import SubmissionDeduplicator
+    from app.services.rate_limit_service import RateLimit, RateLimiter, create_bucket_store
+    from app.utils.i18n import t, t_many
+    from app.utils.logger import get_logger
+    from app.utils import memory, metrics, profiling
 except ImportError:
     # Fallback for deployment environments
     try:
+        from config.settings import ConfigError, get_config, on_change
         from components.header import render_header
         from components.grid_view import create_grid_view
         from components.popups import show_data_collection_popup, show_success_popup, show_error_popup
+        from components import analytics
+        from services.analytics_exporter import AnalyticsExporter, create_sink
         from services.api_service import APIService
-        from services.supabase_service import SupabaseService
+        from services import catalog_service, warmup
         from services.storage_service import StorageService
-        from config.settings import load_config
-        from utils.i18n import t
+        from services.dedup_service import SubmissionDeduplicator
+        from services.rate_limit_service import RateLimit, RateLimiter, create_bucket_store
+        from utils.i18n import t, t_many
+        from utils.logger import get_logger
+        from utils import memory, metrics, profiling
     except ImportError as e:
         st.error(f"Import error: {e}")
         st.stop()
 
+logger = get_logger("main")
+
 # --- Session state keys ---
 def init_session_state():
     # Initialize storage service for session state setup
@@ -67,10 +80,158 @@ def init_session_state():
     if "streets_data" not in st.session_state:
         st.session_state.streets_data = None
 
+@st.cache_resource
+def get_deduplicator(window_seconds):
+    """Process-wide dedup window shared by all sessions."""
+    return SubmissionDeduplicator(window_seconds=window_seconds)
+
+@st.cache_resource
+def get_rate_limiter(session_limit, phone_limit, global_limit, redis_url):
+    """Process-wide submission rate limiter; buckets are shared via Redis when configured."""
+    return RateLimiter(
+        create_bucket_store(redis_url),
+        session_limit=RateLimit.parse(session_limit),
+        phone_limit=RateLimit.parse(phone_limit),
+        global_limit=RateLimit.parse(global_limit),
+    )
+
+@st.cache_resource
+def get_metrics_server(host, port):
+    """Process-wide Prometheus (and /ready) endpoint; port 0 disables it."""
+    return metrics.ensure_metrics_server(host, port) if port else None
+
+@st.cache_resource
+def get_profile_store(directory, fmt, keep_recent, keep_slowest):
+    """Process-wide destination for sampled run profiles."""
+    return profiling.ProfileStore(directory, fmt, keep_recent=keep_recent, keep_slowest=keep_slowest)
+
+@st.cache_resource
+def get_memory_tracker(budget_mb, interval):
+    """Process-wide session_state size accounting, published through the metrics endpoint."""
+    return memory.SessionMemoryTracker(budget_bytes=int(budget_mb * 1024 * 1024), interval=interval)
+
+# Exporters built by get_analytics_exporter, so a config change closes the ones in use
+_analytics_exporters = []
+
+@st.cache_resource
+def get_analytics_exporter(sink, measurement_id, api_secret, batch_size, flush_interval, queue_size):
+    """Process-wide background exporter for server-side analytics; None when ANALYTICS_SINK is unset."""
+    if not sink:
+        return None
+    exporter = AnalyticsExporter(
+        create_sink(sink, measurement_id, api_secret),
+        batch_size=batch_size,
+        flush_interval=flush_interval,
+        max_queue=queue_size,
+    )
+    atexit.register(exporter.close)
+    _analytics_exporters.append(exporter)
+    return exporter
+
+@st.cache_resource
+def get_api_service(endpoint, debug_mode, payload_schema, warmup_interval, timeout):
+    """Process-wide incident API client; its negotiation and warm-up state is module-level anyway."""
+    return APIService(
+        endpoint=endpoint,
+        debug_mode=debug_mode,
+        payload_schema=payload_schema,
+        warmup_interval=warmup_interval,
+        timeout=timeout,
+    )
+
+def rebuild_dependents(old, new):
+    """Config change: drop the process-wide objects built from settings that changed."""
+    def changed(*names):
+        return any(getattr(old, name) != getattr(new, name) for name in names)
+
+    if changed("submit_dedup_window"):
+        get_deduplicator.clear()
+    if changed("rate_limit_session", "rate_limit_phone", "rate_limit_global", "rate_limit_redis_url"):
+        get_rate_limiter.clear()
+    if changed("profile_dir", "profile_format", "profile_keep_recent", "profile_keep_slowest"):
+        get_profile_store.clear()
+    if changed("memory_session_budget_mb", "memory_sample_interval"):
+        get_memory_tracker.clear()
+    if changed("api_endpoint", "debug_mode", "api_payload_schema", "api_warmup_interval", "api_timeout"):
+        get_api_service.clear()
+    if changed(
+        "analytics_sink", "ga_id", "analytics_api_secret",
+        "analytics_batch_size", "analytics_flush_interval", "analytics_queue_size",
+    ):
+        stale, _analytics_exporters[:] = list(_analytics_exporters), []
+        get_analytics_exporter.clear()
+        for exporter in stale:
+            exporter.close()
+    if changed("metrics_host", "metrics_port"):
+        # Move the endpoint now rather than on the next run, so readiness checks follow it
+        get_metrics_server.clear()
+        if old.metrics_port:
+            metrics.stop_metrics_server(old.metrics_host, old.metrics_port)
+        if new.metrics_port:
+            metrics.ensure_metrics_server(new.metrics_host, new.metrics_port)
+    if changed("supabase_url", "supabase_key", "supabase_slow_query_ms", "catalog_ttl"):
+        catalog_service.discard(old.supabase_url, old.supabase_key, old.supabase_slow_query_ms, old.catalog_ttl)
+
+on_change("main", rebuild_dependents)
+
+def current_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+def track_session_memory(config, catalog):
+    """
+    Measure this session's state when its interval is due, leaving out the
+    catalog every session shares. Called once the state references the
+    current catalog, so a refresh is never charged to the sessions.
+    """
+    tracker = get_memory_tracker(config.memory_session_budget_mb, config.memory_sample_interval)
+    tracker.share(catalog)
+    session_id = current_session_id()
+    if session_id and tracker.due(session_id):
+        with metrics.span("memory_accounting"):
+            tracker.track(session_id, st.session_state.to_dict())
+
+def prefetch_summary(category):
+    """Prepare the summary page while the resident is still picking a street."""
+    if not category:
+        return
+    # category.options was parsed once when the catalog was loaded
+    if category.options and not st.session_state.get("custom_text"):
+        st.session_state.custom_text = random.choice(category.options)
+
 # --- Main app logic ---
 def main():
+    try:
+        config = get_config()
+    except ConfigError as e:
+        logger.error("Invalid configuration", extra={"error": str(e)})
+        st.error(str(e))
+        st.stop()
+    profile = profiling.should_profile(
+        config.profile_sample_rate, config.profile_secret, st.query_params.get("profile")
+    )
+    store = None
+    if profile:
+        store = get_profile_store(
+            config.profile_dir, config.profile_format, config.profile_keep_recent, config.profile_keep_slowest
+        )
+    with metrics.rerun(), profiling.profile_run(store, profile, metrics.current_page, config.profile_interval_ms / 1000):
+        run_app()
+        # Not reached when the run ends in st.rerun(); the next run sends its events
+        with metrics.span("analytics_flush"):
+            exporter = get_analytics_exporter(
+                config.analytics_sink, config.ga_id, config.analytics_api_secret,
+                config.analytics_batch_size, config.analytics_flush_interval, config.analytics_queue_size,
+            )
+            analytics.flush(config.ga_id, exporter=exporter, client_id=current_session_id())
 
-    config = load_config()
+def run_app():
+    metrics.set_page(st.session_state.get("current_page", "categories"))
+    with metrics.span("config_load"):
+        config = get_config()
+    get_metrics_server(config.metrics_host, config.metrics_port)
+    # Already running when started through app/serve.py
+    warmup.start(config, config.warmup_retry_interval)
     st.set_page_config(
         page_title="Netanya Municipality", 
         layout="centered",
@@ -79,32 +240,15 @@ def main():
     
     init_session_state()
     
-    # Initialize pending gtag events list
-    if "pending_gtag_events" not in st.session_state:
-        st.session_state.pending_gtag_events = []
-    
-    # Send any pending gtag events from previous runs
-    if config.ga_id and st.session_state.pending_gtag_events:
-        for event in st.session_state.pending_gtag_events:
-            print(f"DEBUG: Sending gtag event: {event}")
-            st_gtag(**event)
-        st.session_state.pending_gtag_events = []
-    
-    # Initialize Google Analytics page view only once
-    st_gtag(
-        key="gtag_send_event_a",
-        id=config.ga_id,
-        event_name="app_main_page",
-        params={
-            "event_category": "send_page_view",
-            "event_label": "send_page_view",
-            "value": 1,
-        }
-    )
+    # Google Analytics page view, once per session
+    analytics.track_session_start()
     lang = st.session_state.current_language
-    api = APIService(endpoint=config.api_endpoint, debug_mode=config.debug_mode)
-    supabase = SupabaseService(config.supabase_url, config.supabase_key)
-    storage = StorageService()
+    with metrics.span("services"):
+        api = get_api_service(
+            config.api_endpoint, config.debug_mode, config.api_payload_schema,
+            config.api_warmup_interval, config.api_timeout,
+        )
+        storage = StorageService()
 
     # Handle URL parameters for direct navigation
     def handle_url_parameters():
@@ -119,14 +263,8 @@ def main():
             if category_id and street_id:
                 # Only process if we haven't already processed these parameters
                 if not st.session_state.get("url_params_processed", False):
-                    # Fetch data if not already cached
-                    if st.session_state.categories_data is None:
-                        st.session_state.categories_data = supabase.get_categories()
-                    if st.session_state.streets_data is None:
-                        st.session_state.streets_data = supabase.get_street_numbers()
-                    
                     categories = st.session_state.categories_data or []
-                    streets = st.session_state.streets_data or []
+                    streets = st.session_state.streets_data
                     
                     # Find matching category and street
                     selected_category = None
@@ -137,10 +275,9 @@ def main():
                             selected_category = category
                             break
                     
-                    for street in streets:
-                        if str(street.id) == str(street_id):
-                            selected_street = street
-                            break
+                    if streets:
+                        # StreetCatalog: an id lookup, no row objects for the other streets
+                        selected_street = streets.get(street_id)
                     
                     if selected_category and selected_street:
                         # Set the selections in session state
@@ -170,10 +307,20 @@ def main():
                         
         except Exception as e:
             # If there's any error with URL processing, just continue normally
-            print(f"Error processing URL parameters: {e}")
+            logger.warning("Error processing URL parameters", extra={"error": str(e)})
+
+    # Categories and streets shared by all sessions, fetched by the warm-up or the first run
+    with metrics.span("catalog_fetch"):
+        catalog = catalog_service.get_catalog_cache(
+            config.supabase_url, config.supabase_key, config.supabase_slow_query_ms, config.catalog_ttl
+        ).get()
+        st.session_state.categories_data = catalog.categories
+        st.session_state.streets_data = catalog.streets
+    track_session_memory(config, catalog)
 
     # Call the URL parameter handler
-    handle_url_parameters()
+    with metrics.span("url_params"):
+        handle_url_parameters()
 
     # Sidebar: Ticket History
     with st.sidebar:
@@ -183,12 +330,6 @@ def main():
             for tkt in tickets:
                 st.markdown(f"- {tkt}")
 
-    # Fetch categories and streets from Supabase (cache in session)
-    if st.session_state.categories_data is None:
-        st.session_state.categories_data = supabase.get_categories()
-    if st.session_state.streets_data is None:
-        st.session_state.streets_data = supabase.get_street_numbers()
-
     def on_language_change(new_lang):
         st.session_state.current_language = new_lang
         st.rerun()
@@ -200,12 +341,13 @@ def main():
     # Hide search on summary page, show on categories and streets pages
     show_search = st.session_state.current_page in ["categories", "streets"]
     
-    render_header(
-        current_language=lang,
-        on_language_change=on_language_change,
-        search_query=st.session_state.search_query if show_search else None,
-        on_search=on_search if show_search else None
-    )
+    with metrics.span("header"):
+        render_header(
+            current_language=lang,
+            on_language_change=on_language_change,
+            search_query=st.session_state.search_query if show_search else None,
+            on_search=on_search if show_search else None
+        )
 
     # Real-time search: Check if search input has changed and update immediately
     current_search_input = st.session_state.get("header_search_input", "")
@@ -222,20 +364,16 @@ def main():
         if not categories:
             st.warning("No categories found in Supabase.")
         def on_category_click(category):
-            print(f"DEBUG: Category clicked: {category.name}")
-            print(f"DEBUG: Current user_data: {st.session_state.user_data}")
-            print(f"DEBUG: Current selected_street: {st.session_state.selected_street}")
-            # Queue gtag event for next run (before st.rerun)
-            st.session_state.pending_gtag_events.append({
-                "key": "gtag_send_event_b",
-                "id": config.ga_id,
-                "event_name": "custom_event",
-                "params": {
-                    "event_category": "category_clicked",
-                    "event_label": "category_"+str(category.id),
-                    "value": 1,
-                }
-            })
+            logger.debug(
+                "Category clicked",
+                extra={
+                    "category_id": category.id,
+                    "has_user_data": bool(st.session_state.user_data),
+                    "has_street": bool(st.session_state.selected_street),
+                },
+            )
+            # Queued before st.rerun(); sent by the next run
+            analytics.track("category_clicked", "category_"+str(category.id))
             st.session_state.selected_category = category
             # Clear selected street when selecting a new category
             st.session_state.selected_street = None
@@ -244,11 +382,11 @@ def main():
             # Mark that we've manually selected, not from URL params
             st.session_state.url_params_processed = True
             if not st.session_state.user_data:
-                print("DEBUG: No user data, showing popup")
+                logger.debug("No user data, showing popup")
                 st.session_state.show_popup = True
                 st.rerun()
             else:
-                print("DEBUG: User data exists, going to streets page")
+                logger.debug("User data exists, going to streets page")
                 # Always go to streets page after selecting category (need to select street too)
                 st.session_state.current_page = "streets"
                 st.session_state.search_query = ""
@@ -258,33 +396,24 @@ def main():
                 st.rerun()
         if st.session_state.show_popup:
             def save_user(user):
-                st.session_state.pending_gtag_events.append({
-                    "key": "gtag_send_event_c",
-                    "id": config.ga_id,
-                    "event_name": "custom_event",
-                    "params": {
-                        "event_category": "save_user",
-                        "event_label": "save",
-                        "value": 1,
-                    }
-                })
+                analytics.track("save_user", "save")
 
                 st.session_state.user_data = user
                 storage.save_user_data(user)
                 st.session_state.show_popup = False
                 
-                # Debug: Check current state
-                print(f"DEBUG save_user: selected_category = {st.session_state.selected_category}")
-                print(f"DEBUG save_user: selected_street = {st.session_state.selected_street}")
-                print(f"DEBUG save_user: selected_category is None? {st.session_state.selected_category is None}")
-                print(f"DEBUG save_user: selected_street is None? {st.session_state.selected_street is None}")
-                print(f"DEBUG save_user: bool(selected_category) = {bool(st.session_state.selected_category)}")
-                print(f"DEBUG save_user: bool(selected_street) = {bool(st.session_state.selected_street)}")
+                logger.debug(
+                    "User data saved",
+                    extra={
+                        "has_category": bool(st.session_state.selected_category),
+                        "has_street": bool(st.session_state.selected_street),
+                    },
+                )
                 
                 # Check if we already have both category and street selected (from URL params)
                 if st.session_state.selected_category and st.session_state.selected_street:
                     # Both are selected, go directly to summary
-                    print("DEBUG save_user: Both category and street selected, going to summary")
+                    logger.debug("Both category and street selected, going to summary")
                     st.session_state.current_page = "summary"
                     # Clear search when navigating to summary
                     st.session_state.search_query = ""
@@ -292,7 +421,7 @@ def main():
                         del st.session_state["header_search_input"]
                 else:
                     # Need to select street, go to streets page
-                    print("DEBUG save_user: Missing street, going to streets page")
+                    logger.debug("Missing street, going to streets page")
                     st.session_state.current_page = "streets"
                 
                 st.session_state.search_query = ""
@@ -307,16 +436,7 @@ def main():
                 st.rerun()
 
             def cancel_user():
-                st.session_state.pending_gtag_events.append({
-                    "key": "gtag_send_event_d",
-                    "id": config.ga_id,
-                    "event_name": "custom_event",
-                    "params": {
-                        "event_category": "cancel_user",
-                        "event_label": "cancel",
-                        "value": 1,
-                    }
-                })
+                analytics.track("cancel_user", "cancel")
 
                 st.session_state.show_popup = False
                 st.session_state.selected_category = None
@@ -328,22 +448,16 @@ def main():
                 st.rerun()
             show_data_collection_popup(save_user, cancel_user, lang=lang)
         else:
-            create_grid_view(categories, on_category_click, search_query=st.session_state.search_query, search_fn=lambda q: supabase.search_categories(q, categories), page_key="categories")
+            create_grid_view(categories, on_category_click, search_query=st.session_state.search_query, search_fn=catalog.category_index.search, page_key="categories")
     elif st.session_state.current_page == "streets":
+        # Wake the incident service and build the summary page ahead of Send
+        api.warm_up()
+        prefetch_summary(st.session_state.selected_category)
         if not streets:
             st.warning("No street numbers found in Supabase.")
         def on_street_click(street):
-            # Queue gtag event for next run (before st.rerun)
-            st.session_state.pending_gtag_events.append({
-                "key": "gtag_send_event_c",
-                "id": config.ga_id,
-                "event_name": "custom_event",
-                "params": {
-                    "event_category": "street_clicked", 
-                    "event_label": "street_" + str(street.id),
-                    "value": 1,
-                }
-            })
+            # Queued before st.rerun(); sent by the next run
+            analytics.track("street_clicked", "street_" + str(street.id))
             st.session_state.selected_street = street
             st.session_state.current_page = "summary"
             # Clear search when moving to summary
@@ -351,18 +465,9 @@ def main():
             if "header_search_input" in st.session_state:
                 del st.session_state["header_search_input"]
             st.rerun()  # <-- This line is necessary for immediate navigation
-        create_grid_view(streets, on_street_click, search_query=st.session_state.search_query, search_fn=lambda q: supabase.search_street_numbers(q, streets), page_key="streets")
+        create_grid_view(streets, on_street_click, search_query=st.session_state.search_query, search_fn=catalog.street_index.search, page_key="streets")
     elif st.session_state.current_page == "summary":
-        st.session_state.pending_gtag_events.append({
-            "key": "gtag_send_event_e",
-            "id": config.ga_id,
-            "event_name": "custom_event",
-            "params": {
-                "event_category": "summary_page_view",
-                "event_label": "",
-                "value": 1,
-            }
-        })
+        analytics.track_view("summary", "summary_page_view")
 
         user = st.session_state.user_data
         category = st.session_state.selected_category
@@ -377,48 +482,44 @@ def main():
             st.rerun()
             return
             
-        st.markdown(f"**{t('forms.first_name', lang)}:** {user.first_name}")
-        st.markdown(f"**{t('forms.last_name', lang)}:** {user.last_name}")
-        st.markdown(f"**{t('forms.phone', lang)}:** {user.phone}")
-        st.markdown(f"**{t('forms.email', lang)}:** {user.email or '-'}")
-        st.markdown(f"**{t('forms.id_optional', lang)}:** {user.user_id or '-'}")
-        st.markdown(f"**{t('forms.category', lang)}:** {category.name}")
-        st.markdown(f"**{t('forms.street', lang)}:** {street.name}")
+        labels = t_many(
+            ("first_name", "last_name", "phone", "email", "id_optional", "category", "street", "text"),
+            lang, prefix="forms.",
+        )
+        st.markdown(f"**{labels['first_name']}:** {user.first_name}")
+        st.markdown(f"**{labels['last_name']}:** {user.last_name}")
+        st.markdown(f"**{labels['phone']}:** {user.phone}")
+        st.markdown(f"**{labels['email']}:** {user.email or '-'}")
+        st.markdown(f"**{labels['id_optional']}:** {user.user_id or '-'}")
+        st.markdown(f"**{labels['category']}:** {category.name}")
+        st.markdown(f"**{labels['street']}:** {street.name}")
+
+        # Covers sessions that arrive here straight from a shared link
+        api.warm_up()
 
         # Editable text field with random description as default
-        if category.event_call_desc:
-            options = [s.strip() for s in category.event_call_desc.split(',') if s.strip()]
-            if options:
-                # Initialize custom text with random description if not already set or if empty
-                if "custom_text" not in st.session_state or not st.session_state.custom_text:
-                    st.session_state.custom_text = random.choice(options)
-                
-                # Show editable text area
-                st.markdown(f"**{t('forms.text', lang)}:**")
-                custom_text = st.text_area(
-                    label="Edit Text",  # Use fixed label instead of potentially empty translation
-                    value=st.session_state.custom_text,
-                    height=100,
-                    key="summary_text_input",
-                    label_visibility="collapsed"
-                )
-                # Update session state when text changes
-                if custom_text != st.session_state.custom_text:
-                    st.session_state.custom_text = custom_text
+        if category.options:
+            # Initialize custom text with random description if not already set or if empty
+            if "custom_text" not in st.session_state or not st.session_state.custom_text:
+                st.session_state.custom_text = random.choice(category.options)
+            
+            # Show editable text area
+            st.markdown(f"**{labels['text']}:**")
+            custom_text = st.text_area(
+                label="Edit Text",  # Use fixed label instead of potentially empty translation
+                value=st.session_state.custom_text,
+                height=100,
+                key="summary_text_input",
+                label_visibility="collapsed"
+            )
+            # Update session state when text changes
+            if custom_text != st.session_state.custom_text:
+                st.session_state.custom_text = custom_text
         
         # Future-proof: file upload (disabled for now)
         # uploaded_file = st.file_uploader("Upload a file (optional, not sent yet)", disabled=True)
         if st.button(t('common.send', lang), type="primary"):
-            st.session_state.pending_gtag_events.append({
-                "key": "f",
-                "id": config.ga_id,
-                "event_name": "custom_event",
-                "params": {
-                    "event_category": "summary_page_send_button",
-                    "event_label": "send_clicked",
-                    "value": 1,
-                }
-            })
+            analytics.track("summary_page_send_button", "send_clicked")
             # To enable file upload in the future, pass extra_files to api.submit_data
             extra_files = None
             # if uploaded_file:
@@ -427,28 +528,31 @@ def main():
             # Pass custom text to API service
             custom_text = st.session_state.get("custom_text", "")
             
-            response = api.submit_data(user, category, street, custom_text=custom_text, extra_files=None)
-            if response.ResultCode == 200 and "SUCCESS" in response.ResultStatus:
-                ticket = response.data
-                st.session_state.ticket_history.append(ticket)
-                storage.save_ticket(ticket)
-                st.session_state.last_ticket_number = ticket
-                st.session_state.current_page = "success"
-                st.rerun()
+            limiter = get_rate_limiter(
+                config.rate_limit_session,
+                config.rate_limit_phone,
+                config.rate_limit_global,
+                config.rate_limit_redis_url,
+            )
+            decision = limiter.check(session_id=current_session_id(), phone=user.phone)
+            if not decision.allowed:
+                st.error(f"❌ {t('errors.rate_limited', lang, seconds=RateLimiter.retry_after_seconds(decision))}")
             else:
-                st.error(f"❌ {t('errors.submission_failed', lang)}: {response.ErrorDescription}")
+                deduplicator = get_deduplicator(config.submit_dedup_window)
+                with metrics.span("submit"):
+                    response = deduplicator.submit(api, user, category, street, custom_text=custom_text, extra_files=None)
+                if response.ResultCode == 200 and "SUCCESS" in response.ResultStatus:
+                    ticket = response.data
+                    st.session_state.ticket_history.append(ticket)
+                    storage.save_ticket(ticket)
+                    st.session_state.last_ticket_number = ticket
+                    st.session_state.current_page = "success"
+                    st.rerun()
+                else:
+                    st.error(f"❌ {t('errors.submission_failed', lang)}: {response.ErrorDescription}")
 
     elif st.session_state.current_page == "success":
-        st.session_state.pending_gtag_events.append({
-            "key": "gtag_send_event_g",
-            "id": config.ga_id,
-            "event_name": "custom_event",
-            "params": {
-                "event_category": "ticket_sent_status",
-                "event_label": "success",
-                "value": 1,
-            }
-        })
+        analytics.track_view("success", "ticket_sent_status", "success")
         # Get ticket info from session state
         ticket_number = st.session_state.get('last_ticket_number')
         user_data = st.session_state.get('user_data')
@@ -481,16 +585,7 @@ def main():
         
         with col1:
             if st.button(t('success.new_ticket', lang), type="primary", use_container_width=True):
-                st.session_state.pending_gtag_events.append({
-                    "key": "gtag_send_event_h",
-                    "id": config.ga_id,
-                    "event_name": "custom_event",
-                    "params": {
-                        "event_category": "ticket_sent",
-                        "event_label": "new_ticket",
-                        "value": 1,
-                    }
-                })
+                analytics.track("ticket_sent", "new_ticket")
 
                 # Clear session state and start over
                 for key in ['user_data', 'selected_category', 'selected_street', 'last_ticket_number', 'custom_text']:
@@ -500,22 +595,13 @@ def main():
                 st.rerun()
                 
         with col3:
-            st.session_state.pending_gtag_events.append({
-                "key": "gtag_send_event_i",
-                "id": config.ga_id,
-                "event_name": "custom_event",
-                "params": {
-                    "event_category": "ticket_sent",
-                    "event_label": "share_whatsapp",
-                    "value": 1,
-                }
-            })
+            analytics.track_view("success", "ticket_sent", "share_whatsapp")
 
             # Create WhatsApp share URL
             category_id = category_data.id if category_data else ""
             street_id = street_data.id if street_data else ""
             share_url = f"https://agamim.streamlit.app?category={category_id}%26street={street_id}"
-            print(share_url)
+            logger.debug("Share URL built", extra={"share_url": share_url})
             whatsapp_text = t('success.share_neighbor_text', lang)
             whatsapp_url = f"https://wa.me/?text={whatsapp_text}%20{share_url}"
             
@@ -526,16 +612,7 @@ def main():
                 use_container_width=True
             )
     else:
-        st.session_state.pending_gtag_events.append({
-            "key": "gtag_send_event_j",
-            "id": config.ga_id,
-            "event_name": "custom_event",
-            "params": {
-                "event_category": "ticket_sent_status",
-                "event_label": "failed",
-                "value": 1,
-            }
-        })
+        analytics.track_view(st.session_state.current_page, "ticket_sent_status", "failed")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,44 @@
+"""
+Production entry point: warm up, then hand over to `streamlit run`.
+
+    python -m app.serve [streamlit run options, e.g. --server.port 8501]
+
+Starts the metrics endpoint (with GET /ready) and the warm-up thread in
+this process before Streamlit starts accepting connections, so a replica
+reports ready only once translations, the catalog and its connections are
+loaded. Point the load balancer's readiness check at
+http://<METRICS_HOST>:<METRICS_PORT>/ready.
+
+An invalid configuration stops the launcher before Streamlit starts, and
+SIGHUP reloads the configuration (see app/config/settings.py).
+"""
+import os
+import sys
+
+# The repository's entry point, so Streamlit serves static/ next to it
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+
+
+def main(argv=None):
+    # Before the warm-up thread starts: importing streamlit from two threads at once deadlocks
+    from streamlit.web import cli
+    from app.config.settings import ConfigError, get_config, install_reload_signal
+    from app.services import warmup
+    from app.utils import metrics
+
+    try:
+        config = get_config()
+    except ConfigError as e:
+        print(e, file=sys.stderr)
+        return 2
+    install_reload_signal()
+    if config.metrics_port:
+        metrics.ensure_metrics_server(config.metrics_host, config.metrics_port)
+    warmup.start(config, config.warmup_retry_interval)
+
+    sys.argv = ["streamlit", "run", MAIN_SCRIPT, *(sys.argv[1:] if argv is None else argv)]
+    return cli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
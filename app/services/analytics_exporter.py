@@ -0,0 +1,237 @@
+"""
+Server-side analytics export.
+
+In server-side mode the per-session analytics queue is handed to an
+AnalyticsExporter at the end of each run instead of being rendered into the
+page. The exporter only appends to an in-process queue; a daemon thread
+drains it in batches to one sink:
+
+    https://www.google-analytics.com/mp/collect   Measurement Protocol collector
+    jsonl:analytics/events.jsonl                  one JSON event per line
+    sqlite:analytics/events.db                    an `analytics_events` table
+
+Nothing on the rerun path waits for the network or the disk. When the queue
+is full new events are dropped and counted rather than blocking the run.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from app.utils.logger import get_logger
+from app.utils.serialization import dumps_bytes
+from app.utils import metrics
+
+logger = get_logger(__name__)
+
+# Measurement Protocol accepts at most 25 events per request
+MP_MAX_EVENTS = 25
+
+EVENTS_EXPORTED = metrics.REGISTRY.counter(
+    "analytics_export_events_total", "Analytics events handed to the export sink, by outcome.", ("sink", "result")
+)
+EXPORT_SECONDS = metrics.REGISTRY.histogram(
+    "analytics_export_batch_seconds", "Time to write one batch to the export sink.", ("sink",)
+)
+EXPORT_QUEUE_DEPTH = metrics.REGISTRY.gauge(
+    "analytics_export_queue_depth", "Analytics events waiting for the exporter thread."
+)
+
+
+class MeasurementProtocolSink:
+    """POSTs events to a Measurement-Protocol-style collector, one request per client and 25 events."""
+
+    name = "http"
+
+    def __init__(self, endpoint, measurement_id="", api_secret="", timeout=5, session=None):
+        self.endpoint = endpoint
+        self.params = {k: v for k, v in (("measurement_id", measurement_id), ("api_secret", api_secret)) if v}
+        self.timeout = timeout
+        if session is None:
+            import requests
+
+            session = requests.Session()
+        self._session = session
+
+    def send(self, records):
+        by_client = {}
+        for record in records:
+            by_client.setdefault(record["client_id"], []).append(record)
+        for client_id, client_records in by_client.items():
+            for start in range(0, len(client_records), MP_MAX_EVENTS):
+                chunk = client_records[start:start + MP_MAX_EVENTS]
+                body = {
+                    "client_id": client_id,
+                    "events": [
+                        {"name": r["name"], "params": r["params"], "timestamp_micros": int(r["time"] * 1_000_000)}
+                        for r in chunk
+                    ],
+                }
+                resp = self._session.post(
+                    self.endpoint,
+                    params=self.params,
+                    data=dumps_bytes(body),
+                    headers={"Content-Type": "application/json"},
+                    timeout=self.timeout,
+                )
+                resp.raise_for_status()
+
+    def close(self):
+        self._session.close()
+
+
+class JsonlSink:
+    """Appends one JSON object per event to a local file."""
+
+    name = "jsonl"
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def send(self, records):
+        data = b"".join(dumps_bytes(r) + b"\n" for r in records)
+        with open(self.path, "ab") as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+class SqliteSink:
+    """Inserts events into an `analytics_events` table. Used only from the exporter thread."""
+
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = None
+
+    def _connect(self):
+        # Opened lazily so the connection belongs to the exporter thread
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analytics_events ("
+                "id INTEGER PRIMARY KEY, time REAL NOT NULL, client_id TEXT NOT NULL, "
+                "name TEXT NOT NULL, params TEXT NOT NULL)"
+            )
+        return self._conn
+
+    def send(self, records):
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO analytics_events (time, client_id, name, params) VALUES (?, ?, ?, ?)",
+                [(r["time"], r["client_id"], r["name"], dumps_bytes(r["params"]).decode("utf-8")) for r in records],
+            )
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def create_sink(target, measurement_id="", api_secret="", timeout=5):
+    """Sink for ANALYTICS_SINK: an http(s) collector URL, `jsonl:<path>` or `sqlite:<path>`."""
+    if target.startswith(("http://", "https://")):
+        return MeasurementProtocolSink(target, measurement_id, api_secret, timeout=timeout)
+    kind, _, path = target.partition(":")
+    if kind == "jsonl" and path:
+        return JsonlSink(path)
+    if kind == "sqlite" and path:
+        return SqliteSink(path)
+    raise ValueError(f"Unknown analytics sink: {target!r}")
+
+
+class AnalyticsExporter:
+    """
+    Bounded queue of analytics events drained to a sink by a daemon thread.
+
+    The thread sends a batch once batch_size events are waiting or
+    flush_interval seconds after the first one arrived. A batch the sink
+    rejects is retried once after flush_interval (at once when closing)
+    and then dropped; analytics never holds up the app.
+    """
+
+    def __init__(self, sink, batch_size=MP_MAX_EVENTS, flush_interval=2.0, max_queue=10_000):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="analytics-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, client_id, events):
+        """Queue events ({"name", "params", "time"}) for client_id; never blocks."""
+        for event in events:
+            record = {"client_id": client_id or "anonymous", **event}
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                EVENTS_EXPORTED.inc(sink=self.sink.name, result="dropped")
+        EXPORT_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def close(self, timeout=5.0):
+        """Stop the thread after it has sent what is already queued."""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if self._stop.is_set():
+                remaining = 0
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _send(self, batch):
+        started = time.perf_counter()
+        try:
+            self.sink.send(batch)
+        except Exception as e:
+            logger.warning(
+                "Analytics export failed",
+                extra={"sink": self.sink.name, "events": len(batch), "error_type": type(e).__name__, "error": str(e)},
+            )
+            return False
+        finally:
+            EXPORT_SECONDS.observe(time.perf_counter() - started, sink=self.sink.name)
+        EVENTS_EXPORTED.inc(len(batch), sink=self.sink.name, result="sent")
+        return True
+
+    def _run(self):
+        try:
+            self._export()
+        finally:
+            # Closed here, not in close(): sqlite connections belong to the thread that opened them
+            self.sink.close()
+
+    def _export(self):
+        while True:
+            batch = self._next_batch()
+            EXPORT_QUEUE_DEPTH.set(self._queue.qsize())
+            if not batch:
+                if self._stop.is_set():
+                    return
+                continue
+            if self._send(batch):
+                continue
+            # One retry, after a pause unless shutting down
+            self._stop.wait(self.flush_interval)
+            if not self._send(batch):
+                EVENTS_EXPORTED.inc(len(batch), sink=self.sink.name, result="failed")
@@ -1,12 +1,122 @@
+import threading
+import time
 import requests
-import json
+from requests.adapters import HTTPAdapter
 from app.utils.models import APIResponse
+from app.utils.logger import get_logger
+from app.utils.serialization import dumps_bytes, loads
+
+logger = get_logger(__name__)
+
+# Payload schema versions understood by the incident service.
+# v1 carries the full Category/StreetNumber objects, v2 only their ids.
+PAYLOAD_SCHEMA_FULL = 1
+PAYLOAD_SCHEMA_COMPACT = 2
+PAYLOAD_SCHEMA_HEADER = "X-Payload-Schema"
+
+# A compact payload is resent as v1 when the backend cannot read it: 415, or a
+# 400/422 that does not advertise v2 in X-Payload-Schema. A backend that
+# predates negotiation sends no header at all. A 400/422 advertising v2 is a
+# plain validation error and is returned as is.
+UNSUPPORTED_SCHEMA_STATUS = 415
+VALIDATION_STATUSES = (400, 422)
+
+# Seconds before an endpoint that fell back to v1 is offered v2 again
+SCHEMA_RETRY_INTERVAL = 3600
+
+# Negotiated (schema, monotonic time) per submit endpoint, shared by all sessions of the process
+_negotiated_schemas = {}
+_negotiation_lock = threading.Lock()
+
+# Last warm-up time per health endpoint, shared by all sessions of the process
+_last_warmups = {}
+_warmup_lock = threading.Lock()
+
+# Connections kept open per host; concurrent submits beyond this open extra ones
+POOL_SIZE = 32
+
+# One requests.Session per process, so the connection (and TLS session) the
+# warm-up opens is the one submits reuse. Module-level like the state above:
+# the warm-up thread runs outside any script run.
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def http_session():
+    """The process's pooled HTTP session for the incident service."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_session = session
+        return _http_session
+
 
 class APIService:
-    def __init__(self, endpoint, debug_mode):
+    def __init__(self, endpoint, debug_mode, payload_schema="auto", warmup_interval=240, timeout=30, session=None):
+        """
+        payload_schema: "auto" negotiates compact (v2) with the backend and falls
+        back to full (v1) when the backend rejects the schema, retrying v2 after
+        SCHEMA_RETRY_INTERVAL; "compact" or "full" pins the schema.
+        warmup_interval: minimum seconds between two warm-up pings; 0 disables them.
+        timeout: seconds to wait for the incident service to answer a submit.
+        session: requests.Session for every call; the process's http_session() by default.
+        """
         self.endpoint = endpoint
         self.debug_mode = debug_mode
-        
+        self.payload_schema = payload_schema
+        self.warmup_interval = warmup_interval
+        self.timeout = timeout
+        self.session = session if session is not None else http_session()
+
+    def warm_up(self, background=True):
+        """
+        Ping the incident service health check so a scaled-to-zero Cloud Run
+        instance starts before the resident presses Send. Sent at most once per
+        warmup_interval per process; returns True if a ping was started.
+        """
+        if self.debug_mode or not self.endpoint or self.warmup_interval <= 0:
+            return False
+        health_endpoint = self._health_endpoint()
+        now = time.monotonic()
+        with _warmup_lock:
+            last = _last_warmups.get(health_endpoint)
+            if last is not None and now - last < self.warmup_interval:
+                return False
+            _last_warmups[health_endpoint] = now
+
+        if background:
+            threading.Thread(target=self._ping, args=(health_endpoint,), daemon=True).start()
+        else:
+            self._ping(health_endpoint)
+        return True
+
+    def check_health(self):
+        """
+        GET the health check through the session, raising when it fails or
+        answers with an error. Leaves an open connection in the pool.
+        """
+        resp = self.session.get(self._health_endpoint(), timeout=10)
+        resp.raise_for_status()
+        return resp
+
+    def _ping(self, health_endpoint):
+        started = time.perf_counter()
+        try:
+            resp = self.session.get(health_endpoint, timeout=10)
+            logger.debug(
+                "Incident service warm-up",
+                extra={
+                    "status_code": resp.status_code,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                }
+            )
+        except Exception as e:
+            logger.warning("Incident service warm-up failed", extra={"error": str(e)})
+
     def submit_data(self, user_data, category, street, custom_text=None, extra_files=None):
         """
         Submit data to Cloud Run incident service. Returns APIResponse.
@@ -15,52 +125,30 @@ class APIService:
         """
         if self.debug_mode:
             return self._mock_response()
-            
-        # Prepare JSON payload for new Cloud Run service
-        payload = self._prepare_json_payload(user_data, category, street, custom_text)
-        
-        # Ensure endpoint has the correct path
-        submit_endpoint = self.endpoint
-        if not submit_endpoint.endswith('/incidents/submit'):
-            if submit_endpoint.endswith('/'):
-                submit_endpoint += 'incidents/submit'
-            else:
-                submit_endpoint += '/incidents/submit'
-        
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        }
-        
+
+        submit_endpoint = self._submit_endpoint()
+        schema = self._schema_for(submit_endpoint)
+
         try:
-            print("=" * 60)
-            print("🚀 SENDING REQUEST TO CLOUD RUN SERVICE")
-            print("=" * 60)
-            print(f"📡 Endpoint: {submit_endpoint}")
-            print(f"🔧 Headers: {headers}")
-            print("📋 JSON Payload:")
-            print(json.dumps(payload, indent=2, ensure_ascii=False))
-            print("=" * 60)
-            
-            resp = requests.post(
-                submit_endpoint, 
-                json=payload, 
-                headers=headers, 
-                timeout=30
-            )
-            
-            print("📨 RESPONSE RECEIVED")
-            print("=" * 60)
-            print(f"📊 Status Code: {resp.status_code}")
-            print(f"📋 Response Headers: {dict(resp.headers)}")
-            print(f"📄 Response Text: {resp.text}")
-            print("=" * 60)
-            
+            resp = self._post_payload(submit_endpoint, schema, user_data, category, street, custom_text)
+
+            if schema == PAYLOAD_SCHEMA_COMPACT and self.payload_schema == "auto" and self._schema_rejected(resp):
+                # Backend does not understand v2 yet: remember that and resend as v1
+                logger.info(
+                    "Compact payload rejected, falling back to full schema",
+                    extra={"endpoint": submit_endpoint, "status_code": resp.status_code}
+                )
+                self._remember_schema(submit_endpoint, PAYLOAD_SCHEMA_FULL)
+                schema = PAYLOAD_SCHEMA_FULL
+                resp = self._post_payload(submit_endpoint, schema, user_data, category, street, custom_text)
+
             if resp.status_code == 200:
+                # A fallback to v1 is remembered when it happens, so it still expires
+                if self.payload_schema == "auto" and schema == PAYLOAD_SCHEMA_COMPACT:
+                    self._remember_schema(submit_endpoint, schema)
                 try:
-                    json_response = resp.json()
-                    print(f"✅ JSON response: {json_response}")
-                    
+                    json_response = loads(resp.content)
+
                     # Transform Cloud Run response to expected APIResponse format
                     return APIResponse(
                         ResultCode=200,
@@ -69,52 +157,124 @@ class APIService:
                         data=json_response.get('ticket_id', 'UNKNOWN')
                     )
                 except Exception as json_e:
-                    print(f"❌ JSON parsing failed: {json_e}")
+                    logger.error("Invalid JSON in incident service response", extra={"error": str(json_e)})
                     return APIResponse(
-                        ResultCode=500, 
-                        ErrorDescription=f"Invalid JSON response: {json_e}", 
-                        ResultStatus="ERROR", 
+                        ResultCode=500,
+                        ErrorDescription=f"Invalid JSON response: {json_e}",
+                        ResultStatus="ERROR",
                         data=""
                     )
             else:
                 # Handle error responses
                 try:
-                    error_response = resp.json()
+                    error_response = loads(resp.content)
                     error_msg = error_response.get('detail', f'HTTP {resp.status_code}')
                 except:
                     error_msg = f'HTTP {resp.status_code}: {resp.text}'
-                
+
+                logger.warning(
+                    "Incident submission rejected",
+                    extra={"status_code": resp.status_code, "error": error_msg}
+                )
                 return APIResponse(
                     ResultCode=resp.status_code,
                     ErrorDescription=error_msg,
                     ResultStatus="ERROR",
                     data=""
                 )
-            
+
         except Exception as e:
-            print("=" * 60)
-            print("❌ REQUEST FAILED")
-            print("=" * 60)
-            print(f"🚨 Exception Type: {type(e).__name__}")
-            print(f"🚨 Exception Message: {str(e)}")
-            print("=" * 60)
-            import traceback
-            traceback.print_exc()
+            logger.exception("Incident submission failed", extra={"error_type": type(e).__name__})
             return APIResponse(ResultCode=500, ErrorDescription=str(e), ResultStatus="ERROR", data="")
-    
+
+    def _submit_endpoint(self):
+        """Ensure endpoint has the correct path."""
+        submit_endpoint = self.endpoint
+        if not submit_endpoint.endswith('/incidents/submit'):
+            if submit_endpoint.endswith('/'):
+                submit_endpoint += 'incidents/submit'
+            else:
+                submit_endpoint += '/incidents/submit'
+        return submit_endpoint
+
+    def _health_endpoint(self):
+        base = self.endpoint.rstrip('/')
+        if base.endswith('/incidents/submit'):
+            base = base[:-len('/incidents/submit')]
+        return base + '/health'
+
+    def _schema_for(self, submit_endpoint):
+        """Pick the payload schema for this endpoint."""
+        if self.payload_schema == "full":
+            return PAYLOAD_SCHEMA_FULL
+        if self.payload_schema == "compact":
+            return PAYLOAD_SCHEMA_COMPACT
+        negotiated = _negotiated_schemas.get(submit_endpoint)
+        if negotiated is None:
+            return PAYLOAD_SCHEMA_COMPACT
+        schema, since = negotiated
+        if schema == PAYLOAD_SCHEMA_FULL and time.monotonic() - since >= SCHEMA_RETRY_INTERVAL:
+            # The backend may have been upgraded since: negotiate again
+            return PAYLOAD_SCHEMA_COMPACT
+        return schema
+
+    @staticmethod
+    def _schema_rejected(resp):
+        """Whether the backend refused a compact payload because of its schema."""
+        if resp.status_code == UNSUPPORTED_SCHEMA_STATUS:
+            return True
+        return (resp.status_code in VALIDATION_STATUSES
+                and resp.headers.get(PAYLOAD_SCHEMA_HEADER) != str(PAYLOAD_SCHEMA_COMPACT))
+
+    @staticmethod
+    def _remember_schema(submit_endpoint, schema):
+        with _negotiation_lock:
+            _negotiated_schemas[submit_endpoint] = (schema, time.monotonic())
+
+    def _post_payload(self, submit_endpoint, schema, user_data, category, street, custom_text):
+        """Encode the payload for the given schema and POST it."""
+        if schema == PAYLOAD_SCHEMA_COMPACT:
+            payload = self._prepare_compact_payload(user_data, category, street, custom_text)
+        else:
+            payload = self._prepare_json_payload(user_data, category, street, custom_text)
+        body = dumps_bytes(payload)
+
+        headers = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Accept': 'application/json',
+            PAYLOAD_SCHEMA_HEADER: str(schema),
+        }
+
+        logger.info(
+            "Submitting incident",
+            extra={"endpoint": submit_endpoint, "schema": schema, "bytes": len(body)}
+        )
+        logger.debug("Incident payload", extra={"payload": payload})
+
+        started = time.perf_counter()
+        resp = self.session.post(
+            submit_endpoint,
+            data=body,
+            headers=headers,
+            timeout=self.timeout
+        )
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        logger.info(
+            "Incident service responded",
+            extra={"status_code": resp.status_code, "elapsed_ms": elapsed_ms}
+        )
+        logger.debug("Incident service response body", extra={"body": resp.text})
+        return resp
+
     def _prepare_json_payload(self, user_data, category, street, custom_text=None):
         """
         Prepare JSON payload for Cloud Run incident service.
-        Uses custom_text if provided, otherwise falls back to category.event_call_desc.
+        Uses custom_text if provided, otherwise falls back to category.event_call_desc,
+        sent as stored rather than re-joined from category.options.
         """
         return {
-            "user_data": {
-                "first_name": user_data.first_name,
-                "last_name": user_data.last_name,
-                "phone": user_data.phone,
-                "user_id": user_data.user_id,
-                "email": user_data.email or ""
-            },
+            "user_data": self._user_fields(user_data),
             "category": {
                 "id": category.id,
                 "name": category.name,
@@ -131,6 +291,30 @@ class APIService:
             "custom_text": custom_text or category.event_call_desc
         }
 
+    def _prepare_compact_payload(self, user_data, category, street, custom_text=None):
+        """
+        Prepare the v2 payload: ids only, the backend resolves category and street.
+        custom_text is None when the resident kept no text, in which case the
+        backend uses the category's default description.
+        """
+        return {
+            "schema_version": PAYLOAD_SCHEMA_COMPACT,
+            "user_data": self._user_fields(user_data),
+            "category_id": category.id,
+            "street_id": street.id,
+            "custom_text": custom_text or None
+        }
+
+    @staticmethod
+    def _user_fields(user_data):
+        return {
+            "first_name": user_data.first_name,
+            "last_name": user_data.last_name,
+            "phone": user_data.phone,
+            "user_id": user_data.user_id,
+            "email": user_data.email or ""
+        }
+
     def _mock_response(self):
         """
         Generate mock response for debug mode.
@@ -140,4 +324,4 @@ class APIService:
             ErrorDescription="Mocked success.",
             ResultStatus="SUCCESS CREATE",
             data="MOCK-0001"
-        ) 
\ No newline at end of file
+        )
@@ -0,0 +1,147 @@
+"""
+Process-wide catalog.
+
+One SupabaseService (and with it one pooled HTTP client) per Supabase
+project, and one CatalogCache holding the categories and streets every
+session shows. Search indexes are built when the catalog is fetched, not on
+each keystroke. The cache refetches after `ttl` seconds; while one thread
+refreshes, the others keep serving the previous catalog.
+
+These live at module level rather than in st.cache_resource so that the
+warm-up started by app/serve.py, outside any script run, fills the same
+objects the script runs use.
+"""
+import threading
+import time
+from app.services.supabase_service import SupabaseService
+from app.utils.street_catalog import StreetCatalog
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_lock = threading.Lock()
+_services = {}
+_caches = {}
+
+
+class SearchIndex:
+    """Case-insensitive substring search over some text fields, folded once per catalog."""
+
+    def __init__(self, items, fields):
+        self.items = items
+        # \x1f keeps a query from matching across two fields
+        self._texts = ["\x1f".join(getattr(item, f) or "" for f in fields).casefold() for item in items]
+
+    def search(self, query):
+        if not query:
+            return self.items
+        query = query.casefold()
+        return [item for item, text in zip(self.items, self._texts) if query in text]
+
+
+class Catalog:
+    __slots__ = ("categories", "streets", "category_index", "street_index", "fetched_at")
+
+    def __init__(self, categories, streets, fetched_at):
+        if not isinstance(streets, StreetCatalog):
+            streets = StreetCatalog.from_records(streets)
+        self.categories = categories
+        self.streets = streets
+        # Name and synonyms, split and folded once when the rows were loaded
+        self.category_index = SearchIndex(categories, ("search_key",))
+        # Searches its own columns
+        self.street_index = streets
+        self.fetched_at = fetched_at
+
+    @property
+    def complete(self):
+        return bool(self.categories) and bool(self.streets)
+
+
+class CatalogCache:
+    """
+    Categories and streets shared by all sessions. An incomplete fetch (an
+    empty table or a failed query) is retried after `retry_interval` seconds
+    instead of being kept for the whole ttl.
+    """
+
+    def __init__(self, supabase, ttl=300.0, retry_interval=10.0, clock=time.monotonic):
+        self.supabase = supabase
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._catalog = None
+
+    def _stale(self, catalog):
+        max_age = self.ttl if catalog.complete else self.retry_interval
+        return self._clock() - catalog.fetched_at >= max_age
+
+    def _fetch(self):
+        started = time.perf_counter()
+        catalog = Catalog(self.supabase.get_categories(), self.supabase.get_street_numbers(), self._clock())
+        logger.info(
+            "Catalog loaded",
+            extra={
+                "categories": len(catalog.categories),
+                "streets": len(catalog.streets),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        )
+        return catalog
+
+    def _refresh(self):
+        catalog = self._fetch()
+        previous = self._catalog
+        if catalog.complete or previous is None or not previous.complete:
+            self._catalog = catalog
+        else:
+            # Keep serving the last good catalog; try again after retry_interval
+            previous.fetched_at = self._clock() - self.ttl + self.retry_interval
+            logger.warning("Catalog refresh incomplete, keeping the previous catalog")
+
+    def get(self) -> Catalog:
+        catalog = self._catalog
+        if catalog is not None and not self._stale(catalog):
+            return catalog
+        if catalog is None:
+            # Nothing to show yet: everyone waits for the first fetch
+            with self._lock:
+                if self._catalog is None:
+                    self._refresh()
+                return self._catalog
+        if self._lock.acquire(blocking=False):
+            try:
+                if self._stale(self._catalog):
+                    self._refresh()
+            finally:
+                self._lock.release()
+        return self._catalog
+
+
+def get_supabase_service(supabase_url, supabase_key, slow_query_ms=500) -> SupabaseService:
+    """The process's SupabaseService for this project, created on first use."""
+    key = (supabase_url, supabase_key, slow_query_ms)
+    with _lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = SupabaseService(supabase_url, supabase_key, slow_query_ms=slow_query_ms)
+        return service
+
+
+def get_catalog_cache(supabase_url, supabase_key, slow_query_ms=500, ttl=300.0) -> CatalogCache:
+    """The process's CatalogCache for this project, created on first use."""
+    key = (supabase_url, supabase_key, slow_query_ms, ttl)
+    supabase = get_supabase_service(supabase_url, supabase_key, slow_query_ms)
+    with _lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = CatalogCache(supabase, ttl=ttl)
+        return cache
+
+
+def discard(supabase_url, supabase_key, slow_query_ms=500, ttl=300.0):
+    """Forget the service and cache for these settings after a config change; current users finish with them."""
+    with _lock:
+        _services.pop((supabase_url, supabase_key, slow_query_ms), None)
+        _caches.pop((supabase_url, supabase_key, slow_query_ms, ttl), None)
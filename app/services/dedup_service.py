@@ -0,0 +1,129 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_phone(phone: str) -> str:
+    """Reduce a phone number to its local digits (+972 / 972 prefixes become 0)."""
+    digits = re.sub(r"\D", "", phone or "")
+    if digits.startswith("972"):
+        digits = "0" + digits[3:]
+    return digits
+
+
+def normalize_text(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different texts match."""
+    return _WHITESPACE_RE.sub(" ", (text or "").strip()).casefold()
+
+
+def submission_key(user_data, category, street, custom_text=None) -> str:
+    """Hash of (phone, category id, street id, normalized text) identifying a report."""
+    # The same fallback text the payload builder sends
+    text = custom_text or ", ".join(category.options)
+    raw = "\x1f".join((
+        normalize_phone(user_data.phone),
+        str(category.id),
+        str(street.id),
+        normalize_text(text),
+    ))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Submission:
+    __slots__ = ("done", "response", "expires_at")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.expires_at = None
+
+
+class SubmissionDeduplicator:
+    """
+    Absorbs repeated submissions of the same report.
+
+    Within window_seconds, a report identical to one already sent returns the
+    first report's APIResponse (and ticket id) without calling the backend.
+    Identical reports that arrive while the first is still in flight wait for
+    it and share its result. Failed submissions are not remembered, so the
+    resident can retry right away.
+    """
+
+    def __init__(self, window_seconds=300, clock=time.monotonic):
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def submit(self, api, user_data, category, street, custom_text=None, extra_files=None):
+        """Submit through api.submit_data unless an identical report is in flight or recent."""
+        if self.window_seconds <= 0 or extra_files:
+            return api.submit_data(user_data, category, street, custom_text=custom_text, extra_files=extra_files)
+
+        key = submission_key(user_data, category, street, custom_text)
+        with self._lock:
+            self._evict_expired()
+            entry = self._entries.get(key)
+            leader = entry is None
+            if leader:
+                entry = self._entries[key] = _Submission()
+
+        if not leader:
+            logger.info("Duplicate submission absorbed", extra={"in_flight": not entry.done.is_set()})
+            entry.done.wait()
+            if entry.response is not None:
+                return entry.response
+            # The first submission raised; let this caller try on its own
+            return api.submit_data(user_data, category, street, custom_text=custom_text, extra_files=extra_files)
+
+        try:
+            response = api.submit_data(user_data, category, street, custom_text=custom_text, extra_files=extra_files)
+        except Exception:
+            with self._lock:
+                self._entries.pop(key, None)
+            entry.response = None
+            entry.done.set()
+            raise
+
+        entry.response = response
+        with self._lock:
+            if self._is_success(response):
+                entry.expires_at = self._clock() + self.window_seconds
+                self._entries.move_to_end(key)
+            else:
+                self._entries.pop(key, None)
+        entry.done.set()
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _evict_expired(self):
+        # Completed entries are moved to the end as they finish, so the oldest
+        # expiries are at the front; in-flight entries (no expiry) are skipped.
+        now = self._clock()
+        expired = []
+        for key, entry in self._entries.items():
+            if entry.expires_at is None:
+                continue
+            if entry.expires_at > now:
+                break
+            expired.append(key)
+        for key in expired:
+            del self._entries[key]
+
+    @staticmethod
+    def _is_success(response):
+        return (
+            response is not None
+            and response.ResultCode == 200
+            and "SUCCESS" in response.ResultStatus
+        )
@@ -0,0 +1,218 @@
+import hashlib
+import importlib.util
+import math
+import threading
+import time
+from dataclasses import dataclass
+from app.services.dedup_service import normalize_phone
+from app.utils.logger import get_logger
+
+# Shared limits fall back to in-process buckets without redis. It is imported
+# only when RATE_LIMIT_REDIS_URL is set, not with this module
+HAS_REDIS = importlib.util.find_spec("redis") is not None
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket: holds up to `capacity` tokens, refilled at `refill_rate` per second."""
+    capacity: float
+    refill_rate: float
+
+    @classmethod
+    def parse(cls, spec: str):
+        """Parse "<count>/<seconds>" (e.g. "5/60"). Empty or "0" disables the limit."""
+        spec = (spec or "").strip()
+        if not spec or spec == "0":
+            return None
+        count, _, seconds = spec.partition("/")
+        count, seconds = float(count), float(seconds or 1)
+        if count <= 0 or seconds <= 0:
+            raise ValueError(f"Invalid rate limit: {spec!r}")
+        return cls(capacity=count, refill_rate=count / seconds)
+
+    @property
+    def idle_ttl(self) -> float:
+        """Seconds after which an untouched bucket is full again and can be dropped."""
+        return self.capacity / self.refill_rate
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    scope: str = ""          # which bucket refused the request
+    retry_after: float = 0.0  # seconds until enough tokens are available
+
+
+class MemoryBucketStore:
+    """Buckets in a dict guarded by a lock; limits are per process."""
+
+    SWEEP_EVERY = 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}  # key -> (tokens, updated_at, idle_ttl)
+        self._calls = 0
+
+    def take(self, buckets, now, cost=1.0):
+        """
+        Take `cost` tokens from every (key, RateLimit) in buckets, or from none.
+        Returns 0.0 when taken, otherwise (key, seconds to wait) of the slowest bucket.
+        """
+        with self._lock:
+            self._calls += 1
+            if self._calls % self.SWEEP_EVERY == 0:
+                self._sweep(now)
+
+            levels = []
+            refused = None
+            for key, limit in buckets:
+                tokens, updated_at, _ = self._buckets.get(key, (limit.capacity, now, 0))
+                tokens = min(limit.capacity, tokens + max(0.0, now - updated_at) * limit.refill_rate)
+                levels.append(tokens)
+                if tokens < cost:
+                    wait = (cost - tokens) / limit.refill_rate
+                    if refused is None or wait > refused[1]:
+                        refused = (key, wait)
+            if refused:
+                return refused
+            for (key, limit), tokens in zip(buckets, levels):
+                self._buckets[key] = (tokens - cost, now, limit.idle_ttl)
+            return 0.0
+
+    def _sweep(self, now):
+        idle = [k for k, (_, updated_at, ttl) in self._buckets.items() if now - updated_at > ttl]
+        for key in idle:
+            del self._buckets[key]
+
+
+# All-or-nothing take over several buckets, executed atomically by Redis.
+# ARGV: now, cost, then capacity/refill_rate pairs matching KEYS.
+_TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local levels = {}
+local refused = 0
+local wait = 0
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[1 + 2 * i])
+    local rate = tonumber(ARGV[2 + 2 * i])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    if tokens < cost then
+        local w = (cost - tokens) / rate
+        if w > wait then
+            wait = w
+            refused = i
+        end
+    end
+end
+if refused > 0 then
+    return {refused, tostring(wait)}
+end
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[1 + 2 * i])
+    local rate = tonumber(ARGV[2 + 2 * i])
+    redis.call('HSET', KEYS[i], 'tokens', tostring(levels[i] - cost), 'ts', tostring(now))
+    redis.call('PEXPIRE', KEYS[i], math.ceil(capacity / rate * 1000) + 1000)
+end
+return {0, '0'}
+"""
+
+
+class RedisBucketStore:
+    """Buckets in Redis (or any server speaking its protocol), shared by all replicas."""
+
+    def __init__(self, client, prefix="ratelimit:"):
+        from redis.exceptions import NoScriptError
+
+        self.client = client
+        self.prefix = prefix
+        self._no_script_error = NoScriptError
+        # Load the script up front instead of on the first NOSCRIPT reply
+        self._sha = client.script_load(_TAKE_SCRIPT)
+
+    def take(self, buckets, now, cost=1.0):
+        keys = [self.prefix + key for key, _ in buckets]
+        args = [repr(now), repr(cost)]
+        for _, limit in buckets:
+            args += [repr(limit.capacity), repr(limit.refill_rate)]
+        try:
+            refused, wait = self.client.evalsha(self._sha, len(keys), *keys, *args)
+        except self._no_script_error:
+            # Script cache was flushed (e.g. server restart)
+            self._sha = self.client.script_load(_TAKE_SCRIPT)
+            refused, wait = self.client.evalsha(self._sha, len(keys), *keys, *args)
+        if int(refused) == 0:
+            return 0.0
+        return (buckets[int(refused) - 1][0], float(wait))
+
+
+def create_bucket_store(redis_url=""):
+    """Shared Redis store when redis_url is set and reachable, else in-process buckets."""
+    if redis_url:
+        if not HAS_REDIS:
+            logger.warning("RATE_LIMIT_REDIS_URL set but redis is not installed, using in-process limits")
+        else:
+            try:
+                import redis
+
+                client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+                client.ping()
+                return RedisBucketStore(client)
+            except Exception as e:
+                logger.warning("Rate limit store unreachable, using in-process limits", extra={"error": str(e)})
+    return MemoryBucketStore()
+
+
+class RateLimiter:
+    """
+    Per-session, per-phone and global token buckets in front of submissions.
+    A request is allowed only if every applicable bucket has a token left.
+    """
+
+    def __init__(self, store, session_limit=None, phone_limit=None, global_limit=None, clock=time.time):
+        self.store = store
+        self.session_limit = session_limit
+        self.phone_limit = phone_limit
+        self.global_limit = global_limit
+        self._clock = clock
+
+    def check(self, session_id=None, phone=None) -> RateLimitDecision:
+        """Consume one token for this request, or report which bucket is empty."""
+        buckets = []
+        if self.session_limit and session_id:
+            buckets.append((f"session:{session_id}", self.session_limit))
+        if self.phone_limit and phone:
+            buckets.append((f"phone:{self._phone_key(phone)}", self.phone_limit))
+        if self.global_limit:
+            buckets.append(("global", self.global_limit))
+        if not buckets:
+            return RateLimitDecision(allowed=True)
+
+        try:
+            result = self.store.take(buckets, self._clock())
+        except Exception as e:
+            # Never let the limiter itself block residents
+            logger.warning("Rate limit check failed, allowing request", extra={"error": str(e)})
+            return RateLimitDecision(allowed=True)
+
+        if not result:
+            return RateLimitDecision(allowed=True)
+        key, wait = result
+        scope = key.split(":", 1)[0]
+        logger.warning("Submission rate limited", extra={"scope": scope, "retry_after": round(wait, 1)})
+        return RateLimitDecision(allowed=False, scope=scope, retry_after=wait)
+
+    @staticmethod
+    def _phone_key(phone):
+        # Bucket keys may live in a shared store, so never keep the raw number
+        return hashlib.sha256(normalize_phone(phone).encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def retry_after_seconds(decision) -> int:
+        return max(1, math.ceil(decision.retry_after))
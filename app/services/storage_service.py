@@ -1,15 +1,15 @@
 import streamlit as st
+import importlib.util
 import json
 from app.utils.models import UserData
 from app.utils.i18n import t
 from app.components.header import render_header
+from app.utils.logger import get_logger
 
-# Try to import streamlit_local_storage, fallback to None if it fails
-try:
-    from streamlit_local_storage import LocalStorage
-    HAS_LOCAL_STORAGE = True
-except ImportError:
-    HAS_LOCAL_STORAGE = False
+logger = get_logger(__name__)
+
+# streamlit_local_storage is optional and imported on first use
+HAS_LOCAL_STORAGE = importlib.util.find_spec("streamlit_local_storage") is not None
 
 class StorageService:
     USER_KEY = "user_data"
@@ -24,9 +24,11 @@ class StorageService:
         """Lazy initialization of LocalStorage only when needed."""
         if self._local_storage is None and HAS_LOCAL_STORAGE:
             try:
+                from streamlit_local_storage import LocalStorage
+
                 self._local_storage = LocalStorage()
             except Exception as e:
-                print(f"Failed to initialize LocalStorage: {e}")
+                logger.warning("Failed to initialize LocalStorage", extra={"error": str(e)})
                 self._local_storage = False
         return self._local_storage if self._local_storage is not False else None
 
@@ -37,22 +39,22 @@ class StorageService:
         # CRITICAL: Save to session state FIRST for immediate access
         st.session_state[self.USER_KEY] = data_json
         st.session_state.user_data = user_data  # Also store the object directly
-        print("✅ User data saved to session state immediately")
+        logger.debug("User data saved to session state")
         
         # Then save to localStorage for persistence (async)
         if HAS_LOCAL_STORAGE and self.local_storage:
             try:
                 self.local_storage.setItem(self.USER_KEY, data_json)
-                print("✅ User data queued for localStorage")
+                logger.debug("User data queued for localStorage")
             except Exception as e:
-                print(f"❌ Error saving to localStorage: {e}")
+                logger.warning("Error saving user data to localStorage", extra={"error": str(e)})
 
     def load_user_data(self) -> UserData:
         """Load user data from session state first, then localStorage."""
         
         # Check session state first (immediate access)
         if hasattr(st.session_state, 'user_data') and st.session_state.user_data:
-            print("✅ Loaded user data from session_state object")
+            logger.debug("Loaded user data from session_state object")
             return st.session_state.user_data
         
         # Check session state JSON backup
@@ -62,10 +64,10 @@ class StorageService:
                 d = json.loads(data)
                 user_data = UserData(**d)
                 st.session_state.user_data = user_data  # Cache the object
-                print("✅ Loaded user data from session_state JSON")
+                logger.debug("Loaded user data from session_state JSON")
                 return user_data
             except Exception as e:
-                print(f"Error parsing session state data: {e}")
+                logger.warning("Error parsing session state user data", extra={"error": str(e)})
         
         # Finally try localStorage (for persistence across sessions)
         if HAS_LOCAL_STORAGE and self.local_storage:
@@ -75,12 +77,12 @@ class StorageService:
                     d = json.loads(data)
                     user_data = UserData(**d)
                     st.session_state.user_data = user_data  # Cache the object
-                    print("✅ Loaded user data from localStorage")
+                    logger.debug("Loaded user data from localStorage")
                     return user_data
             except Exception as e:
-                print(f"Error loading from localStorage: {e}")
+                logger.warning("Error loading user data from localStorage", extra={"error": str(e)})
         
-        print("❌ No user data found")
+        logger.debug("No user data found")
         return None
         # print("❌ No user data found - generating random user data")
         # # Generate random user data as fallback
@@ -100,7 +102,7 @@ class StorageService:
                 self.local_storage.setItem(self.LANG_KEY, language)
                 return
             except Exception as e:
-                print(f"Error saving language to localStorage: {e}")
+                logger.warning("Error saving language to localStorage", extra={"error": str(e)})
         
         st.session_state[self.LANG_KEY] = language
 
@@ -112,7 +114,7 @@ class StorageService:
                 if lang:
                     return lang
             except Exception as e:
-                print(f"Error loading language from localStorage: {e}")
+                logger.warning("Error loading language from localStorage", extra={"error": str(e)})
         
         return st.session_state.get(self.LANG_KEY, "en")
 
@@ -132,21 +134,21 @@ class StorageService:
         # Add new ticket (avoid duplicates)
         if ticket_id and ticket_id not in tickets:
             tickets.append(ticket_id)
-            print(f"DEBUG: Added ticket {ticket_id} to history. Total tickets: {len(tickets)}")
+            logger.debug("Added ticket to history", extra={"ticket_id": ticket_id, "total": len(tickets)})
         else:
-            print(f"DEBUG: Ticket {ticket_id} already exists or is invalid")
+            logger.debug("Ticket already in history or invalid", extra={"ticket_id": ticket_id})
         
         # Save to localStorage as JSON string (array of strings)
         if HAS_LOCAL_STORAGE and self.local_storage:
             try:
                 self.local_storage.setItem(self.TICKET_KEY, json.dumps(tickets))
-                print(f"DEBUG: Saved to localStorage: {tickets}")
+                logger.debug("Ticket history saved to localStorage", extra={"total": len(tickets)})
             except Exception as e:
-                print(f"Error saving to localStorage: {e}")
+                logger.warning("Error saving ticket history to localStorage", extra={"error": str(e)})
         
         # Also save to session state as backup (array of strings)
         st.session_state[self.TICKET_KEY] = tickets
-        print(f"DEBUG: Saved to session state: {tickets}")
+        logger.debug("Ticket history saved to session state", extra={"total": len(tickets)})
 
     def get_ticket_history(self):
         """Get ticket history from browser localStorage or session state."""
@@ -158,7 +160,7 @@ class StorageService:
                     parsed = json.loads(data)
                     return parsed if isinstance(parsed, list) else []
             except Exception as e:
-                print(f"Error loading ticket history from localStorage: {e}")
+                logger.warning("Error loading ticket history from localStorage", extra={"error": str(e)})
         
         # Fallback to session state
         data = st.session_state.get(self.TICKET_KEY, [])
@@ -172,7 +174,7 @@ class StorageService:
                     self.local_storage.removeItem(key)
                 return
             except Exception as e:
-                print(f"Error clearing localStorage: {e}")
+                logger.warning("Error clearing localStorage", extra={"error": str(e)})
         
         for key in [self.USER_KEY, self.LANG_KEY, self.TICKET_KEY]:
             if key in st.session_state:
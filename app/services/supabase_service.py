@@ -1,33 +1,115 @@
 import os
 import re
-from supabase import create_client, Client
+import threading
+import time
 from app.utils.models import Category, StreetNumber
+from app.utils.street_catalog import StreetCatalog
+from app.utils.logger import get_logger
+from app.utils import metrics
+
+logger = get_logger(__name__)
+
+QUERY_SECONDS = metrics.REGISTRY.histogram(
+    "supabase_query_duration_seconds", "PostgREST call time, request to parsed rows.", ("table", "operation")
+)
+QUERY_TTFB_SECONDS = metrics.REGISTRY.histogram(
+    "supabase_query_ttfb_seconds", "PostgREST time to response headers (server plus network).", ("table", "operation")
+)
+QUERY_ROWS = metrics.REGISTRY.histogram(
+    "supabase_query_rows", "Rows returned per PostgREST call.", ("table", "operation"),
+    buckets=(0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000),
+)
+QUERY_BYTES = metrics.REGISTRY.histogram(
+    "supabase_query_response_bytes", "Response body size per PostgREST call.", ("table", "operation"),
+    buckets=(1_024, 10_240, 102_400, 1_048_576, 10_485_760, 104_857_600),
+)
+QUERY_ERRORS = metrics.REGISTRY.counter(
+    "supabase_query_errors_total", "Failed PostgREST calls by exception type.", ("table", "operation", "error")
+)
 
 class SupabaseService:
-    def __init__(self, supabase_url, supabase_key, ssl_cert=None, no_client=False):
+    def __init__(self, supabase_url, supabase_key, ssl_cert=None, no_client=False, slow_query_ms=500):
         self.ssl_cert = ssl_cert
-        self.client: Client = None
+        self.slow_query_ms = slow_query_ms
+        self.client = None
+        # Per-thread timing of the HTTP exchange behind the current query
+        self._io = threading.local()
         if not no_client:
+            # supabase (and its HTTP stack) is the heaviest import in the app; load it with the first client
+            from supabase import create_client
+
             self.client = create_client(supabase_url, supabase_key)
+            self._instrument_http()
+
+    def _instrument_http(self):
+        """Hook the PostgREST HTTP session to time headers and measure response bodies."""
+        try:
+            hooks = self.client.postgrest.session.event_hooks
+        except AttributeError:
+            return
+        hooks["request"].append(self._on_request)
+        hooks["response"].append(self._on_response)
+
+    def _on_request(self, request):
+        self._io.sent_at = time.perf_counter()
+
+    def _on_response(self, response):
+        sent_at = getattr(self._io, "sent_at", None)
+        if sent_at is not None:
+            self._io.ttfb = time.perf_counter() - sent_at
+        # PostgREST replies are read in full anyway; reading here lets us size them
+        response.read()
+        self._io.bytes = len(response.content)
+
+    def _execute(self, table, operation, query):
+        """Run a PostgREST query, recording duration, rows, bytes and failures."""
+        self._io.sent_at = self._io.ttfb = self._io.bytes = None
+        started = time.perf_counter()
+        try:
+            data = query.execute().data
+        except Exception as e:
+            QUERY_ERRORS.inc(table=table, operation=operation, error=type(e).__name__)
+            raise
+        duration = time.perf_counter() - started
+        ttfb, size = self._io.ttfb, self._io.bytes
+        QUERY_SECONDS.observe(duration, table=table, operation=operation)
+        QUERY_ROWS.observe(len(data), table=table, operation=operation)
+        if ttfb is not None:
+            QUERY_TTFB_SECONDS.observe(ttfb, table=table, operation=operation)
+        if size is not None:
+            QUERY_BYTES.observe(size, table=table, operation=operation)
+        if self.slow_query_ms is not None and duration * 1000 >= self.slow_query_ms:
+            logger.warning(
+                "Slow Supabase query",
+                extra={
+                    "table": table,
+                    "operation": operation,
+                    "duration_ms": round(duration * 1000, 1),
+                    "ttfb_ms": round(ttfb * 1000, 1) if ttfb is not None else None,
+                    "rows": len(data),
+                    "bytes": size,
+                },
+            )
+        return data
 
     def get_categories(self):
         if not self.client:
             raise RuntimeError("Supabase client not initialized.")
         try:
-            data = self.client.table("categories").select("*").execute().data
+            data = self._execute("categories", "select", self.client.table("categories").select("*"))
             return [Category(**item) for item in data]
         except Exception as e:
-            print(f"Supabase get_categories error: {e}")
+            logger.error("Supabase get_categories failed", extra={"error": str(e), "error_type": type(e).__name__})
             return []
 
     def get_street_numbers(self):
         if not self.client:
             raise RuntimeError("Supabase client not initialized.")
         try:
-            data = self.client.table("street_numbers").select("*").execute().data
-            return [StreetNumber(**item) for item in data]
+            data = self._execute("street_numbers", "select", self.client.table("street_numbers").select("*"))
+            return StreetCatalog.from_rows(data)
         except Exception as e:
-            print(f"Supabase get_street_numbers error: {e}")
+            logger.error("Supabase get_street_numbers failed", extra={"error": str(e), "error_type": type(e).__name__})
             return []
 
     def search_categories(self, query: str, categories=None):
@@ -42,17 +124,15 @@ class SupabaseService:
                 raise RuntimeError("Supabase client not initialized.")
             # Server-side search: ilike on name OR text
             try:
-                data = self.client.table("categories").select("*") \
-                    .or_(f"name.ilike.%{query}%,text.ilike.%{query}%") \
-                    .execute().data
+                data = self._execute("categories", "search", self.client.table("categories").select("*") \
+                    .or_(f"name.ilike.%{query}%,text.ilike.%{query}%"))
                 return [Category(**item) for item in data]
             except Exception as e:
-                print(f"Supabase search_categories error: {e}")
+                logger.error("Supabase search_categories failed", extra={"error": str(e), "error_type": type(e).__name__})
                 return []
-        # Fallback: local filtering
-        import re
-        pattern = re.compile(re.escape(query), re.IGNORECASE)
-        return [cat for cat in categories if pattern.search(cat.name) or pattern.search(cat.text)]
+        # Fallback: local filtering over the synonyms parsed at load
+        query = query.casefold()
+        return [cat for cat in categories if query in cat.search_key]
 
     def search_street_numbers(self, query: str, streets=None):
         """
@@ -65,12 +145,11 @@ class SupabaseService:
             if not self.client:
                 raise RuntimeError("Supabase client not initialized.")
             try:
-                data = self.client.table("street_numbers").select("*") \
-                    .or_(f"name.ilike.%{query}%,house_number.ilike.%{query}%") \
-                    .execute().data
+                data = self._execute("street_numbers", "search", self.client.table("street_numbers").select("*") \
+                    .or_(f"name.ilike.%{query}%,house_number.ilike.%{query}%"))
                 return [StreetNumber(**item) for item in data]
             except Exception as e:
-                print(f"Supabase search_street_numbers error: {e}")
+                logger.error("Supabase search_street_numbers failed", extra={"error": str(e), "error_type": type(e).__name__})
                 return []
         # Fallback: local filtering
         import re
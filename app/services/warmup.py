@@ -0,0 +1,218 @@
+"""
+Startup warm-up and readiness.
+
+The warm-up does, once per process, the work the first session would
+otherwise do: load the config, load the translation tables, import the
+modules the first page needs, create the Supabase client, fetch the catalog
+and build its search indexes, and open the pooled connection to the
+incident API that submits reuse. Failed steps are retried every
+`retry_interval` seconds until they succeed; before each retry the config is
+checked for a reload (SIGHUP or CONFIG_RELOAD). A config change reruns the
+steps built from the settings that changed, so fixing a bad endpoint makes a
+replica ready without a restart.
+
+GET /ready on the metrics endpoint answers 200 once every step has
+succeeded and 503 before that, so a load balancer only routes to warm
+replicas. app/serve.py starts the warm-up before Streamlit accepts
+connections; under plain `streamlit run` the first script run starts it.
+"""
+import importlib
+import json
+import threading
+import time
+from app.config.constants import SUPPORTED_LANGUAGES
+from app.config.settings import ConfigError, get_config, on_change
+from app.services import catalog_service
+from app.services.api_service import APIService
+from app.utils import i18n, metrics
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+READY = metrics.REGISTRY.gauge("app_ready", "1 once the startup warm-up has completed.")
+WARMUP_STEP_SECONDS = metrics.REGISTRY.gauge(
+    "app_warmup_step_seconds", "Duration of the last attempt of each warm-up step.", ("step",)
+)
+WARMUP_FAILURES = metrics.REGISTRY.counter(
+    "app_warmup_failures_total", "Failed warm-up step attempts.", ("step",)
+)
+
+# Imported lazily by the app (see tests/unit/test_imports.py) but needed by the first page
+FIRST_PAGE_MODULES = ("streamlit_image_gallery", "streamlit_local_storage")
+
+# Steps built from config -> the settings they use
+CONFIG_STEPS = {
+    "catalog": ("supabase_url", "supabase_key", "supabase_slow_query_ms", "catalog_ttl"),
+    "api_connection": ("api_endpoint", "debug_mode", "api_timeout"),
+}
+
+
+class Warmup:
+    """
+    Runs named steps in order on a daemon thread, retrying failed ones.
+    before_retry, if given, is called before each retry round.
+    """
+
+    def __init__(self, steps, retry_interval=5.0, before_retry=None):
+        self.steps = list(steps)
+        self.retry_interval = retry_interval
+        self.before_retry = before_retry
+        self.done = {}  # step -> seconds
+        self.errors = {}  # step -> last error
+        self.ready = threading.Event()
+        self._stale = set()  # done, but to run again for a new config
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+                self._thread.start()
+        return self
+
+    def _pending(self):
+        return [name for name, _ in self.steps if name not in self.done or name in self._stale]
+
+    def run(self):
+        started = time.perf_counter()
+        while True:
+            with self._lock:
+                steps = [(name, step) for name, step in self.steps if name not in self.done or name in self._stale]
+            for name, step in steps:
+                self._run_step(name, step)
+            with self._lock:
+                if not self._pending():
+                    # A later reconfigure() starts a new thread
+                    self._thread = None
+                    self.ready.set()
+                    READY.set(1)
+                    break
+            time.sleep(self.retry_interval)
+            if self.before_retry is not None:
+                self.before_retry()
+        logger.info(
+            "Warm-up complete",
+            extra={"duration_ms": round((time.perf_counter() - started) * 1000, 1), "steps": self.done},
+        )
+
+    def _run_step(self, name, step):
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            WARMUP_FAILURES.inc(step=name)
+            with self._lock:
+                self.errors[name] = f"{type(e).__name__}: {e}"
+                self._stale.discard(name)
+                if self.done.pop(name, None) is not None:
+                    # Worked with the previous config, fails with this one
+                    self.ready.clear()
+                    READY.set(0)
+            logger.warning("Warm-up step failed", extra={"step": name, "error_type": type(e).__name__, "error": str(e)})
+            return
+        finally:
+            WARMUP_STEP_SECONDS.set(time.perf_counter() - started, step=name)
+        with self._lock:
+            self.done[name] = round(time.perf_counter() - started, 3)
+            self._stale.discard(name)
+            self.errors.pop(name, None)
+
+    def reconfigure(self, steps, rerun=(), retry_interval=None):
+        """
+        Replace the steps (same names, new config) and run the named ones
+        again. Steps that had succeeded keep the replica ready while they
+        rerun; the thread is restarted if it had finished.
+        """
+        with self._lock:
+            self.steps = list(steps)
+            if retry_interval is not None:
+                self.retry_interval = retry_interval
+            self._stale.update(name for name in rerun if name in self.done)
+            if self._pending() and self._thread is None:
+                self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+                self._thread.start()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready.is_set(),
+                "done": dict(self.done),
+                "pending": self._pending(),
+                "errors": dict(self.errors),
+            }
+
+
+def _import_first_page_modules():
+    for name in FIRST_PAGE_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass  # optional; the app works without them
+
+
+def _load_catalog(config):
+    cache = catalog_service.get_catalog_cache(
+        config.supabase_url, config.supabase_key, config.supabase_slow_query_ms, config.catalog_ttl
+    )
+    catalog = cache.get()
+    if not catalog.complete:
+        raise RuntimeError(f"catalog incomplete: {len(catalog.categories)} categories, {len(catalog.streets)} streets")
+
+
+def _warm_api(config):
+    # Through the process's shared session, so submits reuse the connection
+    if config.api_endpoint and not config.debug_mode:
+        APIService(config.api_endpoint, config.debug_mode, timeout=config.api_timeout).check_health()
+
+
+def build_steps(config):
+    return [
+        ("translations", lambda: [i18n.compile_translations(lang) for lang in SUPPORTED_LANGUAGES]),
+        ("imports", _import_first_page_modules),
+        ("catalog", lambda: _load_catalog(config)),
+        ("api_connection", lambda: _warm_api(config)),
+    ]
+
+
+_warmup = None
+_warmup_lock = threading.Lock()
+
+
+def start(config, retry_interval=5.0) -> Warmup:
+    """Start the process's warm-up (once) and serve its state at /ready."""
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = Warmup(build_steps(config), retry_interval=retry_interval, before_retry=_check_config)
+            metrics.add_route("/ready", readiness)
+            _warmup.start()
+        return _warmup
+
+
+def _check_config():
+    """Pick up a pending reload between retries; a session may not have run yet to do it."""
+    try:
+        get_config()
+    except ConfigError:
+        pass  # only raised before a first valid config; start() had one
+
+
+def _on_config_change(old, new):
+    warm = _warmup
+    if warm is None:
+        return
+    rerun = [name for name, settings in CONFIG_STEPS.items()
+             if any(getattr(old, s) != getattr(new, s) for s in settings)]
+    if rerun:
+        logger.info("Config changed, rerunning warm-up steps", extra={"steps": rerun})
+    warm.reconfigure(build_steps(new), rerun, retry_interval=new.warmup_retry_interval)
+
+
+on_change("warmup", _on_config_change)
+
+
+def readiness():
+    """(status, content type, body) for GET /ready."""
+    state = _warmup.status() if _warmup is not None else {"ready": False, "done": {}, "pending": [], "errors": {}}
+    return (200 if state["ready"] else 503), "application/json", json.dumps(state)
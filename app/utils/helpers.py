@@ -1,6 +1,8 @@
 import streamlit as st
 from app.utils.i18n import t
-import logging
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 def handle_api_error(error, lang="he"):
     if hasattr(error, "__class__") and error.__class__.__name__ == "ConnectionError":
@@ -9,7 +11,7 @@ def handle_api_error(error, lang="he"):
         st.error(t("api_error.timeout", lang))
     else:
         st.error(t("api_error.generic", lang))
-    logging.error(f"API Error: {error}")
+    logger.error("API Error", extra={"error": str(error)})
 
 def handle_validation_error(errors, lang="he"):
     for error in errors:
@@ -17,4 +19,4 @@ def handle_validation_error(errors, lang="he"):
 
 def handle_database_error(error, lang="he"):
     st.error(t("database_error.generic", lang))
-    logging.error(f"Database Error: {error}") 
\ No newline at end of file
+    logger.error("Database Error", extra={"error": str(error)}) 
\ No newline at end of file
@@ -1,207 +1,397 @@
+"""
+Translations.
+
+assets/translations/<lang>.json are compiled into flat per-language tables of
+{"section.key": text}. The compiled tables are kept in one bundle file next
+to the sources so a process loads them with a single read:
+
+    python -m app.utils.i18n build
+
+The bundle is used only while it matches the sources' mtimes and sizes (one
+directory scan at startup) and the built-in FALLBACK_TRANSLATIONS it was
+compiled with (a hash); otherwise the JSON files are compiled again and
+the bundle is rewritten when the directory is writable. With
+I18N_HOT_RELOAD=1 the sources are rescanned at most every
+I18N_RELOAD_INTERVAL seconds and edited files take effect without a restart.
+"""
+import argparse
+import hashlib
 import json
 import os
-from functools import lru_cache
+import pickle
+import string
+import threading
+import time
+
+BUNDLE_FORMAT = 1
+HOT_RELOAD = os.getenv("I18N_HOT_RELOAD", "").lower() in ("yes", "true", "t", "1")
+RELOAD_INTERVAL = float(os.getenv("I18N_RELOAD_INTERVAL", "1"))
+
 
-# Multiple path strategies for different deployment environments
 def get_translations_path():
-    # Try different possible paths
-    possible_paths = [
-        os.path.join(os.path.dirname(__file__), '../../assets/translations'),  # From app/utils/
-        os.path.join(os.path.dirname(os.path.dirname(__file__)), '../assets/translations'),  # From app/
-        os.path.join(os.getcwd(), 'assets/translations'),  # From root
-        'assets/translations',  # Direct path
-    ]
-    
-    for path in possible_paths:
-        abs_path = os.path.abspath(path)
-        if os.path.exists(abs_path):
-            return abs_path
-    
-    # Return the first path as fallback
-    return os.path.abspath(possible_paths[0])
+    """assets/translations of this checkout, or of the working directory when run from elsewhere."""
+    package_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "assets", "translations"))
+    if os.path.isdir(package_path):
+        return package_path
+    return os.path.abspath(os.path.join("assets", "translations"))
 
 TRANSLATIONS_PATH = get_translations_path()
+BUNDLE_PATH = os.getenv("I18N_BUNDLE") or os.path.join(os.path.dirname(TRANSLATIONS_PATH), "translations.bundle")
 
-def get_fallback_translations(lang):
-    """Fallback translations when files can't be loaded"""
-    fallback = {
-        "he": {
-            "common": {
-                "search": "חיפוש",
-                "save": "שמור",
-                "send": "שלח",
-                "cancel": "ביטול",
-                "one_time": "יש למלא פעם אחת בלבד העיריה חוזרת טלפונית",
-                "ticket_history": "היסטוריית תקלות",
-                "anonymous_ticket": "פתיחה אנונימית של דיווח על מפגע ואכיפה לעיריה"
-            },
-            "forms": {
-                "first_name": "שם פרטי פיקטיבי (לא חובה)",
-                "last_name": "שם משפחה פיקטיבי (לא חובה)",
-                "phone": "טלפון",
-                "email": "אימייל - לא חובה",
-                "id_optional": "תז - לא חובה",
-                "category": "קטגוריה",
-                "street": "רחוב",
-                "text": "תלונה"
-            },
-            "success": {
-                "title": "נפתחה קריאה חדשה",
-                "message": "הבקשה שלך נשלחה בהצלחה.",
-                "ticket_number": "מס קריאה",
-                "new_ticket": "פתח קריאה חדשה",
-                "back_home": "חזרה לדף הבית",
-                "share_neighbor": "שתף עם שכן",
-                "share_neighbor_text": "תעזור לי להתלונן על זה"
-            },
-            "errors": {
-                "submission_failed": "שליחת הבקשה נכשלה"
-            }
+# Used for keys (or whole languages) missing from the translation files
+FALLBACK_TRANSLATIONS = {
+    "he": {
+        "common": {
+            "search": "חיפוש",
+            "save": "שמור",
+            "send": "שלח",
+            "cancel": "ביטול",
+            "one_time": "יש למלא פעם אחת בלבד העיריה חוזרת טלפונית",
+            "ticket_history": "היסטוריית תקלות",
+            "anonymous_ticket": "פתיחה אנונימית של דיווח על מפגע ואכיפה לעיריה"
+        },
+        "forms": {
+            "first_name": "שם פרטי פיקטיבי (לא חובה)",
+            "last_name": "שם משפחה פיקטיבי (לא חובה)",
+            "phone": "טלפון",
+            "email": "אימייל - לא חובה",
+            "id_optional": "תז - לא חובה",
+            "category": "קטגוריה",
+            "street": "רחוב",
+            "text": "תלונה"
+        },
+        "success": {
+            "title": "נפתחה קריאה חדשה",
+            "message": "הבקשה שלך נשלחה בהצלחה.",
+            "ticket_number": "מס קריאה",
+            "new_ticket": "פתח קריאה חדשה",
+            "back_home": "חזרה לדף הבית",
+            "share_neighbor": "שתף עם שכן",
+            "share_neighbor_text": "תעזור לי להתלונן על זה"
+        },
+        "errors": {
+            "submission_failed": "שליחת הבקשה נכשלה",
+            "rate_limited": "יותר מדי בקשות, נסו שוב בעוד {seconds} שניות"
+        }
+    },
+    "en": {
+        "common": {
+            "search": "Search",
+            "save": "Save",
+            "send": "Send",
+            "cancel": "Cancel",
+            "one_time": "Fill it one time only the city will call you",
+            "ticket_history": "Ticket History",
+            "anonymous_ticket": "Anonymous reporting of nuisances and enforcement to the municipality"
+        },
+        "forms": {
+            "first_name": "First Name (Optional)",
+            "last_name": "Last Name (Optional)",
+            "phone": "Phone Number",
+            "email": "Email (Optional)",
+            "id_optional": "ID Number (Optional)",
+            "category": "Category",
+            "street": "Street",
+            "text": "Complain Text"
+        },
+        "success": {
+            "title": "Success",
+            "message": "Your request has been submitted successfully.",
+            "ticket_number": "Ticket Number",
+            "new_ticket": "New Ticket",
+            "back_home": "Back to Home",
+            "share_neighbor": "Share with Neighbor",
+            "share_neighbor_text": "Help me to complain about it"
+        },
+        "errors": {
+            "submission_failed": "Request submission failed",
+            "rate_limited": "Too many requests, please try again in {seconds} seconds"
+        }
+    },
+    "fr": {
+        "common": {
+            "search": "Rechercher",
+            "save": "Sauvegarder",
+            "send": "Envoyer",
+            "cancel": "Annuler",
+            "one_time": "Remplir une seule fois la ville vous appellera",
+            "ticket_history": "Historique des tickets",
+            "anonymous_ticket": "Signalement anonyme de nuisances et d'application à la municipalité"
+        },
+        "forms": {
+            "first_name": "Prénom (Optionnel)",
+            "last_name": "Nom de famille (Optionnel)",
+            "phone": "Numéro de téléphone",
+            "email": "Email (Optionnel)",
+            "id_optional": "Numéro d'identité (Optionnel)",
+            "category": "Catégorie",
+            "street": "Rue",
+            "text": "Texte de plainte"
+        },
+        "success": {
+            "title": "Succès",
+            "message": "Votre demande a été soumise avec succès.",
+            "ticket_number": "Numéro de ticket",
+            "new_ticket": "Nouveau ticket",
+            "back_home": "Retour à l'accueil",
+            "share_neighbor": "Partager avec un voisin",
+            "share_neighbor_text": "Aidez-moi à plaindre"
         },
-        "en": {
-            "common": {
-                "search": "Search",
-                "save": "Save",
-                "send": "Send",
-                "cancel": "Cancel",
-                "one_time": "Fill it one time only the city will call you",
-                "ticket_history": "Ticket History",
-                "anonymous_ticket": "Anonymous reporting of nuisances and enforcement to the municipality"
-            },
-            "forms": {
-                "first_name": "First Name (Optional)",
-                "last_name": "Last Name (Optional)",
-                "phone": "Phone Number",
-                "email": "Email (Optional)",
-                "id_optional": "ID Number (Optional)",
-                "category": "Category",
-                "street": "Street",
-                "text": "Complain Text"
-            },
-            "success": {
-                "title": "Success",
-                "message": "Your request has been submitted successfully.",
-                "ticket_number": "Ticket Number",
-                "new_ticket": "New Ticket",
-                "back_home": "Back to Home",
-                "share_neighbor": "Share with Neighbor",
-                "share_neighbor_text": "Help me to complain about it"
-            },
-            "errors": {
-                "submission_failed": "Request submission failed"
-            }
+        "errors": {
+            "submission_failed": "Échec de la soumission de la demande",
+            "rate_limited": "Trop de demandes, veuillez réessayer dans {seconds} secondes"
+        }
+    },
+    "ru": {
+        "common": {
+            "search": "Поиск",
+            "save": "Сохранить",
+            "send": "Отправить",
+            "cancel": "Отмена",
+            "one_time": "Заполните только один раз город вам перезвонит",
+            "ticket_history": "История заявок",
+            "anonymous_ticket": "Анонимное сообщение о нарушениях и правоприменении в муниципалитет"
+        },
+        "forms": {
+            "first_name": "Имя (Необязательно)",
+            "last_name": "Фамилия (Необязательно)",
+            "phone": "Номер телефона",
+            "email": "Email (Необязательно)",
+            "id_optional": "Номер удостоверения (Необязательно)",
+            "category": "Категория",
+            "street": "Улица",
+            "text": "Текст жалобы"
         },
-        "fr": {
-            "common": {
-                "search": "Rechercher",
-                "save": "Sauvegarder",
-                "send": "Envoyer",
-                "cancel": "Annuler",
-                "one_time": "Remplir une seule fois la ville vous appellera",
-                "ticket_history": "Historique des tickets",
-                "anonymous_ticket": "Signalement anonyme de nuisances et d'application à la municipalité"
-            },
-            "forms": {
-                "first_name": "Prénom (Optionnel)",
-                "last_name": "Nom de famille (Optionnel)",
-                "phone": "Numéro de téléphone",
-                "email": "Email (Optionnel)",
-                "id_optional": "Numéro d'identité (Optionnel)",
-                "category": "Catégorie",
-                "street": "Rue",
-                "text": "Texte de plainte"
-            },
-            "success": {
-                "title": "Succès",
-                "message": "Votre demande a été soumise avec succès.",
-                "ticket_number": "Numéro de ticket",
-                "new_ticket": "Nouveau ticket",
-                "back_home": "Retour à l'accueil",
-                "share_neighbor": "Partager avec un voisin",
-                "share_neighbor_text": "Aidez-moi à plaindre"
-            },
-            "errors": {
-                "submission_failed": "Échec de la soumission de la demande"
-            }
+        "success": {
+            "title": "Успех",
+            "message": "Ваша заявка была успешно отправлена.",
+            "ticket_number": "Номер заявки",
+            "new_ticket": "Новая заявка",
+            "back_home": "Вернуться на главную",
+            "share_neighbor": "Поделиться с соседом",
+            "share_neighbor_text": "Помогите мне пожаловаться"
         },
-        "ru": {
-            "common": {
-                "search": "Поиск",
-                "save": "Сохранить",
-                "send": "Отправить",
-                "cancel": "Отмена",
-                "one_time": "Заполните только один раз город вам перезвонит",
-                "ticket_history": "История заявок",
-                "anonymous_ticket": "Анонимное сообщение о нарушениях и правоприменении в муниципалитет"
-            },
-            "forms": {
-                "first_name": "Имя (Необязательно)",
-                "last_name": "Фамилия (Необязательно)",
-                "phone": "Номер телефона",
-                "email": "Email (Необязательно)",
-                "id_optional": "Номер удостоверения (Необязательно)",
-                "category": "Категория",
-                "street": "Улица",
-                "text": "Текст жалобы"
-            },
-            "success": {
-                "title": "Успех",
-                "message": "Ваша заявка была успешно отправлена.",
-                "ticket_number": "Номер заявки",
-                "new_ticket": "Новая заявка",
-                "back_home": "Вернуться на главную",
-                "share_neighbor": "Поделиться с соседом",
-                "share_neighbor_text": "Помогите мне пожаловаться"
-            },
-            "errors": {
-                "submission_failed": "Ошибка отправки заявки"
-            }
+        "errors": {
+            "submission_failed": "Ошибка отправки заявки",
+            "rate_limited": "Слишком много запросов, попробуйте снова через {seconds} секунд"
         }
     }
-    return fallback.get(lang, fallback.get("en", {}))
+}
+
+def get_fallback_translations(lang):
+    """Built-in translations for lang (English for unknown languages)."""
+    return FALLBACK_TRANSLATIONS.get(lang, FALLBACK_TRANSLATIONS["en"])
+
 
-@lru_cache(maxsize=8)
 def get_translation(lang):
-    # Try multiple path strategies if the primary one fails
-    possible_files = [
-        os.path.join(TRANSLATIONS_PATH, f"{lang}.json"),
-        os.path.join(os.getcwd(), 'assets', 'translations', f"{lang}.json"),
-        os.path.join(os.path.dirname(__file__), '..', '..', 'assets', 'translations', f"{lang}.json"),
-        f"assets/translations/{lang}.json",
-    ]
-    
-    for file_path in possible_files:
+    """lang's translation file as nested dicts; the built-in strings when it cannot be read."""
+    try:
+        with open(os.path.join(TRANSLATIONS_PATH, f"{lang}.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return get_fallback_translations(lang)
+
+
+class CompiledTranslations:
+    """One language's strings flattened to {"section.key": text}."""
+    __slots__ = ("lang", "strings", "templates")
+
+    def __init__(self, lang, strings, templates):
+        self.lang = lang
+        self.strings = strings
+        # Keys whose text has format fields; other texts are returned without calling format()
+        self.templates = templates
+
+
+def _flatten(tree, prefix="", out=None):
+    out = {} if out is None else out
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            _flatten(value, f"{prefix}{key}.", out)
+        elif value:
+            out[f"{prefix}{key}"] = value
+    return out
+
+
+def _template_fields(text):
+    try:
+        return tuple(field for _, field, _, _ in string.Formatter().parse(text) if field is not None)
+    except ValueError:
+        return ()
+
+
+def compile_language(lang, tree) -> CompiledTranslations:
+    """
+    Flatten one language's nested translations. Keys the tree lacks fall back
+    to the built-in strings for lang (or English), so lookups never walk a
+    second table.
+    """
+    strings = _flatten(get_fallback_translations(lang))
+    strings.update(_flatten(tree))
+    templates = frozenset(
+        key for key, text in strings.items() if isinstance(text, str) and _template_fields(text)
+    )
+    return CompiledTranslations(lang, strings, templates)
+
+
+def source_stamps(directory=None) -> dict:
+    """{file name: (mtime_ns, size)} for the translation sources, from one directory scan."""
+    try:
+        with os.scandir(directory or TRANSLATIONS_PATH) as entries:
+            stats = {e.name: e.stat() for e in entries if e.name.endswith(".json") and e.is_file()}
+    except OSError:
+        return {}
+    return {name: (st.st_mtime_ns, st.st_size) for name, st in stats.items()}
+
+
+def fallback_digest() -> str:
+    """Hash of FALLBACK_TRANSLATIONS, which build_bundle compiles into every table."""
+    text = json.dumps(FALLBACK_TRANSLATIONS, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def build_bundle(directory=None) -> dict:
+    """Compile every <lang>.json in directory into one bundle."""
+    directory = directory or TRANSLATIONS_PATH
+    stamps = source_stamps(directory)
+    tables = {}
+    for name in sorted(stamps):
+        lang = name[:-len(".json")]
         try:
-            abs_path = os.path.abspath(file_path)
-            if os.path.exists(abs_path):
-                with open(abs_path, encoding="utf-8") as f:
-                    data = json.load(f)
-                    return data
-        except Exception:
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                tree = json.load(f)
+        except (OSError, ValueError):
             continue
-    
-    # If all paths fail, return fallback translations
-    return get_fallback_translations(lang)
+        table = compile_language(lang, tree)
+        tables[lang] = (table.strings, sorted(table.templates))
+    return {"format": BUNDLE_FORMAT, "sources": stamps, "fallbacks": fallback_digest(), "tables": tables}
+
+
+def write_bundle(bundle, path=None):
+    path = path or BUNDLE_PATH
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(bundle, f, protocol=4)
+    os.replace(tmp, path)
+
+
+def read_bundle(path=None):
+    """The bundle at path, or None when it is missing, unreadable or of another format."""
+    try:
+        with open(path or BUNDLE_PATH, "rb") as f:
+            bundle = pickle.loads(f.read())
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(bundle, dict) or bundle.get("format") != BUNDLE_FORMAT:
+        return None
+    return bundle
+
+
+class _Catalog:
+    __slots__ = ("tables", "sources", "checked_at")
+
+    def __init__(self, bundle):
+        self.tables = {
+            lang: CompiledTranslations(lang, strings, frozenset(templates))
+            for lang, (strings, templates) in bundle["tables"].items()
+        }
+        self.sources = bundle["sources"]
+        self.checked_at = time.monotonic()
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def _load_catalog():
+    stamps = source_stamps()
+    bundle = read_bundle()
+    if bundle is None or bundle["sources"] != stamps or bundle.get("fallbacks") != fallback_digest():
+        bundle = build_bundle()
+        if stamps:
+            try:
+                write_bundle(bundle)
+            except OSError:
+                pass  # read-only deployment; compiled in memory for this process
+    return _Catalog(bundle)
+
+
+def _current_catalog():
+    global _catalog
+    catalog = _catalog
+    if catalog is not None and not (HOT_RELOAD and time.monotonic() - catalog.checked_at >= RELOAD_INTERVAL):
+        return catalog
+    with _catalog_lock:
+        catalog = _catalog
+        if catalog is None:
+            catalog = _catalog = _load_catalog()
+        elif HOT_RELOAD and time.monotonic() - catalog.checked_at >= RELOAD_INTERVAL:
+            if source_stamps() != catalog.sources:
+                catalog = _catalog = _load_catalog()
+            else:
+                catalog.checked_at = time.monotonic()
+    return catalog
+
+
+def reload_translations():
+    """Drop the loaded tables; the next lookup loads the bundle (or the sources) again."""
+    global _catalog
+    with _catalog_lock:
+        _catalog = None
+
+
+def compile_translations(lang) -> CompiledTranslations:
+    """The compiled table for lang; languages without a file get the built-in strings."""
+    tables = _current_catalog().tables
+    table = tables.get(lang)
+    if table is None:
+        table = tables[lang] = compile_language(lang, {})
+    return table
+
 
 def t(key: str, lang: str = "he", **kwargs) -> str:
-    """Translate a key for the given language. Translations loaded from external files."""
-    translations = get_translation(lang)
-    
-    # Support nested keys with dot notation
-    value = translations
-    for part in key.split('.'):
-        if isinstance(value, dict):
-            value = value.get(part)
-        else:
-            value = None
-            break
-    
-    if not value:
-        value = key
-        
-    if kwargs:
+    """Translate a dotted key for the given language; unknown keys are returned as is."""
+    table = compile_translations(lang)
+    value = table.strings.get(key)
+    if value is None:
+        return key
+    if kwargs and key in table.templates:
         try:
-            value = value.format(**kwargs)
+            return value.format(**kwargs)
         except Exception:
             pass
-    return value 
\ No newline at end of file
+    return value
+
+
+def t_many(keys, lang: str = "he", prefix: str = "", **kwargs) -> dict:
+    """{key: text} for several keys at once, each looked up as prefix + key."""
+    table = compile_translations(lang)
+    strings, templates = table.strings, table.templates
+    result = {}
+    for key in keys:
+        full_key = prefix + key
+        value = strings.get(full_key)
+        if value is None:
+            value = full_key
+        elif kwargs and full_key in templates:
+            try:
+                value = value.format(**kwargs)
+            except Exception:
+                pass
+        result[key] = value
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Translation bundle")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="compile assets/translations/*.json into one bundle")
+    build.add_argument("--out", default=BUNDLE_PATH, help=f"default {BUNDLE_PATH}")
+    args = parser.parse_args(argv)
+    bundle = build_bundle()
+    write_bundle(bundle, args.out)
+    print(f"{args.out}: {len(bundle['tables'])} languages, {sum(len(s) for s, _ in bundle['tables'].values())} strings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Responsive, pre-optimized images served from static/images.
+
+    python -m app.utils.image_assets build
+
+resizes every entry of IMAGES to its widths and encodes AVIF, WebP and JPEG
+copies (PNG instead of JPEG for images with transparency) named
+<name>-<width>w.<hash>.<ext>, and records them in manifest.json. The content
+hash in the name means a file never changes once published, so caches can
+keep it forever. Rebuild and commit the output whenever a source image
+changes.
+
+picture_html() renders a <picture> from the manifest; only the build step
+needs Pillow.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from html import escape
+
+from app.utils.static_assets import STATIC_DIR, STATIC_URL
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+IMAGES_DIR = os.path.join(STATIC_DIR, "images")
+MANIFEST_PATH = os.path.join(IMAGES_DIR, "manifest.json")
+
+# Best first; browsers take the first <source> type they support
+FORMATS = ("avif", "webp", "jpeg")
+_MIME = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+_EXTENSIONS = {"avif": "avif", "webp": "webp", "jpeg": "jpg", "png": "png"}
+
+
+@dataclass(frozen=True)
+class ImageSpec:
+    source: str
+    widths: tuple
+    # The <img sizes> attribute: how wide the image is drawn, so the browser can pick a width
+    sizes: str = "100vw"
+    quality: int = 80
+
+
+IMAGES = {
+    # Drawn 140px high (app.css), about 366px wide; 1x to 3x screens
+    "banner": ImageSpec("assets/images/banner.png", widths=(400, 800, 1200), sizes="366px"),
+}
+
+
+def _has_alpha(image):
+    if "transparency" in image.info:
+        return True
+    return image.mode in ("RGBA", "LA", "PA") and image.getchannel("A").getextrema()[0] < 255
+
+
+def _encode(image, fmt, quality):
+    buffer = io.BytesIO()
+    if fmt == "png":
+        image.save(buffer, "PNG", optimize=True)
+    elif fmt == "jpeg":
+        image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    elif fmt == "avif":
+        # AVIF's quality scale runs high; 25 lower looks about like WebP/JPEG at `quality`
+        image.save(buffer, "AVIF", quality=max(quality - 25, 1))
+    else:
+        image.save(buffer, "WEBP", quality=quality, method=6)
+    return buffer.getvalue()
+
+
+def available_formats(formats=FORMATS):
+    from PIL import features
+    return tuple(f for f in formats if f == "jpeg" or features.check(f))
+
+
+def build(images=None, out_dir=IMAGES_DIR, formats=None, root=ROOT) -> dict:
+    """Encode every image's variants into out_dir, write manifest.json and remove stale files."""
+    from PIL import Image
+
+    images = IMAGES if images is None else images
+    formats = available_formats() if formats is None else formats
+    os.makedirs(out_dir, exist_ok=True)
+    manifest, written = {}, set()
+    for name, spec in sorted(images.items()):
+        with Image.open(os.path.join(root, spec.source)) as source:
+            source.load()
+        alpha = _has_alpha(source)
+        image = source.convert("RGBA" if alpha else "RGB")
+        image_formats = [("png" if alpha and f == "jpeg" else f) for f in formats]
+        widths = sorted({min(w, image.width) for w in spec.widths})
+        variants = {fmt: [] for fmt in image_formats}
+        for width in widths:
+            height = round(image.height * width / image.width)
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for fmt in image_formats:
+                data = _encode(resized, fmt, spec.quality)
+                filename = f"{name}-{width}w.{hashlib.sha256(data).hexdigest()[:10]}.{_EXTENSIONS[fmt]}"
+                with open(os.path.join(out_dir, filename), "wb") as f:
+                    f.write(data)
+                written.add(filename)
+                variants[fmt].append({"width": width, "file": filename, "bytes": len(data)})
+        manifest[name] = {"width": image.width, "height": image.height, "sizes": spec.sizes, "variants": variants}
+
+    for filename in os.listdir(out_dir):
+        if filename not in written and filename != os.path.basename(MANIFEST_PATH):
+            os.remove(os.path.join(out_dir, filename))
+    with open(os.path.join(out_dir, os.path.basename(MANIFEST_PATH)), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return manifest
+
+
+@lru_cache(maxsize=4)
+def load_manifest(path=MANIFEST_PATH) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _srcset(variants):
+    return ", ".join(f"{STATIC_URL}/images/{v['file']} {v['width']}w" for v in variants)
+
+
+def picture_html(name, alt="", css_class="", manifest=None):
+    """<picture> markup for a built image, or None when it is not in the manifest."""
+    entry = (load_manifest() if manifest is None else manifest).get(name)
+    if not entry:
+        return None
+    variants, sizes = entry["variants"], escape(entry["sizes"])
+    fallback_format = "jpeg" if "jpeg" in variants else "png"
+    sources = "".join(
+        f'<source type="{_MIME[fmt]}" srcset="{_srcset(variants[fmt])}" sizes="{sizes}">'
+        for fmt in variants if fmt != fallback_format
+    )
+    fallback = variants[fallback_format]
+    # Smallest variant as src for browsers without srcset support
+    img = (
+        f'<img src="{STATIC_URL}/images/{fallback[0]["file"]}" srcset="{_srcset(fallback)}" sizes="{sizes}" '
+        f'width="{entry["width"]}" height="{entry["height"]}" alt="{escape(alt)}" '
+        f'class="{escape(css_class)}" decoding="async">'
+    )
+    return f"<picture>{sources}{img}</picture>"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimized image assets")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help=f"encode IMAGES into {os.path.relpath(IMAGES_DIR, ROOT)}")
+    parser.parse_args(argv)
+    manifest = build()
+    for name, entry in manifest.items():
+        for fmt, variants in entry["variants"].items():
+            sizes = ", ".join(f"{v['width']}w {v['bytes'] / 1024:.0f} KiB" for v in variants)
+            print(f"{name} {fmt}: {sizes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Structured, non-blocking logging for the app.
+
+Callers log through a QueueHandler, so a log call only enqueues the record.
+A QueueListener thread formats each record as one JSON line and writes it to
+stderr. UserData fields are redacted before anything leaves the process.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+from dataclasses import asdict, is_dataclass
+
+LOGGER_NAME = "app"
+REDACTED = "***"
+
+# UserData attributes plus their incident-service (SharePoint) aliases
+REDACTED_FIELDS = frozenset({
+    "first_name", "last_name", "phone", "user_id", "email",
+    "callerFirstName", "callerLastName", "callerTZ", "callerPhone1", "callerEmail",
+})
+
+# Free text may still carry contact details, mask anything that looks like one
+_EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+_PHONE_RE = re.compile(r"(?<!\d)(?:\+?972|0)[\d\-\s]{7,13}\d(?!\d)")
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_setup_lock = threading.Lock()
+_listener = None
+
+
+def redact_text(text: str) -> str:
+    """Mask email addresses and phone numbers inside free text."""
+    text = _EMAIL_RE.sub(REDACTED, text)
+    return _PHONE_RE.sub(REDACTED, text)
+
+
+def redact(value):
+    """Return a JSON-friendly copy of value with UserData fields masked."""
+    if is_dataclass(value) and not isinstance(value, type):
+        value = asdict(value)
+    if isinstance(value, dict):
+        return {
+            k: (REDACTED if k in REDACTED_FIELDS and v else redact(v))
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple, set)):
+        return [redact(v) for v in value]
+    if isinstance(value, str):
+        return redact_text(value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return redact_text(str(value))
+
+
+class JSONFormatter(logging.Formatter):
+    """Render a record as a single JSON object with redacted extra fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+                  + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": redact_text(record.getMessage()),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = REDACTED if key in REDACTED_FIELDS else redact(value)
+        if record.exc_info:
+            entry["exc"] = redact_text(self.formatException(record.exc_info))
+        elif record.exc_text:
+            entry["exc"] = redact_text(record.exc_text)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread."""
+
+    def prepare(self, record):
+        # The stock prepare() formats the message on the caller's thread; we only
+        # snapshot the traceback so the record is safe to hand to another thread.
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(level=None, stream=None):
+    """Install the queue pipeline on the app logger. Safe to call repeatedly."""
+    global _listener
+    with _setup_lock:
+        app_logger = logging.getLogger(LOGGER_NAME)
+        app_logger.setLevel(level or os.getenv("LOG_LEVEL", "INFO").upper())
+        if _listener is not None:
+            return app_logger
+
+        log_queue = queue.SimpleQueue()
+        output = logging.StreamHandler(stream)
+        output.setFormatter(JSONFormatter())
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+        app_logger.handlers = [_DeferredQueueHandler(log_queue)]
+        app_logger.propagate = False
+        return app_logger
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+            logging.getLogger(LOGGER_NAME).handlers = []
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a logger under the app namespace, configuring the pipeline on first use."""
+    if _listener is None:
+        configure_logging()
+    if name != LOGGER_NAME and not name.startswith(LOGGER_NAME + "."):
+        name = f"{LOGGER_NAME}.{name}"
+    return logging.getLogger(name)
@@ -0,0 +1,207 @@
+"""
+Session memory accounting.
+
+Every session keeps its own user data and queued analytics events in
+st.session_state, next to references to the process-wide catalog.
+SessionMemoryTracker measures the deep size of each key at most once per
+interval per session, keeps the latest figures for all live sessions,
+publishes totals through the metrics registry and logs a warning when one
+session goes over its budget. Objects handed to share(), the catalog, are
+sized once on their own and left out of every session's figures.
+"""
+import re
+import sys
+import threading
+import time
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from app.utils import metrics
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Shared by everyone, not owned by the session holding a reference
+_SHARED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None))
+
+# Widget and component keys carry counts/hashes (gallery_streets_200_-8812...);
+# fold them so metric labels stay bounded
+_KEY_NUMBERS_RE = re.compile(r"_(?:-?\d+|empty)(?=_|$)")
+MAX_KEY_LABELS = 50
+OTHER_KEY = "other"
+
+SESSION_STATE_BYTES = metrics.REGISTRY.gauge(
+    "app_session_state_bytes", "Deep size of session_state across tracked sessions, by key.", ("key",)
+)
+SESSION_STATE_TOTAL_BYTES = metrics.REGISTRY.gauge(
+    "app_session_state_total_bytes", "Deep size of session_state summed over tracked sessions."
+)
+SESSION_STATE_MAX_BYTES = metrics.REGISTRY.gauge(
+    "app_session_state_max_bytes", "Deep size of the largest tracked session."
+)
+SESSIONS_TRACKED = metrics.REGISTRY.gauge(
+    "app_sessions_tracked", "Sessions with a recent memory measurement."
+)
+SHARED_BYTES = metrics.REGISTRY.gauge(
+    "app_shared_catalog_bytes", "Deep size of the catalog shared by all sessions, not counted in session sizes."
+)
+SESSION_BUDGET_EXCEEDED = metrics.REGISTRY.counter(
+    "app_session_budget_exceeded_total", "Sessions that went over the memory budget."
+)
+
+
+def deep_size(obj, seen=None) -> int:
+    """Approximate bytes retained by obj, following containers, __dict__ and __slots__."""
+    seen = set() if seen is None else seen
+    stack = [obj]
+    size = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj, 0)
+        if isinstance(obj, _ATOMIC_TYPES):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        if hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+        for slot in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, slot):
+                stack.append(getattr(obj, slot))
+    return size
+
+
+def key_label(key) -> str:
+    return _KEY_NUMBERS_RE.sub("", str(key))
+
+
+def measure(state, exclude=()) -> dict:
+    """{key: deep size} for a mapping such as st.session_state.to_dict(), not counting objects whose id is in exclude."""
+    seen = set(exclude)
+    # Keys share objects (e.g. a selected category is also in categories_data);
+    # each object is charged to the first key that reaches it
+    return {key: deep_size(value, seen) for key, value in state.items()}
+
+
+class _SessionEntry:
+    __slots__ = ("sizes", "total", "measured_at", "over_budget")
+
+    def __init__(self):
+        self.sizes = {}
+        self.total = 0
+        self.measured_at = None
+        self.over_budget = False
+
+
+class SessionMemoryTracker:
+    """
+    Latest session_state sizes for every live session in this process.
+
+    Sessions that have not been measured for `session_ttl` seconds are
+    assumed closed and dropped.
+    """
+
+    def __init__(self, budget_bytes=50 * 1024 * 1024, interval=30.0, session_ttl=3600.0, clock=time.monotonic):
+        self.budget_bytes = budget_bytes
+        self.interval = interval
+        self.session_ttl = session_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._shared = None
+        self._shared_ids = frozenset()
+
+    def share(self, obj):
+        """
+        Leave obj, and everything it references, out of session sizes and
+        report its size in app_shared_catalog_bytes instead. Sized once per
+        object: passing the same one again is free.
+        """
+        if obj is self._shared:
+            return
+        seen = set()
+        size = deep_size(obj, seen)
+        with self._lock:
+            # Holding obj keeps these ids from being reused by other objects
+            self._shared, self._shared_ids = obj, frozenset(seen)
+        SHARED_BYTES.set(size)
+
+    def due(self, session_id) -> bool:
+        entry = self._sessions.get(session_id)
+        return entry is None or entry.measured_at is None or self._clock() - entry.measured_at >= self.interval
+
+    def track(self, session_id, state, force=False):
+        """Measure state for session_id if its interval has passed. Returns the sizes or None."""
+        if not session_id or not (force or self.due(session_id)):
+            return None
+        sizes = measure(state, self._shared_ids)
+        self.record(session_id, sizes)
+        return sizes
+
+    def record(self, session_id, sizes):
+        now = self._clock()
+        total = sum(sizes.values())
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = self._sessions[session_id] = _SessionEntry()
+            entry.sizes, entry.total, entry.measured_at = sizes, total, now
+            crossed = self.budget_bytes and total > self.budget_bytes and not entry.over_budget
+            entry.over_budget = bool(self.budget_bytes and total > self.budget_bytes)
+            self._evict_idle(now)
+            self._publish()
+        if crossed:
+            SESSION_BUDGET_EXCEEDED.inc()
+            largest = sorted(sizes.items(), key=lambda item: -item[1])[:5]
+            logger.warning(
+                "Session over memory budget",
+                extra={
+                    "session_bytes": total,
+                    "budget_bytes": self.budget_bytes,
+                    "largest_keys": {key_label(k): v for k, v in largest},
+                },
+            )
+
+    def forget(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._publish()
+
+    def snapshot(self) -> dict:
+        """{"sessions", "total_bytes", "max_bytes", "by_key"} over tracked sessions."""
+        with self._lock:
+            return self._aggregate()
+
+    def _evict_idle(self, now):
+        idle = [sid for sid, e in self._sessions.items() if now - e.measured_at > self.session_ttl]
+        for session_id in idle:
+            del self._sessions[session_id]
+
+    def _aggregate(self):
+        by_key = {}
+        for entry in self._sessions.values():
+            for key, size in entry.sizes.items():
+                label = key_label(key)
+                by_key[label] = by_key.get(label, 0) + size
+        if len(by_key) > MAX_KEY_LABELS:
+            ranked = sorted(by_key.items(), key=lambda item: -item[1])
+            by_key = dict(ranked[:MAX_KEY_LABELS - 1])
+            by_key[OTHER_KEY] = sum(size for _, size in ranked[MAX_KEY_LABELS - 1:])
+        totals = [e.total for e in self._sessions.values()]
+        return {
+            "sessions": len(totals),
+            "total_bytes": sum(totals),
+            "max_bytes": max(totals, default=0),
+            "by_key": by_key,
+        }
+
+    def _publish(self):
+        summary = self._aggregate()
+        SESSION_STATE_BYTES.replace({(key,): size for key, size in summary["by_key"].items()})
+        SESSION_STATE_TOTAL_BYTES.set(summary["total_bytes"])
+        SESSION_STATE_MAX_BYTES.set(summary["max_bytes"])
+        SESSIONS_TRACKED.set(summary["sessions"])
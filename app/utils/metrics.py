@@ -0,0 +1,311 @@
+"""
+In-process metrics with a Prometheus text endpoint.
+
+Histograms, counters and gauges live in a process-wide registry shared by every
+session. `rerun()` times a whole script run and `span()` times one phase of
+it; both are labeled with the page the run started on. `start_metrics_server`
+serves the registry at /metrics from a daemon thread next to Streamlit.
+
+    with metrics.rerun():
+        metrics.set_page(st.session_state.current_page)
+        with metrics.span("catalog_fetch"):
+            ...
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds; rerun phases range from microseconds (cached lookups) to seconds (submit)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    pairs += [f'{n}="{_escape(v)}"' for n, v in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._children.clear()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._children.get(self._key(labels), 0)
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            for key, value in sorted(self._children.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = value
+
+    def replace(self, values):
+        """Swap in a whole {label tuple: value} mapping, dropping label sets not in it."""
+        with self._lock:
+            self._children = {tuple(str(v) for v in key): value for key, value in values.items()}
+
+    def value(self, **labels):
+        return self._children.get(self._key(labels), 0)
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            for key, value in sorted(self._children.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                child = self._children[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            child[0][index] += 1
+            child[1] += value
+            child[2] += 1
+
+    def snapshot(self, **labels):
+        """(cumulative bucket counts incl. +Inf, sum, count) for one label set."""
+        with self._lock:
+            counts, total, count = self._children.get(self._key(labels), ([0] * (len(self.buckets) + 1), 0.0, 0))
+            counts = list(counts)
+        cumulative, running = [], 0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return cumulative, total, count
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            children = sorted((key, (list(c), s, n)) for key, (c, s, n) in self._children.items())
+        for key, (counts, total, count) in children:
+            running = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                running += c
+                labels = _format_labels(self.labelnames, key, (("le", _format_number(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {running}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics; asking twice for the same name returns the same metric."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+RERUN_SECONDS = REGISTRY.histogram(
+    "app_rerun_duration_seconds", "Wall time of one Streamlit script run.", ("page",)
+)
+PHASE_SECONDS = REGISTRY.histogram(
+    "app_phase_duration_seconds", "Wall time of one phase of a script run.", ("phase", "page")
+)
+RERUN_ERRORS = REGISTRY.counter(
+    "app_rerun_errors_total", "Script runs that ended with an exception.", ("page",)
+)
+
+# Each script run executes on its own thread, so the page label is per thread
+_run = threading.local()
+
+
+def set_page(page):
+    """Label the current run's spans (and the run itself) with this page."""
+    _run.page = page or "unknown"
+
+
+def current_page():
+    return getattr(_run, "page", "unknown")
+
+
+@contextmanager
+def span(phase):
+    """Time the enclosed block as one phase of the current run."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASE_SECONDS.observe(time.perf_counter() - started, phase=phase, page=current_page())
+
+
+@contextmanager
+def rerun():
+    """Time a whole script run. st.rerun()/st.stop() end a run normally."""
+    _run.page = "unknown"
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        RERUN_ERRORS.inc(page=current_page())
+        raise
+    finally:
+        RERUN_SECONDS.observe(time.perf_counter() - started, page=current_page())
+        _run.page = "unknown"
+
+
+# Extra GET endpoints served next to /metrics: path -> callable returning (status, content type, body)
+ROUTES = {}
+
+
+def add_route(path, handler):
+    ROUTES[path] = handler
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+    routes = ROUTES
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            status, content_type, body = 200, CONTENT_TYPE, self.registry.render()
+        elif path in self.routes:
+            status, content_type, body = self.routes[path]()
+        else:
+            self.send_error(404)
+            return
+        body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(host="127.0.0.1", port=9464, registry=REGISTRY, routes=ROUTES):
+    """
+    Serve registry at http://host:port/metrics (and routes) from a daemon
+    thread. Returns the server, or None when the port is taken (e.g. a second
+    Streamlit process on the same host).
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry, "routes": routes})
+    try:
+        server = ThreadingHTTPServer((host, port), handler)
+    except OSError as e:
+        logger.warning("Metrics endpoint not started", extra={"host": host, "port": port, "error": str(e)})
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("Metrics endpoint started", extra={"url": f"http://{host}:{server.server_address[1]}/metrics"})
+    return server
+
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def ensure_metrics_server(host="127.0.0.1", port=9464):
+    """The process's endpoint on host:port, started on the first call (also from app/serve.py)."""
+    with _servers_lock:
+        if (host, port) not in _servers:
+            _servers[(host, port)] = start_metrics_server(host, port)
+        return _servers[(host, port)]
+
+
+def stop_metrics_server(host="127.0.0.1", port=9464):
+    """Stop the process's endpoint on host:port, if one is running (e.g. after METRICS_PORT changed)."""
+    with _servers_lock:
+        server = _servers.pop((host, port), None)
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+        logger.info("Metrics endpoint stopped", extra={"host": host, "port": port})
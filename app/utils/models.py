@@ -13,15 +13,33 @@ class Page(Enum):
     STREET_NUMBERS = "street_numbers"
     SUMMARY = "summary"
 
-@dataclass
+def split_list(value) -> tuple:
+    """A comma-separated field as a tuple of its stripped, non-empty items, without repeats."""
+    return tuple(dict.fromkeys(item for item in (s.strip() for s in (value or "").split(",")) if item))
+
+# Frozen: the parsed fields below would go stale if the raw ones changed
+@dataclass(frozen=True)
 class Category:
     id: int
     name: str
-    text: str  # Comma-separated array
+    text: str  # Comma-separated search synonyms
     image_url: str
-    event_call_desc: str
+    event_call_desc: str  # Comma-separated report descriptions
+    # Parsed once when the row is loaded: descriptions offered on the summary page,
+    # casefolded synonyms, and name plus synonyms as one casefolded search key
+    options: tuple = field(init=False, repr=False, compare=False)
+    synonyms: tuple = field(init=False, repr=False, compare=False)
+    search_key: str = field(init=False, repr=False, compare=False)
 
-@dataclass
+    def __post_init__(self):
+        synonyms = tuple(dict.fromkeys(s.casefold() for s in split_list(self.text)))
+        object.__setattr__(self, "options", split_list(self.event_call_desc))
+        object.__setattr__(self, "synonyms", synonyms)
+        # \x1f keeps a query from matching across two synonyms
+        object.__setattr__(self, "search_key", "\x1f".join(((self.name or "").casefold(),) + synonyms))
+
+# Frozen and slotted: a StreetCatalog hands these out for single rows
+@dataclass(frozen=True, slots=True)
 class StreetNumber:
     id: int
     name: str
@@ -0,0 +1,33 @@
+"""
+Hebrew first and last names, and their ASCII transliteration for e-mail addresses.
+
+Shared by the form's placeholder resident (app/components/popups.py) and the
+synthetic residents in app/utils/synthetic_data.py.
+"""
+
+FIRST_NAMES = [
+    "דוד", "משה", "יוסף", "אברהם", "דניאל", "מיכאל", "אליהו", "יעקב", "ישראל", "יהודה",
+    "שרה", "רחל", "לאה", "מרים", "אסתר", "חנה", "רבקה", "תמר", "נעמי", "רות",
+    "אדם", "בן", "גל", "דור", "זיו", "חן", "טל", "יובל", "כפיר", "לב",
+    "מיה", "נועה", "עדן", "פרל", "צהלה", "קרן", "שחר", "תהלה", "אוריה", "בר"
+]
+
+LAST_NAMES = [
+    "כהן", "לוי", "מזרחי", "פרץ", "אזולאי", "דהן", "אברהם", "דוד", "יוסף", "חדד",
+    "ביטון", "עמר", "שמש", "אסף", "בוזגלו", "כרמי", "גרין", "רוזנברג", "שוורץ", "גולדמן",
+    "ישראלי", "נתניהו", "ברק", "שרון", "לפיד", "גנץ", "בנט", "ליברמן", "אולמרט", "פרס",
+    "זכאי", "בצלאל", "אורון", "צבר", "גלבוע", "כרמל", "גולן", "נגב", "שרון", "ירון"
+]
+
+_TRANSLITERATION = {
+    'א': 'a', 'ב': 'b', 'ג': 'g', 'ד': 'd', 'ה': 'h', 'ו': 'v', 'ז': 'z', 'ח': 'ch',
+    'ט': 't', 'י': 'y', 'כ': 'k', 'ך': 'k', 'ל': 'l', 'מ': 'm', 'ם': 'm', 'ן': 'n',
+    'נ': 'n', 'ס': 's', 'ע': 'a', 'פ': 'p', 'ף': 'f', 'צ': 'tz', 'ץ': 'tz', 'ק': 'k',
+    'ר': 'r', 'ש': 'sh', 'ת': 't'
+}
+
+
+def transliterate_hebrew(hebrew_text: str) -> str:
+    """Simple Hebrew to ASCII transliteration for email generation."""
+    result = "".join(_TRANSLITERATION.get(char, char) for char in hebrew_text)
+    return result if result else "user"
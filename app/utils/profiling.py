@@ -0,0 +1,260 @@
+"""
+Opt-in sampling profiler for script runs.
+
+A daemon thread samples the script thread's stack every few milliseconds
+through sys._current_frames(), so the profiled run does no tracing work of
+its own. Profiles go to PROFILE_DIR as speedscope JSON or collapsed stacks
+(flamegraph.pl / speedscope both read them):
+
+    recent/                 the last PROFILE_KEEP_RECENT profiles
+    slowest/<page>/         the PROFILE_KEEP_SLOWEST slowest profiles per page
+
+A run is profiled when PROFILE_SAMPLE_RATE picks it, or when the URL carries
+a valid `profile` token signed with PROFILE_SECRET:
+
+    python -m app.utils.profiling sign --ttl 3600
+    https://<app>/?profile=<token>
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FORMATS = ("speedscope", "collapsed")
+_EXTENSIONS = {"speedscope": ".speedscope.json", "collapsed": ".collapsed.txt"}
+_MAX_DEPTH = 128
+_TOKEN_PURPOSE = "profile"
+_UNSAFE_PATH_RE = re.compile(r"[^\w.-]+")
+
+
+def sign_token(secret: str, expires_at: int) -> str:
+    """Query-parameter token enabling profiling until expires_at (unix time)."""
+    digest = hmac.new(secret.encode("utf-8"), f"{_TOKEN_PURPOSE}:{expires_at}".encode("utf-8"), hashlib.sha256)
+    return f"{expires_at}.{digest.hexdigest()}"
+
+
+def verify_token(secret: str, token, now=None) -> bool:
+    if not secret or not token:
+        return False
+    expires_at, _, _ = str(token).partition(".")
+    if not expires_at.isdigit() or int(expires_at) < (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(sign_token(secret, int(expires_at)), str(token))
+
+
+def should_profile(sample_rate=0.0, secret="", token=None, rng=random.random) -> bool:
+    """Profile this run? A valid signed token always wins over sampling."""
+    if token and verify_token(secret, token):
+        return True
+    return sample_rate > 0 and rng() < sample_rate
+
+
+def _frame_label(code, root):
+    filename = code.co_filename
+    if root and filename.startswith(root):
+        filename = os.path.relpath(filename, root)
+    elif "site-packages" in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    return code.co_name, filename, code.co_firstlineno
+
+
+class SamplingProfiler:
+    """Samples one thread's stack at a fixed interval from a background thread."""
+
+    def __init__(self, thread_id=None, interval=0.005, root=None):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.root = root if root is not None else os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.stacks = Counter()  # tuple of (name, file, line) root->leaf -> samples
+        self.started_at = None
+        self.duration = 0.0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+        return self
+
+    def _run(self):
+        labels = self._labels
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < _MAX_DEPTH:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code, self.root)
+                stack.append(label)
+                frame = frame.f_back
+            stack.reverse()
+            self.stacks[tuple(stack)] += 1
+
+    @property
+    def samples(self):
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format, one `a;b;c count` line per stack."""
+        lines = []
+        for stack, count in self.stacks.most_common():
+            lines.append(";".join(f"{name} ({file}:{line})" for name, file, line in stack) + f" {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name="rerun") -> dict:
+        """speedscope "sampled" profile; identical stacks are merged into one weighted sample."""
+        frames, index = [], {}
+        samples, weights = [], []
+        interval_ms = self.interval * 1000
+        for stack, count in self.stacks.most_common():
+            ids = []
+            for label in stack:
+                if label not in index:
+                    index[label] = len(frames)
+                    frames.append({"name": label[0], "file": label[1], "line": label[2]})
+                ids.append(index[label])
+            samples.append(ids)
+            weights.append(round(count * interval_ms, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(self.duration * 1000, 3),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": name,
+            "exporter": "app.utils.profiling",
+        }
+
+    def render(self, fmt, name="rerun") -> str:
+        if fmt == "collapsed":
+            return self.collapsed()
+        return json.dumps(self.speedscope(name), ensure_ascii=False)
+
+
+class ProfileStore:
+    """Writes profiles to a rotating recent/ directory and a per-page slowest/ set."""
+
+    def __init__(self, directory, fmt="speedscope", keep_recent=100, keep_slowest=5):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown profile format: {fmt!r}")
+        self.directory = directory
+        self.fmt = fmt
+        self.keep_recent = keep_recent
+        self.keep_slowest = keep_slowest
+        self._lock = threading.Lock()
+
+    def save(self, profiler, page):
+        """Write the profile; returns the path under recent/."""
+        page = _UNSAFE_PATH_RE.sub("_", page or "").strip(".") or "unknown"
+        duration_ms = int(profiler.duration * 1000)
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime()) + f"{time.time() % 1:.6f}"[1:]
+        extension = _EXTENSIONS[self.fmt]
+        body = profiler.render(self.fmt, name=f"{page} {duration_ms}ms")
+
+        recent_dir = os.path.join(self.directory, "recent")
+        slowest_dir = os.path.join(self.directory, "slowest", page)
+        recent_path = os.path.join(recent_dir, f"{stamp}_{page}_{duration_ms}ms{extension}")
+        with self._lock:
+            os.makedirs(recent_dir, exist_ok=True)
+            self._write(recent_path, body)
+            self._prune(recent_dir, self.keep_recent, key=lambda name: name)
+
+            os.makedirs(slowest_dir, exist_ok=True)
+            kept = self._files(slowest_dir)
+            if len(kept) < self.keep_slowest or duration_ms > min(self._duration_of(n) for n in kept):
+                self._write(os.path.join(slowest_dir, f"{duration_ms:09d}ms_{stamp}{extension}"), body)
+                self._prune(slowest_dir, self.keep_slowest, key=self._duration_of)
+        return recent_path
+
+    @staticmethod
+    def _write(path, body):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _files(directory):
+        return [n for n in os.listdir(directory) if not n.endswith(".tmp")]
+
+    @staticmethod
+    def _duration_of(name):
+        return int(name.split("ms_", 1)[0])
+
+    def _prune(self, directory, keep, key):
+        """Keep the `keep` largest files by key (newest for timestamps, slowest for durations)."""
+        names = sorted(self._files(directory), key=key, reverse=True)
+        for name in names[keep:]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+@contextmanager
+def profile_run(store, enabled, page_fn, interval=0.005):
+    """
+    Sample the calling thread while the block runs and save the profile under
+    page_fn() (evaluated at the end, once the run knows its page).
+    """
+    if not enabled or store is None:
+        yield None
+        return
+    profiler = SamplingProfiler(interval=interval).start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        try:
+            path = store.save(profiler, page_fn())
+            logger.info(
+                "Run profiled",
+                extra={"path": path, "duration_ms": round(profiler.duration * 1000, 1), "samples": profiler.samples},
+            )
+        except OSError as e:
+            logger.warning("Could not write profile", extra={"error": str(e)})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profiling helpers")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sign = sub.add_parser("sign", help="print a signed `profile` query-parameter token")
+    sign.add_argument("--ttl", type=int, default=3600, help="seconds the token stays valid")
+    sign.add_argument("--secret", default=os.getenv("PROFILE_SECRET", ""), help="defaults to $PROFILE_SECRET")
+    args = parser.parse_args(argv)
+    if not args.secret:
+        parser.error("PROFILE_SECRET is not set")
+    print(sign_token(args.secret, int(time.time()) + args.ttl))
+
+
+if __name__ == "__main__":
+    main()
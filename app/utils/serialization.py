@@ -0,0 +1,26 @@
+"""
+JSON encoding helpers. Uses orjson when it is installed and falls back to the
+standard library otherwise; both produce compact UTF-8 (no \\uXXXX escapes).
+"""
+import json
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,85 @@
+"""
+Stylesheets served from static/ at the repository root.
+
+With server.enableStaticServing, Streamlit serves the static/ directory next
+to the main script at app/static/<name>; streamlit_app.py is that script.
+stylesheet() emits a one-line @import of that URL with a
+content hash in the query string, so the browser downloads each version of a
+file once and every rerun sends ~100 bytes instead of the whole stylesheet.
+Style-only HTML goes to Streamlit's event container and takes no layout space.
+
+When static serving is unavailable (option off, or the app was started from
+another script, such as `streamlit run app/main.py`) the CSS is inlined
+instead, and a warning says why once per process.
+"""
+import hashlib
+import os
+from functools import lru_cache
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STATIC_DIR = os.path.join(ROOT, "static")
+# Streamlit's URL for the served directory, whatever its location on disk
+STATIC_URL = "app/static"
+ENTRY_POINT = os.path.join(ROOT, "streamlit_app.py")
+
+
+@lru_cache(maxsize=32)
+def _read(name):
+    with open(os.path.join(STATIC_DIR, name), "rb") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=32)
+def content_hash(name) -> str:
+    return hashlib.sha256(_read(name)).hexdigest()[:12]
+
+
+def asset_url(name) -> str:
+    """Cache-busting URL of a file in static/."""
+    return f"{STATIC_URL}/{name}?v={content_hash(name)}"
+
+
+def serves_static_dir(main_script_path) -> bool:
+    """True when Streamlit, running main_script_path, serves STATIC_DIR."""
+    static_dir = os.path.join(os.path.dirname(os.path.abspath(main_script_path)), "static")
+    return os.path.realpath(static_dir) == os.path.realpath(STATIC_DIR)
+
+
+def static_serving_available() -> bool:
+    """True when Streamlit serves STATIC_DIR for the running script."""
+    if not st.get_option("server.enableStaticServing"):
+        return False
+    ctx = get_script_run_ctx()
+    return ctx is not None and serves_static_dir(ctx.main_script_path)
+
+
+@lru_cache(maxsize=1)
+def _warn_inlined():
+    ctx = get_script_run_ctx()
+    logger.warning(
+        "Static files are not served, inlining stylesheets",
+        extra={
+            "static_serving": st.get_option("server.enableStaticServing"),
+            "main_script": ctx.main_script_path if ctx else None,
+            "entry_point": ENTRY_POINT,
+        }
+    )
+
+
+def stylesheet_html(name, linked=True) -> str:
+    if linked:
+        return f'<style>@import url("{asset_url(name)}");</style>'
+    return f"<style>{_read(name).decode('utf-8')}</style>"
+
+
+def stylesheet(name):
+    """Apply static/<name> to the page."""
+    linked = static_serving_available()
+    if not linked:
+        _warn_inlined()
+    st.html(stylesheet_html(name, linked=linked))
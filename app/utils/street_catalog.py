@@ -0,0 +1,204 @@
+"""
+Columnar street catalog.
+
+A city has tens of thousands of house numbers, and one StreetNumber object
+per row, with its four values, costs a few hundred bytes. StreetCatalog keeps
+the table as columns instead:
+
+- ids in an array of 64-bit integers
+- names and house numbers in one text, "name\\x1fhouse number\\x1e" per
+  row, with each row's start offset in an array
+- house numbers (again, to keep their exact value) and image URLs
+  dictionary-encoded: each distinct value is stored once (interned) and
+  rows hold its index
+
+Rows become StreetNumber objects only when asked for (catalog[i],
+iteration). search() runs str.find over the casefolded text instead of
+testing each row; for text without case, such as Hebrew, that is the same
+string. It returns a StreetSelection: the matching row numbers over the same
+columns. column() reads a field for every row without building row objects.
+"""
+import sys
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from app.utils.models import StreetNumber
+
+# Separators in the search text; a query cannot match across them
+_ROW_SEPARATOR = "\x1e"
+_FIELD_SEPARATOR = "\x1f"
+
+
+class _Dictionary:
+    """A dictionary-encoded column: distinct values once, one index per row."""
+
+    __slots__ = ("values", "codes", "_lookup")
+
+    def __init__(self):
+        self.values = []
+        self.codes = array("I")
+        self._lookup = {}
+
+    def append(self, value):
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(sys.intern(value) if isinstance(value, str) else value)
+        self.codes.append(code)
+
+    def seal(self):
+        self._lookup = None  # only needed while building
+
+    def __getitem__(self, row):
+        return self.values[self.codes[row]]
+
+
+class _Rows:
+    """Sequence behaviour shared by the catalog and its selections."""
+
+    __slots__ = ()
+
+    def __iter__(self):
+        row = self.catalog.row
+        return (row(i) for i in self.row_numbers())
+
+    def __getitem__(self, index):
+        rows = self.row_numbers()
+        if isinstance(index, slice):
+            return StreetSelection(self.catalog, array("I", rows[index]))
+        return self.catalog.row(rows[index])
+
+    def column(self, field):
+        """Values of one field for every row, without building row objects."""
+        return list(map(self.catalog.getter(field), self.row_numbers()))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} rows)"
+
+
+class StreetCatalog(_Rows):
+    __slots__ = ("_ids", "_house_numbers", "_image_urls", "_text", "_starts", "_folded", "_folded_starts")
+
+    def __init__(self, rows=()):
+        """rows: (id, name, image_url, house_number) tuples."""
+        ids, texts, house_numbers, image_urls = array("q"), [], _Dictionary(), _Dictionary()
+        for street_id, name, image_url, house_number in rows:
+            ids.append(street_id)
+            texts.append(f"{name or ''}{_FIELD_SEPARATOR}{house_number or ''}{_ROW_SEPARATOR}")
+            house_numbers.append(house_number)
+            image_urls.append(image_url)
+        house_numbers.seal()
+        image_urls.seal()
+        self._ids = ids
+        self._house_numbers = house_numbers
+        self._image_urls = image_urls
+        self._text = "".join(texts)
+        self._starts = array("I", accumulate(map(len, texts), initial=0))
+        folded = self._text.casefold()
+        if folded == self._text:
+            # Nothing to fold (Hebrew has no case): search the same string
+            self._folded, self._folded_starts = self._text, self._starts
+        elif len(folded) == len(self._text):
+            self._folded, self._folded_starts = folded, self._starts
+        else:
+            # Some character folds to several (ß -> ss); fold row by row for the offsets
+            texts = [text.casefold() for text in texts]
+            self._folded = "".join(texts)
+            self._folded_starts = array("I", accumulate(map(len, texts), initial=0))
+
+    @classmethod
+    def from_rows(cls, rows):
+        """From dicts keyed by column, the shape Supabase returns."""
+        return cls((r["id"], r["name"], r["image_url"], r["house_number"]) for r in rows)
+
+    @classmethod
+    def from_records(cls, records):
+        """From objects with the StreetNumber attributes."""
+        return cls((r.id, r.name, r.image_url, r.house_number) for r in records)
+
+    @property
+    def catalog(self):
+        return self
+
+    def __len__(self):
+        return len(self._ids)
+
+    def row_numbers(self):
+        return range(len(self._ids))
+
+    def _name(self, row):
+        start = self._starts[row]
+        return self._text[start:self._text.index(_FIELD_SEPARATOR, start)]
+
+    def column(self, field):
+        """Values of one field for every row, read in bulk."""
+        if field == "id":
+            return self._ids.tolist()
+        if field == "name":
+            # name, house number, name, ... and a trailing ""
+            return self._text.replace(_ROW_SEPARATOR, _FIELD_SEPARATOR).split(_FIELD_SEPARATOR)[0:-1:2]
+        if field in ("house_number", "image_url"):
+            values = self._house_numbers if field == "house_number" else self._image_urls
+            return list(map(values.values.__getitem__, values.codes))
+        raise KeyError(field)
+
+    def getter(self, field):
+        """row number -> value of field."""
+        if field == "id":
+            return self._ids.__getitem__
+        if field == "name":
+            return self._name
+        if field == "house_number":
+            return self._house_numbers.__getitem__
+        if field == "image_url":
+            return self._image_urls.__getitem__
+        raise KeyError(field)
+
+    def row(self, row) -> StreetNumber:
+        if row < 0:
+            row += len(self._ids)
+        return StreetNumber(self._ids[row], self._name(row), self._image_urls[row], self._house_numbers[row])
+
+    def index_of(self, street_id):
+        """Row number of the street with this id (int or numeric string), or None."""
+        try:
+            return self._ids.index(int(street_id))
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, street_id):
+        """The street with this id, or None."""
+        row = self.index_of(street_id)
+        return None if row is None else self.row(row)
+
+    def search(self, query):
+        """Rows whose name or house number contains query, case-insensitively; all rows for an empty query."""
+        if not query:
+            return self
+        query = query.casefold()
+        rows = array("I")
+        if _ROW_SEPARATOR in query or _FIELD_SEPARATOR in query:
+            return StreetSelection(self, rows)
+        find, starts = self._folded.find, self._folded_starts
+        position = find(query)
+        while position != -1:
+            row = bisect_right(starts, position) - 1
+            rows.append(row)
+            position = find(query, starts[row + 1])
+        return StreetSelection(self, rows)
+
+
+class StreetSelection(_Rows):
+    """Some rows of a StreetCatalog, in catalog order."""
+
+    __slots__ = ("catalog", "rows")
+
+    def __init__(self, catalog, rows):
+        self.catalog = catalog
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row_numbers(self):
+        return self.rows
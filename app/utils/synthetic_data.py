@@ -0,0 +1,242 @@
+"""
+Reproducible synthetic catalogs and residents for tests, benchmarks and load tests.
+
+Rows come out as tuples in the column order of the Supabase tables, so they
+can go straight into SQLite or a file; categories(), street_numbers() and
+users() wrap them in the app's dataclasses. The same seed always yields the same rows.
+
+    python -m app.utils.synthetic_data --streets 1000000 --sqlite mock_supabase.sqlite
+    python -m app.utils.synthetic_data --streets 100000 --users 10000 --out data/ --format csv
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sqlite3
+import time
+from itertools import islice
+from app.utils.models import Category, StreetNumber, UserData
+from app.utils.names import FIRST_NAMES, LAST_NAMES, transliterate_hebrew
+
+CATEGORY_COLUMNS = ("id", "name", "text", "image_url", "event_call_desc")
+STREET_COLUMNS = ("id", "name", "image_url", "house_number")
+USER_COLUMNS = ("first_name", "last_name", "phone", "user_id", "email")
+
+# The Supabase tables as SQLite stores them for mock_supabase_server.py
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL, text TEXT NOT NULL DEFAULT '',
+    image_url TEXT NOT NULL DEFAULT '', event_call_desc TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS street_numbers (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL, image_url TEXT NOT NULL DEFAULT '',
+    house_number TEXT NOT NULL DEFAULT ''
+);
+"""
+
+STREET_NAMES = [
+    "הרצל", "ויצמן", "בן גוריון", "קרל פופר", "סמילנסקי", "שד' ניצה", "דיזנגוף", "ז'בוטינסקי",
+    "רזיאל", "פינסקר", "שטמפפר", "הרב קוק", "ביאליק", "אחד העם", "טשרניחובסקי", "הנשיא",
+    "גורדון", "אוסישקין", "מרטין בובר", "שמואל הנציב", "בני בנימין", "פתח תקווה", "רמז",
+    "ברנר", "ארלוזורוב", "המכבים", "יהודה הלוי", "קלאוזנר", "הגבורים", "שדרות חן",
+]
+# Extra variants once the base names run out, so any number of streets stays unique
+STREET_PREFIXES = ["", "סמטת ", "כיכר ", "שדרות ", "מעלה ", "דרך "]
+
+# (category name, search keywords, typical descriptions)
+CATEGORY_TEMPLATES = [
+    ("תאורת רחוב", ["פנס", "תאורה", "עמוד תאורה", "חושך"], ["פנס רחוב לא דולק", "עמוד תאורה מהבהב", "תאורה דולקת ביום"]),
+    ("ניקיון", ["זבל", "פסולת", "לכלוך", "פח"], ["פח אשפה מלא", "פסולת ברחוב", "לכלוך על המדרכה"]),
+    ("מפגע בטיחותי", ["בור", "מפגע", "סכנה", "מכסה ביוב"], ["בור בכביש", "מכסה ביוב פתוח", "גדר שבורה"]),
+    ("גזם", ["גזם", "ענפים", "עצים"], ["ערימת גזם ברחוב", "ענף שבור על המדרכה"]),
+    ("רעש", ["רעש", "מוזיקה", "עבודות"], ["רעש עבודות בלילה", "מוזיקה רועשת"]),
+    ("חניה", ["חניה", "רכב", "חסימה"], ["רכב חונה על המדרכה", "חסימת חניה", "רכב נטוש"]),
+    ("מדרכה שבורה", ["מדרכה", "אבנים", "מרצפות"], ["מרצפות שבורות", "אבן שפה עקורה"]),
+    ("מים", ["מים", "נזילה", "צינור"], ["נזילת מים ברחוב", "צינור פרוץ", "לחץ מים נמוך"]),
+    ("ביוב", ["ביוב", "הצפה", "ריח"], ["הצפת ביוב", "ריח ביוב חזק"]),
+    ("עצים", ["עץ", "שורשים", "גיזום"], ["עץ נוטה לנפול", "שורשים הרימו את המדרכה"]),
+    ("תמרורים", ["תמרור", "שלט", "רמזור"], ["תמרור עקום", "רמזור לא עובד", "שלט רחוב חסר"]),
+    ("מתקני משחק", ["גן שעשועים", "מתקן", "נדנדה"], ["מתקן משחק שבור", "נדנדה פגועה"]),
+]
+
+MOBILE_PREFIXES = ["050", "051", "052", "053", "054", "055", "058"]
+HOUSE_LETTERS = "אבגד"
+
+def _id_check_digit(body: str) -> int:
+    total = 0
+    for i, c in enumerate(body):
+        d = int(c) * (1 + i % 2)
+        total += d - 9 if d > 9 else d
+    return -total % 10
+
+
+def israeli_id(rng) -> str:
+    """Random 9-digit Teudat Zehut with a valid check digit."""
+    body = f"{rng.randrange(100_000_000):08d}"
+    return f"{body}{_id_check_digit(body)}"
+
+
+def is_valid_israeli_id(value: str) -> bool:
+    return value.isdigit() and len(value) == 9 and _id_check_digit(value[:8]) == int(value[8])
+
+
+def israeli_phone(rng) -> str:
+    """Random Israeli mobile number in local format (05X followed by 7 digits)."""
+    return f"{rng.choice(MOBILE_PREFIXES)}{rng.randrange(10_000_000):07d}"
+
+
+def street_name(index: int) -> str:
+    """Unique street name for any index >= 0."""
+    base = STREET_NAMES[index % len(STREET_NAMES)]
+    variant = index // len(STREET_NAMES)
+    prefix = STREET_PREFIXES[variant % len(STREET_PREFIXES)]
+    round_ = variant // len(STREET_PREFIXES)
+    return f"{prefix}{base} {round_ + 1}" if round_ else f"{prefix}{base}"
+
+
+def category_rows(count, seed=0, start_id=1):
+    """Yield category tuples; text and event_call_desc are comma-separated lists."""
+    rng = random.Random(seed)
+    for i in range(count):
+        name, keywords, descriptions = CATEGORY_TEMPLATES[i % len(CATEGORY_TEMPLATES)]
+        round_ = i // len(CATEGORY_TEMPLATES)
+        yield (
+            start_id + i,
+            f"{name} {round_ + 1}" if round_ else name,
+            ",".join(rng.sample(keywords, rng.randint(2, len(keywords)))),
+            f"https://example.com/categories/{start_id + i}.jpg",
+            ",".join(rng.sample(descriptions, rng.randint(1, len(descriptions)))),
+        )
+
+
+def street_rows(count, seed=0, start_id=1, max_house_number=120):
+    """
+    Yield street-number tuples, filling each street with house numbers before
+    moving to the next one. Street lengths vary between 10 and max_house_number,
+    and about one house in twelve gets a letter suffix (12א).
+    """
+    rng = random.Random(seed)
+    randrange, random_ = rng.randrange, rng.random
+    letters = HOUSE_LETTERS
+    row_id = start_id
+    street = 0
+    end = start_id + count
+    while row_id < end:
+        name = street_name(street)
+        houses = randrange(10, max_house_number + 1)
+        for number in range(1, houses + 1):
+            if row_id >= end:
+                break
+            house = str(number)
+            if random_() < 0.083:
+                house += letters[randrange(len(letters))]
+            yield (row_id, f"{name} {house}", "", house)
+            row_id += 1
+        street += 1
+
+
+def user_rows(count, seed=0):
+    """Yield resident tuples that pass validate_user_data."""
+    rng = random.Random(seed)
+    choice, randrange = rng.choice, rng.randrange
+    ascii_names = {name: transliterate_hebrew(name).lower() for name in FIRST_NAMES + LAST_NAMES}
+    for _ in range(count):
+        first, last = choice(FIRST_NAMES), choice(LAST_NAMES)
+        email = f"{ascii_names[first]}.{ascii_names[last]}{randrange(1000)}@example.com"
+        yield (first, last, israeli_phone(rng), israeli_id(rng), email)
+
+
+def categories(count, seed=0):
+    return [Category(*row) for row in category_rows(count, seed)]
+
+
+def street_numbers(count, seed=0):
+    return [StreetNumber(*row) for row in street_rows(count, seed)]
+
+
+def users(count, seed=0):
+    return [UserData(*row) for row in user_rows(count, seed)]
+
+
+def as_dicts(columns, rows):
+    """Rows as dicts, the shape Supabase returns."""
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def write_rows(path, columns, rows, fmt=None, batch_size=50_000):
+    """Write rows to .jsonl or .csv (picked from the extension unless fmt is given). Returns the row count."""
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".")
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            while batch := list(islice(rows, batch_size)):
+                writer.writerows(batch)
+                written += len(batch)
+        elif fmt == "jsonl":
+            while batch := list(islice(rows, batch_size)):
+                f.write("".join(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in batch))
+                written += len(batch)
+        else:
+            raise ValueError(f"Unsupported format: {fmt!r}")
+    return written
+
+
+def connect(db_path):
+    """Open (and create if needed) a Supabase stand-in database."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    # mock_supabase_server.py matches ilike on casefold(), which also folds non-ASCII text
+    conn.create_function("casefold", 1, lambda v: v.casefold() if isinstance(v, str) else v, deterministic=True)
+    conn.executescript(SQLITE_SCHEMA)
+    return conn
+
+
+def write_sqlite(conn, category_count, street_count, seed=0):
+    """Replace the categories and street_numbers tables of an open connection."""
+    conn.execute("DELETE FROM categories")
+    conn.execute("DELETE FROM street_numbers")
+    conn.executemany("INSERT INTO categories VALUES (?, ?, ?, ?, ?)", category_rows(category_count, seed))
+    conn.executemany("INSERT INTO street_numbers VALUES (?, ?, ?, ?)", street_rows(street_count, seed))
+    conn.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic categories, street numbers and residents")
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--streets", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sqlite", help="write categories and street numbers into this Supabase stand-in database")
+    parser.add_argument("--out", help="directory for categories/street_numbers/users files")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    args = parser.parse_args(argv)
+    if not args.sqlite and not args.out:
+        parser.error("give --sqlite and/or --out")
+
+    started = time.perf_counter()
+    if args.sqlite:
+        conn = connect(args.sqlite)
+        try:
+            write_sqlite(conn, args.categories, args.streets, args.seed)
+        finally:
+            conn.close()
+        print(f"{args.sqlite}: {args.categories} categories, {args.streets} street numbers")
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        outputs = [
+            ("categories", CATEGORY_COLUMNS, category_rows(args.categories, args.seed)),
+            ("street_numbers", STREET_COLUMNS, street_rows(args.streets, args.seed)),
+        ]
+        if args.users:
+            outputs.append(("users", USER_COLUMNS, user_rows(args.users, args.seed)))
+        for name, columns, rows in outputs:
+            path = os.path.join(args.out, f"{name}.{args.format}")
+            print(f"{path}: {write_rows(path, columns, rows, args.format)} rows")
+    print(f"done in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+End-to-end load test for the ticket flow.
+
+Each virtual user runs the real app script headlessly through Streamlit's
+AppTest, one fresh session per iteration:
+
+    catalog load -> search -> select category -> fill user data
+    -> select street -> submit
+
+By default the Supabase and incident-service stand-ins are started
+in-process. Pass --supabase-url / --api-endpoint to target stand-ins (or
+real services) running elsewhere, which keeps their CPU out of the
+measurement. Reports rerun latency percentiles per step, submit latency,
+throughput and session-state memory per session.
+
+    python load_test.py --users 20 --duration 60 --streets 10000
+    python load_test.py --users 50 --iterations 5 --incident-latency lognormal:300,0.4 --json report.json
+"""
+import argparse
+import gc
+import multiprocessing
+import json
+import os
+import random
+import resource
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MAIN_SCRIPT = os.path.join(ROOT, "app", "main.py")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+STEPS = ("catalog_load", "search", "select_category", "save_user", "select_street", "submit")
+SEARCH_TERMS = ("הרצל", "ויצמן", "פופר", "1", "2")
+SAVE_LABEL = "שמור"   # t("common.save", "he")
+SEND_LABEL = "שלח"    # t("common.send", "he")
+
+
+class FlowError(RuntimeError):
+    """The app did not reach the expected page."""
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list (0 for an empty one)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class Results:
+    """Per-step timings and per-session figures, mergeable across worker processes."""
+
+    def __init__(self):
+        self.timings = defaultdict(list)
+        self.session_bytes = []
+        self.flows = 0
+        self.errors = defaultdict(int)
+        self.rss_mb = []
+
+    def record(self, step, seconds):
+        self.timings[step].append(seconds)
+
+    def finish_flow(self, session_bytes):
+        self.flows += 1
+        self.session_bytes.append(session_bytes)
+
+    def fail(self, step, error):
+        self.errors[f"{step}: {type(error).__name__}: {error}"[:160]] += 1
+
+    def to_dict(self):
+        # Plain data: AppTest points __main__ at the app script, so classes
+        # defined here cannot be pickled back from the workers
+        return {
+            "timings": dict(self.timings),
+            "session_bytes": self.session_bytes,
+            "flows": self.flows,
+            "errors": dict(self.errors),
+            "rss_mb": self.rss_mb,
+        }
+
+    def merge(self, other):
+        for step, values in other["timings"].items():
+            self.timings[step].extend(values)
+        self.session_bytes.extend(other["session_bytes"])
+        self.flows += other["flows"]
+        for error, count in other["errors"].items():
+            self.errors[error] += count
+        self.rss_mb.extend(other["rss_mb"])
+
+
+class VirtualUser:
+    """
+    One resident going through the flow repeatedly, a fresh session each time.
+
+    AppTest swaps a process-wide Runtime instance while a script runs, so
+    sessions cannot overlap within one process; each virtual user gets its
+    own worker process instead.
+    """
+
+    def __init__(self, index, deadline, iterations, timeout, think_time):
+        self.index = index
+        self.results = Results()
+        self.deadline = deadline
+        self.iterations = iterations
+        self.timeout = timeout
+        self.think_time = think_time
+        self.rng = random.Random(index)
+
+    def run(self):
+        done = 0
+        while time.time() < self.deadline and (self.iterations is None or done < self.iterations):
+            self.run_flow()
+            done += 1
+        self.results.rss_mb.append(rss_mb())
+        return self.results.to_dict()
+
+    def _step(self, name, action):
+        started = time.perf_counter()
+        action()
+        self.results.record(name, time.perf_counter() - started)
+        if self.think_time:
+            time.sleep(self.rng.uniform(0, self.think_time))
+
+    def run_flow(self):
+        from streamlit.testing.v1 import AppTest
+        from app.utils.memory import deep_size
+        from app.utils.synthetic_data import israeli_phone
+
+        at = AppTest.from_file(MAIN_SCRIPT, default_timeout=self.timeout)
+        # streamlit_local_storage blocks until the browser answers; there is none here
+        at.session_state["storage_init"] = {}
+        step = "catalog_load"
+        try:
+            self._step(step, at.run)
+            self._check(at, "categories")
+
+            step = "search"
+            term = self.rng.choice(SEARCH_TERMS)
+            self._step(step, lambda: at.text_input(key="header_search_input").input(term).run())
+            at.text_input(key="header_search_input").input("").run()
+
+            step = "select_category"
+            self._step(step, lambda: self._click_gallery(at, "gallery_categories"))
+            if not at.session_state["show_popup"]:
+                raise FlowError("user data popup not shown")
+
+            step = "save_user"
+            phone = israeli_phone(self.rng)
+            at.text_input(key="popup_phone").input(phone)
+            save = next(b for b in at.button if b.label == SAVE_LABEL)
+            self._step(step, lambda: save.click().run())
+            self._check(at, "streets")
+
+            step = "select_street"
+            self._step(step, lambda: self._click_gallery(at, "gallery_streets"))
+            self._check(at, "summary")
+
+            step = "submit"
+            send = next(b for b in at.button if b.label == SEND_LABEL)
+            self._step(step, lambda: send.click().run())
+            self._check(at, "success")
+
+            self.results.finish_flow(deep_size(at.session_state.to_dict()))
+        except Exception as e:
+            self.results.fail(step, e)
+
+    def _click_gallery(self, at, prefix):
+        keys = [e.key for e in at.main if str(getattr(e, "key", "") or "").startswith(prefix)]
+        if not keys:
+            raise FlowError(f"no {prefix} component rendered")
+        # A gallery click is the component's value; set it the way the browser would
+        at.session_state[keys[0]] = 0
+        at.run()
+
+    @staticmethod
+    def _check(at, page):
+        if at.exception:
+            raise FlowError(at.exception[0].value)
+        if at.session_state["current_page"] != page:
+            errors = [e.value for e in at.error]
+            raise FlowError(f"expected page {page!r}, got {at.session_state['current_page']!r} {errors}")
+
+
+def _run_user(args):
+    return VirtualUser(*args).run()
+
+
+def start_stand_ins(args):
+    """Start in-process stand-ins for the services not given on the command line."""
+    stopped = []
+    supabase_url, api_endpoint = args.supabase_url, args.api_endpoint
+    if not supabase_url:
+        from mock_sharepoint_server import Latency
+        from mock_supabase_server import MockSupabaseServer
+        server = MockSupabaseServer(port=0, latency=Latency(args.supabase_latency))
+        server.seed(args.categories, args.streets).start_in_thread()
+        supabase_url = server.url
+        stopped.append(server.stop)
+    if not api_endpoint:
+        from mock_sharepoint_server import FaultProfile, Latency, MockIncidentServer
+        server = MockIncidentServer(port=0, faults=FaultProfile(latency=Latency(args.incident_latency)))
+        server.start_in_thread()
+        api_endpoint = server.url
+        stopped.append(server.stop)
+    return supabase_url, api_endpoint, stopped
+
+
+def rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_report(results, elapsed, users, rss_before):
+    steps = {}
+    for step in STEPS:
+        values = results.timings.get(step, [])
+        steps[step] = {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50) * 1000, 1),
+            "p95_ms": round(percentile(values, 95) * 1000, 1),
+            "p99_ms": round(percentile(values, 99) * 1000, 1),
+            "max_ms": round(max(values, default=0) * 1000, 1),
+        }
+    reruns = sum(len(v) for v in results.timings.values())
+    sessions = results.session_bytes
+    return {
+        "users": users,
+        "elapsed_s": round(elapsed, 2),
+        "flows": results.flows,
+        "errors": dict(results.errors),
+        "throughput": {
+            "flows_per_s": round(results.flows / elapsed, 3) if elapsed else 0,
+            "reruns_per_s": round(reruns / elapsed, 2) if elapsed else 0,
+        },
+        "steps": steps,
+        "memory": {
+            "session_state_p50_kb": round(percentile(sessions, 50) / 1024, 1),
+            "session_state_max_kb": round(max(sessions, default=0) / 1024, 1),
+            "rss_baseline_mb": round(rss_before, 1),
+            "rss_worker_p50_mb": round(percentile(results.rss_mb, 50), 1),
+            "rss_worker_max_mb": round(max(results.rss_mb, default=0), 1),
+        },
+    }
+
+
+def print_report(report):
+    print(f"\n{report['users']} users, {report['elapsed_s']}s, {report['flows']} completed flows")
+    print(f"throughput: {report['throughput']['flows_per_s']} flows/s, {report['throughput']['reruns_per_s']} reruns/s")
+    print(f"\n{'step':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for step, row in report["steps"].items():
+        print(f"{step:<16}{row['count']:>7}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}")
+    memory = report["memory"]
+    print(f"\nsession_state per session: p50 {memory['session_state_p50_kb']} KiB, max {memory['session_state_max_kb']} KiB")
+    print(f"peak RSS per virtual user: p50 {memory['rss_worker_p50_mb']} MiB, max {memory['rss_worker_max_mb']} MiB "
+          f"(baseline before the first session {memory['rss_baseline_mb']} MiB)")
+    if report["errors"]:
+        print("\nerrors:")
+        for error, count in sorted(report["errors"].items(), key=lambda item: -item[1]):
+            print(f"  {count:>5}  {error}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the ticket flow with headless virtual users")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep starting flows")
+    parser.add_argument("--iterations", type=int, default=None, help="flows per user (overrides --duration)")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="seconds over which users start")
+    parser.add_argument("--think-time", type=float, default=0.0, help="max random pause between steps (s)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-rerun timeout (s)")
+    parser.add_argument("--supabase-url", default="", help="use this Supabase instead of the in-process stand-in")
+    parser.add_argument("--supabase-key", default="local")
+    parser.add_argument("--api-endpoint", default="", help="use this incident service instead of the stand-in")
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--streets", type=int, default=1000)
+    parser.add_argument("--supabase-latency", default="normal:30,10")
+    parser.add_argument("--incident-latency", default="lognormal:200,0.4")
+    parser.add_argument("--keep-limits", action="store_true", help="keep dedup and rate limits enabled")
+    parser.add_argument("--json", help="also write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    supabase_url, api_endpoint, stoppers = start_stand_ins(args)
+    os.environ.update(
+        SUPABASE_URL=supabase_url,
+        SUPABASE_KEY=args.supabase_key,
+        API_ENDPOINT=api_endpoint,
+        DEBUG="false",
+        LOG_LEVEL=os.getenv("LOG_LEVEL", "WARNING"),
+        METRICS_PORT="0",  # one endpoint per worker would fight over the port
+    )
+    if not args.keep_limits:
+        os.environ.update(SUBMIT_DEDUP_WINDOW="0", RATE_LIMIT_SESSION="", RATE_LIMIT_PHONE="", RATE_LIMIT_GLOBAL="")
+
+    # Import once here so forked workers do not pay for it inside their timings
+    from streamlit.testing.v1 import AppTest  # noqa: F401
+    gc.collect()
+    rss_before = rss_mb()
+
+    results = Results()
+    iterations = args.iterations
+    deadline = time.time() + (10 ** 9 if iterations else args.ramp_up + args.duration)
+    jobs = [(i, deadline, iterations, args.timeout, args.think_time) for i in range(args.users)]
+    # fork keeps the already imported app/streamlit modules in every worker
+    context = multiprocessing.get_context("fork")
+    started = time.perf_counter()
+    with context.Pool(processes=args.users) as pool:
+        pending = []
+        for i, job in enumerate(jobs):
+            pending.append(pool.apply_async(_run_user, (job,)))
+            if args.ramp_up and i < len(jobs) - 1:
+                time.sleep(args.ramp_up / len(jobs))
+        for job in pending:
+            results.merge(job.get())
+    elapsed = time.perf_counter() - started
+
+    for stop in stoppers:
+        stop()
+    report = build_report(results, elapsed, args.users, rss_before)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 1 if results.errors and not results.flows else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+Local Redis-compatible server for sharing rate limits between app replicas.
+
+Backed by fakeredis, so no Redis install is needed. Point every replica at it:
+
+    python mock_redis_server.py --port 6390
+    RATE_LIMIT_REDIS_URL=redis://localhost:6390/0 streamlit run streamlit_app.py
+"""
+import argparse
+
+from fakeredis import TcpFakeServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+
+    server = TcpFakeServer((args.host, args.port), server_type="redis")
+    print(f"Redis-compatible stand-in listening on redis://{args.host}:{args.port}/0")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
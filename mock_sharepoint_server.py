@@ -0,0 +1,349 @@
+"""
+Local mock of the incident endpoints with latency and fault injection.
+
+Serves, on one asyncio event loop:
+  POST /incidents/submit                                          Cloud Run incident service
+  GET  /health                                                    Cloud Run health check
+  POST /_layouts/15/NetanyaMuni/incidents.ashx?method=CreateNewIncident   SharePoint endpoint
+
+Faults are drawn per request: latency from a distribution, HTTP errors,
+slow (trickled) bodies, connection resets, and a cold-start delay after the
+server has been idle. Examples:
+
+    python mock_sharepoint_server.py
+    python mock_sharepoint_server.py --latency lognormal:120,0.5 --error-rate 0.05
+    python mock_sharepoint_server.py --cold-start 4000 --idle-timeout 60 --payload-schemas 1
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from email.parser import BytesParser
+from email.policy import HTTP
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+SUBMIT_PATH = "/incidents/submit"
+HEALTH_PATH = "/health"
+SHAREPOINT_PATH = "/_layouts/15/NetanyaMuni/incidents.ashx"
+
+# Reason phrases for every status the server can send, e.g. 415 or an injected 429
+REASONS = {status.value: status.phrase for status in HTTPStatus}
+
+
+class Latency:
+    """
+    Latency distribution in milliseconds, parsed from "<kind>:<params>":
+    fixed:50, uniform:20,200, normal:100,30, lognormal:<median>,<sigma>, exp:<mean>.
+    """
+
+    def __init__(self, spec="fixed:0", rng=None):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p]
+        self.rng = rng or random.Random()
+        if kind not in ("fixed", "uniform", "normal", "lognormal", "exp"):
+            raise ValueError(f"Unknown latency distribution: {spec!r}")
+
+    def sample_ms(self):
+        p, rng = self.params, self.rng
+        if self.kind == "fixed":
+            value = p[0] if p else 0.0
+        elif self.kind == "uniform":
+            value = rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(math.log(max(p[0], 1e-9)), p[1])
+        else:
+            value = rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0.0
+        return max(0.0, value)
+
+
+@dataclass
+class FaultProfile:
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0            # share of requests answered with an HTTP error
+    error_statuses: tuple = (500, 503)
+    slow_body_rate: float = 0.0        # share of responses whose body is trickled
+    slow_body_ms: float = 2000.0       # total time spent trickling a slow body
+    reset_rate: float = 0.0            # share of connections reset without a response
+    cold_start_ms: float = 0.0         # boot delay after idling, applied to requests during boot
+    idle_timeout: float = 300.0        # seconds without traffic before the next cold start
+    payload_schemas: tuple = (1, 2)    # payload versions accepted on /incidents/submit
+    seed: int = None
+
+
+class MockIncidentServer:
+    """Asyncio HTTP/1.1 server implementing the incident endpoints."""
+
+    def __init__(self, host="127.0.0.1", port=8080, faults=None):
+        self.host = host
+        self.port = port
+        self.faults = faults or FaultProfile()
+        self.rng = random.Random(self.faults.seed)
+        self.faults.latency.rng = self.rng
+        self.tickets = itertools.count(100001)
+        self.stats = {"connections": 0, "requests": 0, "errors": 0, "resets": 0, "slow_bodies": 0, "cold_starts": 0}
+        self._last_request = None
+        self._warm_at = 0.0
+        self._server = None
+        self._loop = None
+        self._thread = None
+        self._handlers = set()  # open keep-alive connections
+
+    # --- lifecycle ---
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self):
+        """Run the server on its own event loop thread (for tests and load runs)."""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="mock-incident-server", daemon=True)
+        self._thread.start()
+        ready.wait(5)
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+
+        async def close():
+            self._server.close()
+            # Pooled clients keep connections open; end them so no handler outlives the loop
+            for handler in list(self._handlers):
+                handler.cancel()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(close(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    # --- HTTP plumbing ---
+
+    async def _handle_connection(self, reader, writer):
+        self.stats["connections"] += 1
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                keep_alive = await self._dispatch(request, writer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._handlers.discard(handler)
+            if not writer.is_closing():
+                writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0) or 0)
+        body = await reader.readexactly(length) if length else b""
+        return {"method": method, "target": target, "version": version, "headers": headers, "body": body}
+
+    async def _dispatch(self, request, writer):
+        faults = self.faults
+        self.stats["requests"] += 1
+        keep_alive = request["headers"].get("connection", "").lower() != "close"
+
+        now = time.monotonic()
+        delay_ms = faults.latency.sample_ms()
+        if faults.cold_start_ms > 0:
+            if self._last_request is None or now - self._last_request > faults.idle_timeout:
+                self.stats["cold_starts"] += 1
+                self._warm_at = now + faults.cold_start_ms / 1000
+            # Requests arriving while the instance boots all wait for it
+            delay_ms += max(0.0, self._warm_at - now) * 1000
+        self._last_request = now
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+
+        if faults.reset_rate and self.rng.random() < faults.reset_rate:
+            self.stats["resets"] += 1
+            self._reset(writer)
+            return False
+
+        url = urlsplit(request["target"])
+        if url.path != HEALTH_PATH and faults.error_rate and self.rng.random() < faults.error_rate:
+            self.stats["errors"] += 1
+            status = self.rng.choice(faults.error_statuses)
+            return await self._respond(writer, status, {"detail": f"Injected failure ({status})"}, keep_alive)
+
+        status, body, headers = self._route(request["method"], url, request["headers"], request["body"])
+        slow = faults.slow_body_rate and self.rng.random() < faults.slow_body_rate
+        return await self._respond(writer, status, body, keep_alive, headers, slow=slow)
+
+    async def _respond(self, writer, status, body, keep_alive, headers=None, slow=False):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(payload)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        head += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        if slow:
+            self.stats["slow_bodies"] += 1
+            chunks = max(1, min(len(payload), 20))
+            step = math.ceil(len(payload) / chunks)
+            for i in range(0, len(payload), step):
+                writer.write(payload[i:i + step])
+                await writer.drain()
+                await asyncio.sleep(self.faults.slow_body_ms / 1000 / chunks)
+        else:
+            writer.write(payload)
+        await writer.drain()
+        return keep_alive
+
+    @staticmethod
+    def _reset(writer):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            # SO_LINGER with a zero timeout makes close() send RST instead of FIN
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        writer.transport.abort()
+
+    # --- endpoints ---
+
+    def _route(self, method, url, headers, body):
+        if url.path == HEALTH_PATH:
+            if method != "GET":
+                return 405, {"detail": "Method not allowed"}, {}
+            return 200, {"status": "ok"}, {}
+        if url.path == SUBMIT_PATH:
+            if method != "POST":
+                return 405, {"detail": "Method not allowed"}, {}
+            return self._submit(headers, body)
+        if url.path == SHAREPOINT_PATH:
+            if method != "POST" or parse_qs(url.query).get("method") != ["CreateNewIncident"]:
+                return 405, {"detail": "Method not allowed"}, {}
+            return self._create_new_incident(headers, body)
+        return 404, {"detail": "Not found"}, {}
+
+    def _submit(self, headers, body):
+        schema = int(headers.get("x-payload-schema", "1") or 1)
+        advertised = {"X-Payload-Schema": str(max(self.faults.payload_schemas))}
+        if schema not in self.faults.payload_schemas:
+            return 415, {"detail": f"Unsupported payload schema {schema}"}, advertised
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"detail": "Invalid JSON"}, advertised
+
+        required = ("user_data", "category_id", "street_id") if schema == 2 else ("user_data", "category", "street")
+        missing = [key for key in required if key not in payload]
+        if missing:
+            return 422, {"detail": f"Missing fields: {', '.join(missing)}"}, advertised
+        return 200, {"ticket_id": str(next(self.tickets)), "status": "success"}, advertised
+
+    def _create_new_incident(self, headers, body):
+        content_type = headers.get("content-type", "")
+        fields = {}
+        if content_type.startswith("multipart/form-data"):
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+            )
+            for part in message.iter_parts():
+                name = part.get_param("name", header="content-disposition")
+                fields[name] = part.get_content()
+        if "json" not in fields:
+            return 200, {"ResultCode": 400, "ErrorDescription": "Missing json field",
+                         "ResultStatus": "ERROR", "data": ""}, {}
+        try:
+            json.loads(fields["json"])
+        except ValueError:
+            return 200, {"ResultCode": 400, "ErrorDescription": "Invalid json field",
+                         "ResultStatus": "ERROR", "data": ""}, {}
+        return 200, {"ResultCode": 200, "ErrorDescription": "", "ResultStatus": "SUCCESS CREATE",
+                     "data": str(next(self.tickets))}, {}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mock incident service with fault injection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", default="fixed:0",
+                        help="fixed:MS | uniform:MIN,MAX | normal:MEAN,SD | lognormal:MEDIAN,SIGMA | exp:MEAN")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-statuses", default="500,503")
+    parser.add_argument("--slow-body-rate", type=float, default=0.0)
+    parser.add_argument("--slow-body-ms", type=float, default=2000.0)
+    parser.add_argument("--reset-rate", type=float, default=0.0)
+    parser.add_argument("--cold-start", type=float, default=0.0, help="cold start delay in ms")
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="idle seconds before a cold start")
+    parser.add_argument("--payload-schemas", default="1,2", help="accepted payload schema versions")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    faults = FaultProfile(
+        latency=Latency(args.latency),
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(s) for s in args.error_statuses.split(",")),
+        slow_body_rate=args.slow_body_rate,
+        slow_body_ms=args.slow_body_ms,
+        reset_rate=args.reset_rate,
+        cold_start_ms=args.cold_start,
+        idle_timeout=args.idle_timeout,
+        payload_schemas=tuple(int(s) for s in args.payload_schemas.split(",")),
+        seed=args.seed,
+    )
+    server = MockIncidentServer(args.host, args.port, faults)
+    print(f"Mock incident server on http://{args.host}:{args.port} "
+          f"(latency={args.latency}, error_rate={args.error_rate}, reset_rate={args.reset_rate})")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
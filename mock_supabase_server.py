@@ -0,0 +1,327 @@
+"""
+Local PostgREST-compatible stand-in for the Supabase tables the app reads.
+
+Implements the subset of PostgREST used by SupabaseService on top of SQLite:
+column lists in `select`, `eq`/`neq`/`gt`/`gte`/`lt`/`lte`/`like`/`ilike`/`in`
+filters, `or=(...)`, `order`, `limit`/`offset` and `Range` pagination with
+`Content-Range` (plus exact counts via `Prefer: count=exact`). Tables are
+seeded with synthetic data of any size, and every request can be delayed by
+an injected latency.
+
+    python mock_supabase_server.py --streets 100000 --latency normal:40,10
+    SUPABASE_URL=http://localhost:54321 SUPABASE_KEY=local streamlit run streamlit_app.py
+"""
+import argparse
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from app.utils.synthetic_data import CATEGORY_COLUMNS, STREET_COLUMNS, connect, write_sqlite
+from mock_sharepoint_server import Latency
+
+REST_PREFIX = "/rest/v1/"
+
+TABLES = {
+    "categories": CATEGORY_COLUMNS,
+    "street_numbers": STREET_COLUMNS,
+}
+
+_OPERATORS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+class QueryError(ValueError):
+    """A request PostgREST would reject with 400."""
+
+
+def _split_top_level(text):
+    """Split on commas that are not inside parentheses or double quotes."""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return [p for p in parts if p]
+
+
+def _unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"')
+    return value
+
+
+def _like_pattern(value):
+    # PostgREST accepts * as an alias for % in (i)like patterns
+    return _unquote(value).replace("*", "%")
+
+
+class PostgrestQuery:
+    """Translate PostgREST query parameters for one table into SQLite SQL."""
+
+    def __init__(self, table, params, range_header=None):
+        if table not in TABLES:
+            raise QueryError(f'relation "public.{table}" does not exist')
+        self.table = table
+        self.columns = TABLES[table]
+        self.select = ["*"]
+        self.where, self.args = [], []
+        self.order = []
+        self.limit = self.offset = None
+
+        for key, value in params:
+            if key == "select":
+                self.select = self._parse_select(value)
+            elif key == "order":
+                self.order = self._parse_order(value)
+            elif key == "limit":
+                self.limit = int(value)
+            elif key == "offset":
+                self.offset = int(value)
+            elif key == "or":
+                if not (value.startswith("(") and value.endswith(")")):
+                    raise QueryError(f"Invalid or filter: {value}")
+                conditions = [self._parse_condition(*self._split_condition(c)) for c in _split_top_level(value[1:-1])]
+                self.where.append("(" + " OR ".join(sql for sql, _ in conditions) + ")")
+                for _, args in conditions:
+                    self.args.extend(args)
+            else:
+                sql, args = self._parse_condition(key, value)
+                self.where.append(sql)
+                self.args.extend(args)
+
+        if range_header:
+            match = re.fullmatch(r"\s*(\d+)-(\d*)\s*", range_header)
+            if not match:
+                raise QueryError(f"Invalid Range header: {range_header}")
+            start, end = int(match.group(1)), match.group(2)
+            self.offset = start
+            if end:
+                self.limit = int(end) - start + 1
+
+    def _column(self, name):
+        if name not in self.columns:
+            raise QueryError(f"column {self.table}.{name} does not exist")
+        return name
+
+    def _parse_select(self, value):
+        if value.strip() in ("", "*"):
+            return ["*"]
+        return [self._column(c.strip()) for c in value.split(",")]
+
+    def _parse_order(self, value):
+        order = []
+        for term in value.split(","):
+            column, _, direction = term.partition(".")
+            direction = direction.split(".")[0] or "asc"
+            if direction not in ("asc", "desc"):
+                raise QueryError(f"Invalid order direction: {direction}")
+            order.append(f"{self._column(column)} {direction.upper()}")
+        return order
+
+    @staticmethod
+    def _split_condition(condition):
+        column, _, rest = condition.partition(".")
+        return column, rest
+
+    def _parse_condition(self, column, expression):
+        column = self._column(column)
+        negate = expression.startswith("not.")
+        if negate:
+            expression = expression[4:]
+        operator, _, value = expression.partition(".")
+        if operator in _OPERATORS:
+            sql, args = f"{column} {_OPERATORS[operator]} ?", [_unquote(value)]
+        elif operator == "like":
+            sql, args = f"{column} LIKE ? ESCAPE '\\'", [_like_pattern(value)]
+        elif operator == "ilike":
+            # SQLite's LIKE only folds ASCII; casefold both sides for Hebrew/Cyrillic/French
+            sql, args = f"casefold({column}) LIKE casefold(?) ESCAPE '\\'", [_like_pattern(value)]
+        elif operator == "in":
+            if not (value.startswith("(") and value.endswith(")")):
+                raise QueryError(f"Invalid in filter: {value}")
+            items = [_unquote(v) for v in _split_top_level(value[1:-1])]
+            sql, args = f"{column} IN ({', '.join('?' * len(items))})", items
+        elif operator == "is":
+            literal = {"null": "NULL", "true": "1", "false": "0"}.get(value.lower())
+            if literal is None:
+                raise QueryError(f"Invalid is filter: {value}")
+            sql, args = f"{column} IS {literal}", []
+        else:
+            raise QueryError(f"Unsupported operator: {operator}")
+        return (f"NOT ({sql})" if negate else sql), args
+
+    def sql(self):
+        columns = ", ".join(self.select)
+        sql = f"SELECT {columns} FROM {self.table}"
+        if self.where:
+            sql += " WHERE " + " AND ".join(self.where)
+        sql += " ORDER BY " + (", ".join(self.order) if self.order else "id")
+        if self.limit is not None or self.offset is not None:
+            sql += f" LIMIT {self.limit if self.limit is not None else -1} OFFSET {self.offset or 0}"
+        return sql, list(self.args)
+
+    def count_sql(self):
+        sql = f"SELECT COUNT(*) FROM {self.table}"
+        if self.where:
+            sql += " WHERE " + " AND ".join(self.where)
+        return sql, list(self.args)
+
+
+def seed_database(conn, categories=20, streets=1000, seed=0):
+    """Replace both tables with reproducible synthetic rows."""
+    write_sqlite(conn, categories, streets, seed)
+
+
+class MockSupabaseServer:
+    """Threaded HTTP server answering PostgREST requests from a SQLite file."""
+
+    def __init__(self, db_path=None, host="127.0.0.1", port=54321, latency=None):
+        if db_path is None:
+            fd, db_path = tempfile.mkstemp(prefix="mock_supabase_", suffix=".sqlite")
+            os.close(fd)
+        self.db_path = db_path
+        self.latency = latency or Latency()
+        self.stats = {"requests": 0, "rows": 0}
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        connect(db_path).close()  # create the schema
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def connection(self):
+        """SQLite connection for the current thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.db_path)
+        return conn
+
+    def seed(self, categories=20, streets=1000, seed=0):
+        conn = connect(self.db_path)
+        try:
+            seed_database(conn, categories, streets, seed)
+        finally:
+            conn.close()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def start_in_thread(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-supabase-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(5)
+
+    def query(self, table, params, range_header=None, count=False):
+        """Run a PostgREST query; returns (rows, total or None, offset)."""
+        query = PostgrestQuery(table, params, range_header)
+        conn = self.connection()
+        sql, args = query.sql()
+        rows = [dict(row) for row in conn.execute(sql, args)]
+        total = None
+        if count:
+            count_sql, count_args = query.count_sql()
+            total = conn.execute(count_sql, count_args).fetchone()[0]
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["rows"] += len(rows)
+        return rows, total, query.offset or 0
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                delay_ms = server.latency.sample_ms()
+                if delay_ms:
+                    time.sleep(delay_ms / 1000)
+
+                url = urlsplit(self.path)
+                if not url.path.startswith(REST_PREFIX):
+                    return self._send(404, {"message": "Not found"})
+                table = url.path[len(REST_PREFIX):].strip("/")
+                params = parse_qsl(url.query, keep_blank_values=True)
+                prefer = self.headers.get("Prefer", "")
+                try:
+                    rows, total, offset = server.query(
+                        table, params, self.headers.get("Range"), count="count=exact" in prefer
+                    )
+                except (QueryError, ValueError) as e:
+                    return self._send(400, {"code": "PGRST100", "message": str(e), "details": None, "hint": None})
+
+                end = offset + len(rows) - 1
+                content_range = f"{offset}-{end}" if rows else "*"
+                content_range += f"/{total if total is not None else '*'}"
+                status = 206 if total is not None and len(rows) < total else 200
+                self._send(status, rows, {"Content-Range": content_range})
+
+            def _send(self, status, body, headers=None):
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PostgREST-compatible Supabase stand-in backed by SQLite")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--db", default="mock_supabase.sqlite", help="SQLite file (created if missing)")
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--streets", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-seed", action="store_true", help="serve the database as it is")
+    parser.add_argument("--latency", default="fixed:0",
+                        help="fixed:MS | uniform:MIN,MAX | normal:MEAN,SD | lognormal:MEDIAN,SIGMA | exp:MEAN")
+    args = parser.parse_args(argv)
+
+    server = MockSupabaseServer(args.db, args.host, args.port, Latency(args.latency))
+    if not args.no_seed:
+        started = time.perf_counter()
+        server.seed(args.categories, args.streets, args.seed)
+        print(f"Seeded {args.categories} categories and {args.streets} street numbers "
+              f"in {time.perf_counter() - started:.2f}s")
+    print(f"Supabase stand-in on {server.url} (db={args.db}, latency={args.latency})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
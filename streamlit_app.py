@@ -1,16 +1,14 @@
 """
-Streamlit Cloud entry point
-This file serves as the main entry point for Streamlit Cloud deployment.
-"""
+Streamlit entry point, for Streamlit Cloud and local runs alike:
 
-import sys
-import os
+    streamlit run streamlit_app.py
 
-# Add the app directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+Streamlit serves the static/ directory next to this file (see
+app/utils/static_assets.py), and puts this directory on sys.path so the
+`app` package imports.
+"""
 
-# Import and run the main application
-from main import main
+from app.main import main
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,55 @@
+import pytest
+from pytest_benchmark.utils import parse_compare_fail
+from app.services.supabase_service import SupabaseService
+from app.utils.models import Category, StreetNumber
+from app.utils import synthetic_data
+from app.utils.street_catalog import StreetCatalog
+
+CATALOG_SIZES = [100, 10_000, 100_000]
+
+# A --benchmark-compare run fails when a median is this much slower than the baseline
+REGRESSION_THRESHOLD = "median:15%"
+
+
+def pytest_configure(config):
+    # Runs before pytest-benchmark reads its options (its hook is trylast);
+    # an explicit --benchmark-compare-fail still wins
+    if config.getoption("benchmark_compare") and not config.getoption("benchmark_compare_fail"):
+        config.option.benchmark_compare_fail = [parse_compare_fail(REGRESSION_THRESHOLD)]
+
+
+@pytest.fixture(scope="session")
+def supabase():
+    return SupabaseService("bench_url", "bench_key", no_client=True)
+
+
+@pytest.fixture(scope="session", params=CATALOG_SIZES, ids=lambda n: f"{n}")
+def catalog_size(request):
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def street_rows(catalog_size):
+    return synthetic_data.as_dicts(synthetic_data.STREET_COLUMNS, synthetic_data.street_rows(catalog_size))
+
+
+@pytest.fixture(scope="session")
+def streets(street_rows):
+    return [StreetNumber(**row) for row in street_rows]
+
+
+@pytest.fixture(scope="session")
+def street_catalog(street_rows):
+    return StreetCatalog.from_rows(street_rows)
+
+
+@pytest.fixture(scope="session")
+def category_rows(catalog_size):
+    # Real catalogs have far fewer categories than streets
+    rows = synthetic_data.category_rows(max(10, catalog_size // 100))
+    return synthetic_data.as_dicts(synthetic_data.CATEGORY_COLUMNS, rows)
+
+
+@pytest.fixture(scope="session")
+def categories(category_rows):
+    return [Category(**row) for row in category_rows]
@@ -0,0 +1,46 @@
+import pytest
+from app.components.grid_view import gallery_images
+from app.utils.models import Category, StreetNumber
+from app.utils.street_catalog import StreetCatalog
+
+@pytest.mark.benchmark(group="search_street_numbers")
+@pytest.mark.parametrize("query", ["הרצל", "12", "no-such-street"], ids=["name", "number", "miss"])
+def test_search_street_numbers(benchmark, supabase, streets, query):
+    result = benchmark(supabase.search_street_numbers, query, streets)
+    assert isinstance(result, list)
+
+@pytest.mark.benchmark(group="search_street_numbers")
+@pytest.mark.parametrize("query", ["הרצל", "12", "no-such-street"], ids=["name", "number", "miss"])
+def test_search_street_catalog(benchmark, street_catalog, query):
+    result = benchmark(street_catalog.search, query)
+    assert len(result) <= len(street_catalog)
+
+@pytest.mark.benchmark(group="search_categories")
+def test_search_categories(benchmark, supabase, categories):
+    result = benchmark(supabase.search_categories, "תאורה", categories)
+    assert result
+
+@pytest.mark.benchmark(group="gallery_images")
+def test_gallery_images(benchmark, streets):
+    images = benchmark(gallery_images, streets)
+    assert len(images) == len(streets)
+
+@pytest.mark.benchmark(group="gallery_images")
+def test_gallery_images_from_catalog(benchmark, street_catalog):
+    images = benchmark(gallery_images, street_catalog)
+    assert len(images) == len(street_catalog)
+
+@pytest.mark.benchmark(group="models")
+def test_street_number_construction(benchmark, street_rows):
+    result = benchmark(lambda: [StreetNumber(**row) for row in street_rows])
+    assert len(result) == len(street_rows)
+
+@pytest.mark.benchmark(group="models")
+def test_street_catalog_construction(benchmark, street_rows):
+    result = benchmark(StreetCatalog.from_rows, street_rows)
+    assert len(result) == len(street_rows)
+
+@pytest.mark.benchmark(group="models")
+def test_category_construction(benchmark, category_rows):
+    result = benchmark(lambda: [Category(**row) for row in category_rows])
+    assert len(result) == len(category_rows)
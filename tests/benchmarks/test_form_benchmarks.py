@@ -0,0 +1,44 @@
+import pytest
+from app.services.api_service import APIService
+from app.utils.i18n import t, t_many
+from app.utils.models import Category, StreetNumber, UserData
+from app.utils.validation import validate_israeli_phone, validate_user_data
+
+USER = UserData(first_name="ישראל", last_name="ישראלי", phone="0521234567", user_id="123456789", email="a@b.co")
+CATEGORY = Category(id=1, name="תאורת רחוב", text="פנס,תאורה", image_url="", event_call_desc="פנס לא דולק")
+STREET = StreetNumber(id=7, name="הרצל 12", image_url="", house_number="12")
+
+@pytest.mark.benchmark(group="i18n")
+@pytest.mark.parametrize("lang", ["he", "en"])
+def test_t_nested_key(benchmark, lang):
+    assert benchmark(t, "success.ticket_number", lang) != "success.ticket_number"
+
+@pytest.mark.benchmark(group="i18n")
+def test_t_with_format(benchmark):
+    assert "30" in benchmark(t, "errors.rate_limited", "en", seconds=30)
+
+@pytest.mark.benchmark(group="i18n")
+def test_t_many_summary_labels(benchmark):
+    keys = ("first_name", "last_name", "phone", "email", "id_optional", "category", "street", "text")
+    assert len(benchmark(t_many, keys, "he", prefix="forms.")) == len(keys)
+
+@pytest.mark.benchmark(group="validation")
+@pytest.mark.parametrize("phone", ["0521234567", "+972-52-123-4567", "12"], ids=["local", "international", "invalid"])
+def test_validate_israeli_phone(benchmark, phone):
+    benchmark(validate_israeli_phone, phone)
+
+@pytest.mark.benchmark(group="validation")
+def test_validate_user_data(benchmark):
+    assert benchmark(validate_user_data, USER).is_valid
+
+@pytest.mark.benchmark(group="payload")
+def test_prepare_json_payload(benchmark):
+    api = APIService(endpoint="http://localhost", debug_mode=True)
+    payload = benchmark(api._prepare_json_payload, USER, CATEGORY, STREET)
+    assert payload["custom_text"] == "פנס לא דולק"
+
+@pytest.mark.benchmark(group="payload")
+def test_prepare_compact_payload(benchmark):
+    api = APIService(endpoint="http://localhost", debug_mode=True)
+    payload = benchmark(api._prepare_compact_payload, USER, CATEGORY, STREET)
+    assert payload["schema_version"] == 2
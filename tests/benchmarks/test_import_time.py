@@ -0,0 +1,37 @@
+"""
+Startup budget: what `import app.main` costs on top of Streamlit itself,
+measured with `python -X importtime` in fresh interpreters.
+
+    IMPORT_BUDGET_MS=300 pytest tests/benchmarks/test_import_time.py
+"""
+import os
+import subprocess
+import sys
+
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "300"))
+RUNS = 3
+
+
+def cumulative_us(stderr):
+    """{module: cumulative microseconds} from -X importtime output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.setdefault(name.strip(), int(cumulative))
+    return times
+
+
+def app_import_ms():
+    # Streamlit first so its own cost is not charged to the app
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import streamlit; import app.main"],
+        capture_output=True, text=True, check=True,
+    )
+    return cumulative_us(out.stderr)["app.main"] / 1000
+
+
+def test_app_import_within_budget():
+    best = min(app_import_ms() for _ in range(RUNS))
+    assert best <= IMPORT_BUDGET_MS, f"import app.main took {best:.0f} ms, budget {IMPORT_BUDGET_MS:.0f} ms"
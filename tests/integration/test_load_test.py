@@ -0,0 +1,24 @@
+import json
+import os
+import load_test
+
+def test_percentile_nearest_rank():
+    assert load_test.percentile([], 95) == 0.0
+    assert load_test.percentile([3, 1, 2, 4], 50) == 2
+    assert load_test.percentile(list(range(1, 101)), 99) == 99
+
+def test_single_user_completes_the_flow(tmp_path, monkeypatch):
+    # main() points the app at its stand-ins through the environment
+    monkeypatch.setattr(os, "environ", dict(os.environ))
+    report_path = tmp_path / "report.json"
+    code = load_test.main([
+        "--users", "1", "--iterations", "1", "--ramp-up", "0",
+        "--categories", "5", "--streets", "50",
+        "--supabase-latency", "fixed:0", "--incident-latency", "fixed:0",
+        "--json", str(report_path),
+    ])
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert code == 0
+    assert report["flows"] == 1 and report["errors"] == {}
+    assert all(report["steps"][step]["count"] == 1 for step in load_test.STEPS)
+    assert report["memory"]["session_state_p50_kb"] > 0
@@ -0,0 +1,106 @@
+import time
+import pytest
+import requests
+from mock_sharepoint_server import FaultProfile, Latency, MockIncidentServer
+from app.services import api_service
+from app.services.api_service import APIService
+from app.utils.models import UserData, Category, StreetNumber
+
+@pytest.fixture
+def report():
+    user = UserData(first_name="שרה", last_name="לוי", phone="0501234567", user_id="", email="")
+    category = Category(id=1, name="תאורת רחוב", text="פנס", image_url="", event_call_desc="פנס לא פועל")
+    street = StreetNumber(id=2, name="הרצל 42", image_url="", house_number="42")
+    return user, category, street
+
+@pytest.fixture
+def start_server(monkeypatch):
+    monkeypatch.setattr(api_service, "_negotiated_schemas", {})
+    servers = []
+    def start(**faults):
+        server = MockIncidentServer(port=0, faults=FaultProfile(seed=1, **faults)).start_in_thread()
+        servers.append(server)
+        return server
+    yield start
+    for server in servers:
+        server.stop()
+
+def test_submit_against_mock_server(start_server, report):
+    server = start_server()
+    response = APIService(endpoint=server.url, debug_mode=False).submit_data(*report)
+    assert response.ResultCode == 200
+    assert response.data == "100001"
+
+def test_warm_up_connection_is_reused_by_submits(start_server, report):
+    from types import SimpleNamespace
+    from app.services import warmup
+    server = start_server()
+    warmup._warm_api(SimpleNamespace(api_endpoint=server.url, debug_mode=False, api_timeout=5))
+    assert server.stats == {**server.stats, "connections": 1, "requests": 1}
+    assert APIService(endpoint=server.url, debug_mode=False).submit_data(*report).ResultCode == 200
+    assert APIService(endpoint=server.url, debug_mode=False).submit_data(*report).ResultCode == 200
+    assert (server.stats["connections"], server.stats["requests"]) == (1, 3)
+
+def test_warm_up_fails_on_unreachable_endpoint(start_server):
+    from types import SimpleNamespace
+    from app.services import warmup
+    server = start_server()
+    server.stop()
+    with pytest.raises(requests.ConnectionError):
+        warmup._warm_api(SimpleNamespace(api_endpoint=server.url, debug_mode=False, api_timeout=5))
+
+def test_schema_fallback_against_v1_backend(start_server, report):
+    server = start_server(payload_schemas=(1,))
+    api = APIService(endpoint=server.url, debug_mode=False)
+    assert api.submit_data(*report).ResultCode == 200
+    assert server.stats["requests"] == 2  # compact attempt + full resend
+    assert api.submit_data(*report).ResultCode == 200
+    assert server.stats["requests"] == 3
+
+def test_status_lines_carry_reason_phrases(start_server):
+    server = start_server(payload_schemas=(1,))
+    resp = requests.post(server.url + "/incidents/submit", data=b"{}", headers={"X-Payload-Schema": "2"}, timeout=5)
+    assert (resp.status_code, resp.reason) == (415, "Unsupported Media Type")
+    server = start_server(error_rate=1.0, error_statuses=(429,))
+    resp = requests.post(server.url + "/incidents/submit", data=b"{}", timeout=5)
+    assert (resp.status_code, resp.reason) == (429, "Too Many Requests")
+
+def test_injected_errors(start_server, report):
+    server = start_server(error_rate=1.0, error_statuses=(503,))
+    response = APIService(endpoint=server.url, debug_mode=False).submit_data(*report)
+    assert response.ResultCode == 503
+    assert "Injected failure" in response.ErrorDescription
+
+def test_connection_reset(start_server, report):
+    server = start_server(reset_rate=1.0)
+    response = APIService(endpoint=server.url, debug_mode=False).submit_data(*report)
+    assert response.ResultCode == 500
+    assert server.stats["resets"] >= 1
+
+def test_cold_start_delays_first_request_only(start_server):
+    server = start_server(cold_start_ms=300, idle_timeout=60)
+    started = time.perf_counter()
+    requests.get(server.url + "/health", timeout=5)
+    cold = time.perf_counter() - started
+    started = time.perf_counter()
+    requests.get(server.url + "/health", timeout=5)
+    warm = time.perf_counter() - started
+    assert cold >= 0.3 > warm
+    assert server.stats["cold_starts"] == 1
+
+def test_latency_distributions():
+    assert Latency("fixed:40").sample_ms() == 40
+    assert 20 <= Latency("uniform:20,30").sample_ms() <= 30
+    assert Latency("normal:-50,1").sample_ms() == 0
+    with pytest.raises(ValueError):
+        Latency("pareto:1")
+
+def test_sharepoint_create_new_incident(start_server):
+    server = start_server()
+    resp = requests.post(
+        server.url + "/_layouts/15/NetanyaMuni/incidents.ashx?method=CreateNewIncident",
+        files={"json": (None, '{"eventCallSourceId": 4}')},
+        timeout=5,
+    )
+    assert resp.status_code == 200
+    assert resp.json()["ResultStatus"] == "SUCCESS CREATE"
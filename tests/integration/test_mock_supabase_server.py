@@ -0,0 +1,101 @@
+import pytest
+import requests
+from mock_supabase_server import MockSupabaseServer, seed_database, connect
+from mock_sharepoint_server import Latency
+from app.services.supabase_service import SupabaseService
+from app.utils.models import Category, StreetNumber
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    db_path = str(tmp_path_factory.mktemp("supabase") / "catalog.sqlite")
+    server = MockSupabaseServer(db_path, port=0).seed(categories=12, streets=500).start_in_thread()
+    conn = connect(db_path)
+    conn.execute("INSERT INTO categories VALUES (100, 'Street Light', 'Lamp,Lighting', '', 'Lamp is off')")
+    conn.execute("INSERT INTO street_numbers VALUES (9001, 'Улица Ленина 5', '', '5A')")
+    conn.commit()
+    conn.close()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def supabase(server):
+    return SupabaseService(server.url, "local-anon-key")
+
+def test_get_categories_and_streets(supabase):
+    categories = supabase.get_categories()
+    streets = supabase.get_street_numbers()
+    assert len(categories) == 13 and all(isinstance(c, Category) for c in categories)
+    assert len(streets) == 501 and all(isinstance(s, StreetNumber) for s in streets)
+
+def test_server_side_search_uses_or_ilike(supabase):
+    assert [c.id for c in supabase.search_categories("lighting")] == [100]
+    assert [c.id for c in supabase.search_categories("STREET light")] == [100]
+    # Non-ASCII case folding
+    assert [s.id for s in supabase.search_street_numbers("ЛЕНИНА")] == [9001]
+    assert [s.id for s in supabase.search_street_numbers("5a")] == [9001]
+
+def test_eq_select_and_range(supabase, server):
+    rows = supabase.client.table("street_numbers").select("id,name").eq("id", 9001).execute().data
+    assert rows == [{"id": 9001, "name": "Улица Ленина 5"}]
+
+    response = supabase.client.table("street_numbers").select("*", count="exact").range(10, 19).execute()
+    assert [r["id"] for r in response.data] == list(range(11, 21))
+    assert response.count == 501
+
+    resp = requests.get(f"{server.url}/rest/v1/street_numbers?select=id", headers={"Range": "0-4"}, timeout=5)
+    assert resp.headers["Content-Range"] == "0-4/*"
+    assert len(resp.json()) == 5
+
+def test_order_and_bad_requests(server):
+    resp = requests.get(f"{server.url}/rest/v1/categories?select=id&order=id.desc&limit=2", timeout=5)
+    assert resp.json() == [{"id": 100}, {"id": 12}]
+    assert requests.get(f"{server.url}/rest/v1/categories?select=nope", timeout=5).status_code == 400
+    assert requests.get(f"{server.url}/rest/v1/nope?select=*", timeout=5).status_code == 400
+
+def test_seed_is_reproducible(tmp_path):
+    def rows(path):
+        conn = connect(str(path))
+        seed_database(conn, categories=5, streets=50, seed=7)
+        return conn.execute("SELECT * FROM categories").fetchall()
+    assert [tuple(r) for r in rows(tmp_path / "a.sqlite")] == [tuple(r) for r in rows(tmp_path / "b.sqlite")]
+
+def test_latency_injection(tmp_path):
+    import time
+    server = MockSupabaseServer(str(tmp_path / "slow.sqlite"), port=0, latency=Latency("fixed:150")).seed(1, 1).start_in_thread()
+    try:
+        started = time.perf_counter()
+        SupabaseService(server.url, "local-anon-key").get_categories()
+        assert time.perf_counter() - started >= 0.15
+    finally:
+        server.stop()
+
+def test_queries_are_measured(server):
+    from app.services import supabase_service as module
+    before = module.QUERY_SECONDS.snapshot(table="street_numbers", operation="search")[2]
+    supabase = SupabaseService(server.url, "local-anon-key", slow_query_ms=None)
+    streets = supabase.search_street_numbers("ЛЕНИНА")
+    assert module.QUERY_SECONDS.snapshot(table="street_numbers", operation="search")[2] == before + 1
+    _, rows, _ = module.QUERY_ROWS.snapshot(table="street_numbers", operation="search")
+    assert rows >= len(streets)
+    _, size, count = module.QUERY_BYTES.snapshot(table="street_numbers", operation="search")
+    assert count >= 1 and size > 0
+    assert module.QUERY_TTFB_SECONDS.snapshot(table="street_numbers", operation="search")[2] >= 1
+
+def test_slow_queries_are_logged(server, monkeypatch):
+    from app.services import supabase_service as module
+    warnings = []
+    monkeypatch.setattr(module.logger, "warning", lambda msg, extra=None: warnings.append((msg, extra)))
+    SupabaseService(server.url, "local-anon-key", slow_query_ms=0).get_categories()
+    SupabaseService(server.url, "local-anon-key", slow_query_ms=60_000).get_categories()
+    assert len(warnings) == 1
+    msg, extra = warnings[0]
+    assert msg == "Slow Supabase query"
+    assert extra["table"] == "categories" and extra["operation"] == "select"
+    assert extra["rows"] == 13 and extra["bytes"] > 0
+
+def test_failures_are_counted_by_type():
+    from app.services import supabase_service as module
+    supabase = SupabaseService("http://127.0.0.1:9", "local-anon-key")
+    assert supabase.get_street_numbers() == []
+    text = module.metrics.REGISTRY.render()
+    assert 'supabase_query_errors_total{table="street_numbers",operation="select",error="ConnectError"}' in text
@@ -0,0 +1,58 @@
+from app.components import analytics
+
+def test_track_queues_events_in_order():
+    state = {}
+    analytics.track("category_clicked", "category_7", state=state)
+    analytics.track("street_clicked", "street_3", state=state)
+    events = analytics.drain(state)
+    assert [e["params"]["event_label"] for e in events] == ["category_7", "street_3"]
+    assert events[0]["name"] == "custom_event"
+    assert events[0]["params"] == {"event_category": "category_clicked", "event_label": "category_7", "value": 1}
+    assert events[0]["time"] <= events[1]["time"]
+    assert analytics.drain(state) == []
+
+def test_queue_is_bounded():
+    state = {}
+    before = analytics.EVENTS_DROPPED.value()
+    for i in range(analytics.MAX_EVENTS + 10):
+        analytics.track("click", str(i), state=state)
+    events = analytics.drain(state)
+    assert len(events) == analytics.MAX_EVENTS
+    assert events[0]["params"]["event_label"] == "10"
+    assert analytics.EVENTS_DROPPED.value() == before + 10
+
+def test_views_are_sent_once_per_page_visit():
+    state = {}
+    for _ in range(3):
+        analytics.track_view("success", "ticket_sent_status", "success", state=state)
+        analytics.track_view("success", "ticket_sent", "share_whatsapp", state=state)
+    assert len(analytics.drain(state)) == 2
+    analytics.track_view("categories", "other", state=state)
+    analytics.track_view("success", "ticket_sent_status", "success", state=state)
+    assert len(analytics.drain(state)) == 2
+
+def test_session_start_once():
+    state = {}
+    analytics.track_session_start(state)
+    analytics.track_session_start(state)
+    events = analytics.drain(state)
+    assert [e["name"] for e in events] == ["app_main_page"]
+
+
+class _Exporter:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, client_id, events):
+        self.submitted.append((client_id, events))
+
+
+def test_flush_hands_events_to_exporter(monkeypatch):
+    state = {}
+    monkeypatch.setattr(analytics.st, "session_state", state)
+    exporter = _Exporter()
+    analytics.track("street_clicked", "street_3")
+    analytics.flush("G-TEST", exporter=exporter, client_id="session-1")
+    analytics.flush("G-TEST", exporter=exporter, client_id="session-1")
+    assert [(cid, [e["name"] for e in events]) for cid, events in exporter.submitted] == [("session-1", ["custom_event"])]
+    assert analytics.BATCH_KEY not in state
@@ -0,0 +1,127 @@
+import json
+import sqlite3
+import threading
+import pytest
+from app.services import analytics_exporter
+from app.services.analytics_exporter import (
+    AnalyticsExporter, JsonlSink, MeasurementProtocolSink, SqliteSink, create_sink,
+)
+
+
+def _event(name, label, at=1_700_000_000.0):
+    return {"name": name, "params": {"event_category": name, "event_label": label, "value": 1}, "time": at}
+
+
+class _Response:
+    def raise_for_status(self):
+        pass
+
+
+class _Session:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, params=None, data=None, headers=None, timeout=None):
+        self.posts.append((url, params, json.loads(data)))
+        return _Response()
+
+    def close(self):
+        pass
+
+
+class _FlakySink:
+    name = "flaky"
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.sent = []
+
+    def send(self, records):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("collector down")
+        self.sent.extend(records)
+
+    def close(self):
+        pass
+
+
+def test_create_sink():
+    assert isinstance(create_sink("https://collector.example/mp/collect", "G-1", "s"), MeasurementProtocolSink)
+    assert isinstance(create_sink("jsonl:events.jsonl"), JsonlSink)
+    assert isinstance(create_sink("sqlite:events.db"), SqliteSink)
+    with pytest.raises(ValueError):
+        create_sink("kafka:events")
+
+
+def test_measurement_protocol_batches_per_client():
+    session = _Session()
+    sink = MeasurementProtocolSink("https://collector.example/mp/collect", "G-1", "secret", session=session)
+    records = [{"client_id": "a", **_event("click", str(i))} for i in range(30)]
+    records.append({"client_id": "b", **_event("click", "b")})
+    sink.send(records)
+
+    assert [(body["client_id"], len(body["events"])) for _, _, body in session.posts] == [("a", 25), ("a", 5), ("b", 1)]
+    url, params, body = session.posts[0]
+    assert params == {"measurement_id": "G-1", "api_secret": "secret"}
+    assert body["events"][0] == {
+        "name": "click",
+        "params": {"event_category": "click", "event_label": "0", "value": 1},
+        "timestamp_micros": 1_700_000_000_000_000,
+    }
+
+
+def test_exporter_writes_jsonl_on_close(tmp_path):
+    path = tmp_path / "analytics" / "events.jsonl"
+    exporter = AnalyticsExporter(JsonlSink(str(path)), batch_size=2, flush_interval=0.05)
+    exporter.submit("session-1", [_event("category_clicked", "category_7"), _event("street_clicked", "street_3")])
+    exporter.submit(None, [_event("summary_page_send_button", "send_clicked")])
+    exporter.close()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [(r["client_id"], r["params"]["event_label"]) for r in lines] == [
+        ("session-1", "category_7"), ("session-1", "street_3"), ("anonymous", "send_clicked"),
+    ]
+
+
+def test_exporter_writes_sqlite_from_its_own_thread(tmp_path):
+    path = tmp_path / "events.db"
+    exporter = AnalyticsExporter(SqliteSink(str(path)), flush_interval=0.05)
+    exporter.submit("session-1", [_event("street_clicked", "street_3")])
+    exporter.close()
+
+    rows = sqlite3.connect(str(path)).execute("SELECT client_id, name, params FROM analytics_events").fetchall()
+    assert len(rows) == 1
+    assert rows[0][:2] == ("session-1", "street_clicked")
+    assert json.loads(rows[0][2])["event_label"] == "street_3"
+
+
+def test_failed_batch_is_retried_once():
+    sink = _FlakySink(failures=1)
+    exporter = AnalyticsExporter(sink, flush_interval=0.05)
+    exporter.submit("s", [_event("click", "1")])
+    exporter.close()
+    assert [r["params"]["event_label"] for r in sink.sent] == ["1"]
+
+
+def test_full_queue_drops_without_blocking():
+    release = threading.Event()
+
+    class _BlockedSink(_FlakySink):
+        def send(self, records):
+            release.wait()
+            super().send(records)
+
+    sink = _BlockedSink(failures=0)
+    before = analytics_exporter.EVENTS_EXPORTED.value(sink="flaky", result="dropped")
+    exporter = AnalyticsExporter(sink, batch_size=1, flush_interval=0.05, max_queue=2)
+    exporter.submit("s", [_event("click", "0")])
+    # Wait until the exporter thread holds the first event, leaving the queue empty
+    while exporter._queue.qsize():
+        pass
+    exporter.submit("s", [_event("click", str(i)) for i in range(1, 5)])
+    release.set()
+    exporter.close()
+
+    assert analytics_exporter.EVENTS_EXPORTED.value(sink="flaky", result="dropped") == before + 2
+    assert [r["params"]["event_label"] for r in sink.sent] == ["0", "1", "2"]
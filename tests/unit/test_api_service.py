@@ -135,3 +135,162 @@ def test_boundary_generation_is_random():
     assert response1.ResultStatus == "ERROR"
     assert response2.ResultStatus == "ERROR" 
 
+
+
+class FakeResponse:
+    def __init__(self, status_code, body, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode("utf-8")
+        self.text = self.content.decode("utf-8")
+        self.headers = headers or {}
+
+@pytest.fixture
+def fake_post(monkeypatch):
+    """Capture outgoing requests and answer with queued FakeResponses."""
+    from app.services import api_service
+    monkeypatch.setattr(api_service, "_negotiated_schemas", {})
+    calls, responses = [], []
+    def post(url, data=None, headers=None, timeout=None):
+        calls.append({"url": url, "body": json.loads(data), "headers": headers})
+        return responses.pop(0)
+    monkeypatch.setattr(api_service.http_session(), "post", post)
+    return calls, responses
+
+def test_compact_payload_carries_only_ids(realistic_data):
+    api = APIService(endpoint="http://dummy", debug_mode=True)
+    user, category, street = realistic_data
+    payload = api._prepare_compact_payload(user, category, street, "טקסט")
+    assert payload == {
+        "schema_version": 2,
+        "user_data": {
+            "first_name": "יוסי", "last_name": "כהן", "phone": "0521234567",
+            "user_id": "123456789", "email": "yossi.cohen@example.com",
+        },
+        "category_id": 1,
+        "street_id": 42,
+        "custom_text": "טקסט",
+    }
+    assert api._prepare_compact_payload(user, category, street)["custom_text"] is None
+
+def test_full_payload_falls_back_to_raw_descriptions(realistic_data):
+    api = APIService(endpoint="http://dummy", debug_mode=True)
+    user, _, street = realistic_data
+    category = Category(id=1, name="x", text="", image_url="", event_call_desc=" פנס כבוי ,, פנס מהבהב ")
+    payload = api._prepare_json_payload(user, category, street)
+    # Byte-for-byte what the backend has always received, not the parsed options
+    assert payload["custom_text"] == " פנס כבוי ,, פנס מהבהב "
+    assert payload["category"]["event_call_desc"] == " פנס כבוי ,, פנס מהבהב "
+    assert api._prepare_json_payload(user, category, street, "טקסט")["custom_text"] == "טקסט"
+
+def test_submit_negotiates_compact_payload(realistic_data, fake_post):
+    calls, responses = fake_post
+    responses.append(FakeResponse(200, {"ticket_id": "T-1"}))
+    api = APIService(endpoint="http://backend", debug_mode=False)
+    response = api.submit_data(*realistic_data)
+    assert response.data == "T-1"
+    assert calls[0]["url"] == "http://backend/incidents/submit"
+    assert calls[0]["headers"]["X-Payload-Schema"] == "2"
+    assert calls[0]["body"]["category_id"] == 1
+
+def test_submit_falls_back_to_full_payload(realistic_data, fake_post):
+    calls, responses = fake_post
+    responses.extend([
+        FakeResponse(415, {"detail": "Unsupported payload schema 2"}),
+        FakeResponse(200, {"ticket_id": "T-2"}),
+        FakeResponse(200, {"ticket_id": "T-3"}),
+    ])
+    api = APIService(endpoint="http://backend", debug_mode=False)
+    assert api.submit_data(*realistic_data).data == "T-2"
+    assert [c["headers"]["X-Payload-Schema"] for c in calls] == ["2", "1"]
+    assert calls[1]["body"]["category"]["name"] == "תאורת רחוב"
+    # The fallback is remembered for later submissions
+    assert APIService(endpoint="http://backend", debug_mode=False).submit_data(*realistic_data).data == "T-3"
+    assert calls[2]["headers"]["X-Payload-Schema"] == "1"
+
+def test_submit_does_not_fall_back_when_backend_speaks_compact(realistic_data, fake_post):
+    calls, responses = fake_post
+    responses.append(FakeResponse(422, {"detail": "unknown street"}, headers={"X-Payload-Schema": "2"}))
+    api = APIService(endpoint="http://backend", debug_mode=False)
+    response = api.submit_data(*realistic_data)
+    assert response.ResultCode == 422
+    assert response.ErrorDescription == "unknown street"
+    assert len(calls) == 1
+
+def test_submit_falls_back_when_backend_advertises_full_schema(realistic_data, fake_post):
+    calls, responses = fake_post
+    responses.extend([
+        FakeResponse(422, {"detail": "category: field required"}, headers={"X-Payload-Schema": "1"}),
+        FakeResponse(200, {"ticket_id": "T-5"}),
+    ])
+    api = APIService(endpoint="http://backend", debug_mode=False)
+    assert api.submit_data(*realistic_data).data == "T-5"
+    assert [c["headers"]["X-Payload-Schema"] for c in calls] == ["2", "1"]
+
+def test_default_config_falls_back_for_backend_without_schema_header(realistic_data, fake_post):
+    from app.config.settings import load_config
+    calls, responses = fake_post
+    # Today's incident service: a plain validation error for the v2 body, no header
+    responses.extend([
+        FakeResponse(422, {"detail": "category: field required"}),
+        FakeResponse(200, {"ticket_id": "T-6"}),
+        FakeResponse(200, {"ticket_id": "T-7"}),
+    ])
+    config = load_config({"SUPABASE_URL": "https://example.supabase.co", "SUPABASE_KEY": "key"})
+    api = APIService(endpoint="http://backend", debug_mode=False, payload_schema=config.api_payload_schema)
+    response = api.submit_data(*realistic_data)
+    assert response.ResultCode == 200 and response.data == "T-6"
+    # Remembered: later submissions go straight to v1
+    assert api.submit_data(*realistic_data).data == "T-7"
+    assert [c["headers"]["X-Payload-Schema"] for c in calls] == ["2", "1", "1"]
+
+def test_full_schema_fallback_expires(realistic_data, fake_post, monkeypatch):
+    from app.services import api_service
+    calls, responses = fake_post
+    now = [1000.0]
+    monkeypatch.setattr(api_service.time, "monotonic", lambda: now[0])
+    responses.extend([
+        FakeResponse(415, {"detail": "Unsupported payload schema 2"}),
+        FakeResponse(200, {"ticket_id": "T-7"}),
+        FakeResponse(200, {"ticket_id": "T-8"}),
+        FakeResponse(200, {"ticket_id": "T-9"}),
+    ])
+    api = APIService(endpoint="http://backend", debug_mode=False)
+    assert api.submit_data(*realistic_data).data == "T-7"
+    now[0] += api_service.SCHEMA_RETRY_INTERVAL - 1
+    assert api.submit_data(*realistic_data).data == "T-8"
+    now[0] += 1
+    # The backend was upgraded in the meantime: v2 is offered again and kept
+    assert api.submit_data(*realistic_data).data == "T-9"
+    assert [c["headers"]["X-Payload-Schema"] for c in calls] == ["2", "1", "1", "2"]
+    assert api_service._negotiated_schemas["http://backend/incidents/submit"][0] == 2
+
+def test_pinned_full_schema(realistic_data, fake_post):
+    calls, responses = fake_post
+    responses.append(FakeResponse(200, {"ticket_id": "T-4"}))
+    api = APIService(endpoint="http://backend/", debug_mode=False, payload_schema="full")
+    assert api.submit_data(*realistic_data).data == "T-4"
+    assert calls[0]["body"]["category"]["id"] == 1
+
+@pytest.fixture
+def fake_get(monkeypatch):
+    from app.services import api_service
+    monkeypatch.setattr(api_service, "_last_warmups", {})
+    calls = []
+    def get(url, timeout=None):
+        calls.append(url)
+        return FakeResponse(200, {"status": "ok"})
+    monkeypatch.setattr(api_service.http_session(), "get", get)
+    return calls
+
+def test_warm_up_pings_health_once_per_interval(fake_get):
+    api = APIService(endpoint="http://backend/incidents/submit", debug_mode=False, warmup_interval=60)
+    assert api.warm_up(background=False) is True
+    assert api.warm_up(background=False) is False
+    # A fresh instance in another rerun shares the same throttle
+    assert APIService(endpoint="http://backend", debug_mode=False).warm_up(background=False) is False
+    assert fake_get == ["http://backend/health"]
+
+def test_warm_up_disabled(fake_get):
+    assert APIService(endpoint="http://backend", debug_mode=True).warm_up(background=False) is False
+    assert APIService(endpoint="http://backend", debug_mode=False, warmup_interval=0).warm_up(background=False) is False
+    assert fake_get == []
@@ -0,0 +1,89 @@
+from app.services.catalog_service import CatalogCache, SearchIndex
+from app.utils.models import Category, StreetNumber
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Supabase:
+    def __init__(self, categories, streets):
+        self.categories = categories
+        self.streets = streets
+        self.calls = 0
+
+    def get_categories(self):
+        self.calls += 1
+        return list(self.categories)
+
+    def get_street_numbers(self):
+        return list(self.streets)
+
+
+def _category(name, text=""):
+    return Category(id=1, name=name, text=text, image_url="", event_call_desc="")
+
+
+def _street(name, house_number):
+    return StreetNumber(id=1, name=name, image_url="", house_number=house_number)
+
+
+def test_search_index_is_case_insensitive_and_per_field():
+    items = [_category("Potholes", "Road DAMAGE, Crack"), _category("Lighting", "street lamps")]
+    index = SearchIndex(items, ("search_key",))
+    assert index.search("") is items
+    assert index.search("damage") == [items[0]]
+    assert index.search("LAMP") == [items[1]]
+    # No match across the field boundary, or between two synonyms
+    assert index.search("holesroad") == []
+    assert index.search("damage, crack") == []
+    assert index.search("crack") == [items[0]]
+
+
+def test_search_index_handles_missing_fields():
+    items = [_street("Herzl", None), _street("Weizmann", "12")]
+    assert SearchIndex(items, ("name", "house_number")).search("12") == [items[1]]
+
+
+def test_catalog_is_reused_until_ttl():
+    clock = _Clock()
+    supabase = _Supabase([_category("a")], [_street("s", "1")])
+    cache = CatalogCache(supabase, ttl=300, clock=clock)
+    first = cache.get()
+    clock.now += 299
+    assert cache.get() is first
+    assert supabase.calls == 1
+    clock.now += 1
+    assert cache.get() is not first
+    assert supabase.calls == 2
+
+
+def test_incomplete_catalog_is_retried_sooner():
+    clock = _Clock()
+    supabase = _Supabase([], [_street("s", "1")])
+    cache = CatalogCache(supabase, ttl=300, retry_interval=10, clock=clock)
+    assert not cache.get().complete
+    supabase.categories = [_category("a")]
+    clock.now += 10
+    assert cache.get().complete
+
+
+def test_failed_refresh_keeps_last_good_catalog():
+    clock = _Clock()
+    supabase = _Supabase([_category("a")], [_street("s", "1")])
+    cache = CatalogCache(supabase, ttl=300, retry_interval=10, clock=clock)
+    good = cache.get()
+    supabase.categories = []
+    clock.now += 300
+    assert cache.get() is good
+    # Next attempt after retry_interval, not after another ttl
+    clock.now += 9
+    cache.get()
+    assert supabase.calls == 2
+    clock.now += 1
+    cache.get()
+    assert supabase.calls == 3
@@ -0,0 +1,85 @@
+import threading
+import pytest
+from app.services.dedup_service import SubmissionDeduplicator, submission_key
+from app.utils.models import UserData, Category, StreetNumber, APIResponse
+
+class CountingAPI:
+    """Stands in for APIService and hands out sequential ticket ids."""
+    def __init__(self, result_code=200, gate=None):
+        self.calls = 0
+        self.result_code = result_code
+        self.gate = gate
+    def submit_data(self, user_data, category, street, custom_text=None, extra_files=None):
+        self.calls += 1
+        if self.gate:
+            self.gate.wait(5)
+        if self.result_code != 200:
+            return APIResponse(ResultCode=self.result_code, ErrorDescription="boom", ResultStatus="ERROR", data="")
+        return APIResponse(ResultCode=200, ErrorDescription="", ResultStatus="SUCCESS CREATE", data=f"T-{self.calls}")
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def report():
+    user = UserData(first_name="Dana", last_name="Levi", phone="052-123-4567")
+    category = Category(id=1, name="Lighting", text="lamp", image_url="", event_call_desc="Broken lamp")
+    street = StreetNumber(id=7, name="Herzl 7", image_url="", house_number="7")
+    return user, category, street
+
+def test_key_normalizes_phone_and_text(report):
+    user, category, street = report
+    other = UserData(first_name="Other", last_name="Name", phone="+972 52 123 4567")
+    assert submission_key(user, category, street, "Broken  LAMP ") == submission_key(other, category, street)
+    assert submission_key(user, category, street, "Another text") != submission_key(user, category, street)
+
+def test_repeat_within_window_returns_first_ticket(report):
+    clock, api = FakeClock(), CountingAPI()
+    dedup = SubmissionDeduplicator(window_seconds=60, clock=clock)
+    assert dedup.submit(api, *report).data == "T-1"
+    clock.now += 59
+    assert dedup.submit(api, *report).data == "T-1"
+    assert api.calls == 1
+    clock.now += 2
+    assert dedup.submit(api, *report).data == "T-2"
+    assert api.calls == 2
+
+def test_different_reports_are_not_merged(report):
+    user, category, street = report
+    api = CountingAPI()
+    dedup = SubmissionDeduplicator(window_seconds=60)
+    dedup.submit(api, user, category, street)
+    dedup.submit(api, user, category, StreetNumber(id=8, name="Herzl 8", image_url="", house_number="8"))
+    dedup.submit(api, user, category, street, custom_text="Lamp flickers")
+    assert api.calls == 3
+
+def test_failures_are_not_remembered(report):
+    api = CountingAPI(result_code=500)
+    dedup = SubmissionDeduplicator(window_seconds=60)
+    assert dedup.submit(api, *report).ResultCode == 500
+    assert dedup.submit(api, *report).ResultCode == 500
+    assert api.calls == 2
+
+def test_concurrent_duplicates_share_one_request(report):
+    gate = threading.Event()
+    api = CountingAPI(gate=gate)
+    dedup = SubmissionDeduplicator(window_seconds=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(dedup.submit(api, *report))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+    assert api.calls == 1
+    assert [r.data for r in results] == ["T-1"] * 5
+
+def test_zero_window_disables_dedup(report):
+    api = CountingAPI()
+    dedup = SubmissionDeduplicator(window_seconds=0)
+    dedup.submit(api, *report)
+    dedup.submit(api, *report)
+    assert api.calls == 2
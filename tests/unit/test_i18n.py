@@ -1,5 +1,8 @@
+import json
+import os
 import pytest
-from app.utils.i18n import t, get_translation
+from app.utils import i18n
+from app.utils.i18n import t, t_many, compile_translations, get_translation
 
 def test_translation_lookup():
     assert t("common.welcome", "en") == "Welcome"
@@ -13,4 +16,66 @@ def test_translation_formatting():
 
 def test_missing_language_file():
     # Should fallback to key if file missing
-    assert t("common.welcome", "zz") == "common.welcome" 
\ No newline at end of file
+    assert t("common.welcome", "zz") == "common.welcome" 
+def test_compiled_table_is_flat():
+    table = compile_translations("en")
+    assert table.strings["common.search"] == "Search"
+    assert "errors.rate_limited" in table.templates
+    assert "common.search" not in table.templates
+    assert all(not isinstance(v, dict) for v in table.strings.values())
+
+def test_missing_keys_fall_back_to_builtin_strings():
+    table = i18n.compile_language("en", {"common": {"search": "Find"}})
+    assert table.strings["common.search"] == "Find"
+    assert table.strings["common.save"] == "Save"
+
+@pytest.fixture
+def translations_dir(tmp_path, monkeypatch):
+    sources = tmp_path / "translations"
+    sources.mkdir()
+    (sources / "en.json").write_text(json.dumps({"common": {"search": "Find"}}), encoding="utf-8")
+    monkeypatch.setattr(i18n, "TRANSLATIONS_PATH", str(sources))
+    monkeypatch.setattr(i18n, "BUNDLE_PATH", str(tmp_path / "translations.bundle"))
+    i18n.reload_translations()
+    yield sources
+    i18n.reload_translations()
+
+def test_bundle_is_written_and_reused(translations_dir, monkeypatch):
+    assert t("common.search", "en") == "Find"
+    bundle = i18n.read_bundle()
+    assert bundle["sources"] == i18n.source_stamps()
+    assert bundle["tables"]["en"][0]["common.search"] == "Find"
+
+    i18n.reload_translations()
+    monkeypatch.setattr(i18n, "build_bundle", lambda directory=None: pytest.fail("bundle not reused"))
+    assert t("common.search", "en") == "Find"
+
+def test_stale_bundle_is_rebuilt(translations_dir):
+    t("common.search", "en")
+    (translations_dir / "en.json").write_text(json.dumps({"common": {"search": "Look up"}}), encoding="utf-8")
+    os.utime(translations_dir / "en.json", ns=(0, 0))
+    i18n.reload_translations()
+    assert t("common.search", "en") == "Look up"
+
+def test_changed_fallbacks_invalidate_bundle(translations_dir, monkeypatch):
+    assert t("common.save", "en") == "Save"
+    fallbacks = json.loads(json.dumps(i18n.FALLBACK_TRANSLATIONS))
+    fallbacks["en"]["common"]["save"] = "Keep"
+    # A deploy that edits only the in-code strings: same sources, same bundle file
+    monkeypatch.setattr(i18n, "FALLBACK_TRANSLATIONS", fallbacks)
+    i18n.reload_translations()
+    assert t("common.save", "en") == "Keep"
+    assert i18n.read_bundle()["fallbacks"] == i18n.fallback_digest()
+
+def test_hot_reload(translations_dir, monkeypatch):
+    monkeypatch.setattr(i18n, "HOT_RELOAD", True)
+    monkeypatch.setattr(i18n, "RELOAD_INTERVAL", 0)
+    assert t("common.search", "en") == "Find"
+    (translations_dir / "fr.json").write_text(json.dumps({"common": {"search": "Chercher"}}), encoding="utf-8")
+    assert t("common.search", "fr") == "Chercher"
+
+def test_t_many():
+    labels = t_many(("first_name", "missing"), "en", prefix="forms.")
+    assert labels == {"first_name": t("forms.first_name", "en"), "missing": "forms.missing"}
+    assert t_many(["errors.rate_limited"], "en", seconds=5)["errors.rate_limited"] == t("errors.rate_limited", "en", seconds=5)
+    assert "5" in t_many(["errors.rate_limited"], "en", seconds=5)["errors.rate_limited"]
@@ -0,0 +1,48 @@
+import os
+from PIL import Image
+from app.utils import image_assets
+from app.utils.image_assets import ImageSpec, build, picture_html
+
+
+def _source(tmp_path, name, mode, color):
+    Image.new(mode, (300, 100), color).save(tmp_path / name)
+    return name
+
+
+def test_build_writes_hashed_variants_and_manifest(tmp_path):
+    out = tmp_path / "images"
+    out.mkdir()
+    (out / "banner-100w.stale.jpg").write_bytes(b"old")
+    images = {
+        "banner": ImageSpec(_source(tmp_path, "banner.png", "RGBA", (200, 10, 10, 255)), widths=(100, 600)),
+        "logo": ImageSpec(_source(tmp_path, "logo.png", "RGBA", (0, 0, 0, 0)), widths=(50,)),
+    }
+    manifest = build(images, out_dir=str(out), formats=("webp", "jpeg"), root=str(tmp_path))
+
+    banner = manifest["banner"]
+    # Opaque RGBA is stored as JPEG; widths are capped at the source width
+    assert sorted(banner["variants"]) == ["jpeg", "webp"]
+    assert [v["width"] for v in banner["variants"]["jpeg"]] == [100, 300]
+    assert sorted(manifest["logo"]["variants"]) == ["png", "webp"]
+    files = {v["file"] for entry in manifest.values() for vs in entry["variants"].values() for v in vs}
+    assert sorted(os.listdir(out)) == sorted(files | {"manifest.json"})
+    assert all(len(f.split(".")[1]) == 10 for f in files)
+
+
+def test_picture_html(tmp_path):
+    manifest = build(
+        {"banner": ImageSpec(_source(tmp_path, "b.png", "RGB", (1, 2, 3)), widths=(100, 200), sizes="50vw")},
+        out_dir=str(tmp_path / "images"), formats=("webp", "jpeg"), root=str(tmp_path),
+    )
+    html = picture_html("banner", alt='A "banner"', css_class="clickable-banner", manifest=manifest)
+    webp = manifest["banner"]["variants"]["webp"]
+    assert html.startswith('<picture><source type="image/webp" srcset="app/static/images/' + webp[0]["file"] + ' 100w, ')
+    assert 'sizes="50vw"' in html and 'alt="A &quot;banner&quot;"' in html and 'class="clickable-banner"' in html
+    assert picture_html("missing", manifest=manifest) is None
+
+
+def test_built_banner_is_committed():
+    entry = image_assets.load_manifest()["banner"]
+    for variants in entry["variants"].values():
+        for v in variants:
+            assert os.path.exists(os.path.join(image_assets.IMAGES_DIR, v["file"]))
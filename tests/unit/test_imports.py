@@ -0,0 +1,19 @@
+import json
+import subprocess
+import sys
+
+# Imported on the code paths that use them, never by `import app.main`
+LAZY_MODULES = (
+    "supabase", "redis", "streamlit_local_storage", "streamlit_image_gallery", "PIL",
+    # Test-data generator; the form's placeholder names come from app.utils.names
+    "app.utils.synthetic_data",
+)
+
+
+def test_heavy_dependencies_are_not_imported_at_startup():
+    code = (
+        "import json, sys, app.main; "
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
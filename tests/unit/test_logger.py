@@ -0,0 +1,64 @@
+import io
+import json
+import logging
+import logging.handlers
+import pytest
+from app.utils.logger import configure_logging, get_logger, redact, shutdown_logging, REDACTED
+from app.utils.models import UserData
+
+@pytest.fixture
+def log_stream():
+    shutdown_logging()
+    stream = io.StringIO()
+    configure_logging(level="DEBUG", stream=stream)
+    yield stream
+    shutdown_logging()
+
+def _records(stream):
+    shutdown_logging()  # flushes the listener queue
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+def test_get_logger_uses_queue_handler(log_stream):
+    logger = get_logger("services.api_service")
+    assert logger.name == "app.services.api_service"
+    handlers = logging.getLogger("app").handlers
+    assert any(isinstance(h, logging.handlers.QueueHandler) for h in handlers)
+
+def test_records_are_json_with_extra_fields(log_stream):
+    get_logger("test").info("Incident service responded", extra={"status_code": 200, "elapsed_ms": 12.5})
+    [record] = _records(log_stream)
+    assert record["level"] == "INFO"
+    assert record["logger"] == "app.test"
+    assert record["msg"] == "Incident service responded"
+    assert record["status_code"] == 200
+    assert record["elapsed_ms"] == 12.5
+
+def test_user_data_fields_are_redacted(log_stream):
+    user = UserData(first_name="יוסי", last_name="כהן", phone="0521234567", user_id="123456789", email="yossi@example.com")
+    payload = {"user_data": {"first_name": "יוסי", "phone": "0521234567", "email": ""}, "custom_text": "call 052-1234567"}
+    get_logger("test").debug("Incident payload", extra={"payload": payload, "user": user})
+    [record] = _records(log_stream)
+    assert record["payload"]["user_data"] == {"first_name": REDACTED, "phone": REDACTED, "email": ""}
+    assert record["payload"]["custom_text"] == f"call {REDACTED}"
+    assert set(record["user"].values()) == {REDACTED}
+
+def test_level_filtering(log_stream):
+    get_logger("test").setLevel("WARNING")
+    try:
+        get_logger("test").info("dropped")
+        get_logger("test").warning("kept")
+    finally:
+        get_logger("test").setLevel(logging.NOTSET)
+    assert [r["msg"] for r in _records(log_stream)] == ["kept"]
+
+def test_exception_is_formatted(log_stream):
+    try:
+        raise ValueError("boom for test@example.com")
+    except ValueError:
+        get_logger("test").exception("failed")
+    [record] = _records(log_stream)
+    assert "ValueError" in record["exc"]
+    assert "test@example.com" not in record["exc"]
+
+def test_redact_passes_through_plain_values():
+    assert redact({"status_code": 200, "ok": True, "items": [1, "a"]}) == {"status_code": 200, "ok": True, "items": [1, "a"]}
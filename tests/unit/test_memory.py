@@ -0,0 +1,128 @@
+import logging
+import sys
+from app.utils import memory
+from app.utils.memory import SessionMemoryTracker, deep_size
+from app.utils.models import StreetNumber
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def test_deep_size_follows_containers_and_dataclasses():
+    flat = deep_size({"a": 1})
+    assert deep_size({"a": 1, "b": ["x" * 1000]}) > flat + 1000
+    street = StreetNumber(id=1, name="הרצל " * 200, image_url="", house_number="1")
+    assert deep_size(street) > 1000
+    # Classes and functions are shared, not owned
+    pair = [len, StreetNumber]
+    assert deep_size(pair) == sys.getsizeof(pair)
+
+def test_deep_size_handles_cycles():
+    a = []
+    a.append(a)
+    assert deep_size(a) > 0
+
+def test_measure_charges_shared_objects_once():
+    street = StreetNumber(id=1, name="x" * 5000, image_url="", house_number="1")
+    sizes = memory.measure({"streets_data": [street], "selected_street": street})
+    assert sizes["streets_data"] > 5000 > sizes["selected_street"]
+
+def test_shared_catalog_is_sized_once_not_per_session():
+    from app.services.catalog_service import Catalog
+    catalog = Catalog([], [StreetNumber(id=i, name="x" * 500 + str(i), image_url="", house_number=str(i)) for i in range(20)], 0)
+    tracker = SessionMemoryTracker(budget_bytes=0, clock=Clock())
+    tracker.share(catalog)
+    assert memory.SHARED_BYTES.value() == deep_size(catalog) > 10_000
+    state = {"streets_data": catalog.streets, "categories_data": catalog.categories, "name": "y" * 1000}
+    sizes = tracker.track("s", state)
+    assert sizes["streets_data"] == sizes["categories_data"] == 0
+    assert sizes["name"] > 1000
+    # Sharing the same catalog again does not resize it
+    memory.SHARED_BYTES.set(0)
+    tracker.share(catalog)
+    assert memory.SHARED_BYTES.value() == 0
+
+def test_catalog_refresh_is_not_charged_to_sessions(monkeypatch):
+    import app.main as app_main
+    from types import SimpleNamespace
+    from app.services.catalog_service import Catalog
+    def catalog(tag):
+        return Catalog([], [StreetNumber(id=i, name=tag * 500, image_url="", house_number=str(i)) for i in range(20)], 0)
+    clock = Clock()
+    tracker = SessionMemoryTracker(budget_bytes=5000, interval=30, clock=clock)
+    state = {}
+    monkeypatch.setattr(app_main, "get_memory_tracker", lambda budget_mb, interval: tracker)
+    monkeypatch.setattr(app_main, "current_session_id", lambda: "s")
+    monkeypatch.setattr(app_main.st, "session_state", SimpleNamespace(to_dict=lambda: dict(state)))
+    config = SimpleNamespace(memory_session_budget_mb=0, memory_sample_interval=30)
+    before = memory.SESSION_BUDGET_EXCEEDED.value()
+
+    old = catalog("x")
+    state["streets_data"] = old.streets
+    app_main.track_session_memory(config, old)
+    # TTL refresh: the run assigns the new snapshot, then measures
+    clock.now = 31
+    new = catalog("y")
+    state["streets_data"] = new.streets
+    app_main.track_session_memory(config, new)
+    assert tracker.snapshot()["by_key"] == {"streets_data": 0}
+    assert memory.SESSION_BUDGET_EXCEEDED.value() == before
+    assert memory.SHARED_BYTES.value() == deep_size(new)
+
+def test_key_labels_fold_counts_and_hashes():
+    assert memory.key_label("gallery_streets_200_-88123") == "gallery_streets"
+    assert memory.key_label("gallery_categories_12_empty") == "gallery_categories"
+    assert memory.key_label("streets_data") == "streets_data"
+
+def test_tracker_samples_per_interval_and_publishes():
+    clock = Clock()
+    tracker = SessionMemoryTracker(budget_bytes=0, interval=30, clock=clock)
+    assert tracker.track("s1", {"streets_data": ["x" * 1000]})
+    assert tracker.track("s1", {"streets_data": []}) is None  # not due yet
+    tracker.track("s2", {"streets_data": ["y" * 3000], "gallery_streets_5_1": 1})
+    summary = tracker.snapshot()
+    assert summary["sessions"] == 2
+    assert summary["max_bytes"] > 3000
+    assert set(summary["by_key"]) == {"streets_data", "gallery_streets"}
+    assert memory.SESSIONS_TRACKED.value() == 2
+    assert memory.SESSION_STATE_BYTES.value(key="streets_data") == summary["by_key"]["streets_data"]
+    clock.now = 31
+    assert tracker.due("s1")
+
+def test_idle_sessions_are_dropped():
+    clock = Clock()
+    tracker = SessionMemoryTracker(budget_bytes=0, session_ttl=100, clock=clock)
+    tracker.track("old", {"a": 1})
+    clock.now = 200
+    tracker.track("new", {"a": 1})
+    assert tracker.snapshot()["sessions"] == 1
+
+def test_budget_warning_once_per_crossing():
+    warnings = []
+    handler = logging.Handler()
+    handler.emit = lambda record: warnings.append(record) if record.getMessage() == "Session over memory budget" else None
+    memory.logger.addHandler(handler)
+    try:
+        tracker = SessionMemoryTracker(budget_bytes=2000, clock=Clock())
+        before = memory.SESSION_BUDGET_EXCEEDED.value()
+        big = {"pending_gtag_events": ["e" * 5000]}
+        tracker.record("s", memory.measure(big))
+        tracker.record("s", memory.measure(big))
+        assert memory.SESSION_BUDGET_EXCEEDED.value() == before + 1
+        assert len(warnings) == 1
+        assert warnings[0].budget_bytes == 2000
+        tracker.record("s", memory.measure({}))
+        tracker.record("s", memory.measure(big))
+        assert memory.SESSION_BUDGET_EXCEEDED.value() == before + 2
+        assert len(warnings) == 2
+    finally:
+        memory.logger.removeHandler(handler)
+
+def test_too_many_keys_fold_into_other():
+    tracker = SessionMemoryTracker(budget_bytes=0, clock=Clock())
+    tracker.record("s", {f"key{chr(65 + i)}{chr(65 + j)}": 10 for i in range(8) for j in range(8)})
+    by_key = tracker.snapshot()["by_key"]
+    assert len(by_key) == memory.MAX_KEY_LABELS
+    assert sum(by_key.values()) == 640 and by_key[memory.OTHER_KEY] > 0
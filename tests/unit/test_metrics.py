@@ -0,0 +1,100 @@
+import socket
+import threading
+import pytest
+import requests
+from app.utils import metrics
+from app.utils.metrics import MetricsRegistry
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+def test_histogram_buckets_and_render(registry):
+    h = registry.histogram("demo_seconds", "Demo.", ("page",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        h.observe(value, page="summary")
+    cumulative, total, count = h.snapshot(page="summary")
+    assert cumulative == [1, 3, 4] and count == 4 and total == pytest.approx(4.05)
+    text = registry.render()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{page="summary",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{page="summary",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{page="summary"} 4' in text
+
+def test_registry_returns_existing_metric(registry):
+    assert registry.counter("hits_total", "Hits.") is registry.counter("hits_total", "Hits.")
+    with pytest.raises(ValueError):
+        registry.histogram("hits_total", "Hits.")
+
+def test_labels_must_match(registry):
+    c = registry.counter("hits_total", "Hits.", ("page",))
+    with pytest.raises(ValueError):
+        c.inc(phase="x")
+    c.inc(page='a"b')
+    assert 'hits_total{page="a\\"b"} 1' in registry.render()
+
+def test_spans_are_labeled_with_the_run_page():
+    metrics.PHASE_SECONDS.clear()
+    metrics.RERUN_SECONDS.clear()
+    with metrics.rerun():
+        metrics.set_page("streets")
+        with metrics.span("catalog_fetch"):
+            pass
+    assert metrics.PHASE_SECONDS.snapshot(phase="catalog_fetch", page="streets")[2] == 1
+    assert metrics.RERUN_SECONDS.snapshot(page="streets")[2] == 1
+    assert metrics.current_page() == "unknown"
+
+def test_rerun_counts_errors_and_still_times():
+    metrics.RERUN_ERRORS.clear()
+    with pytest.raises(KeyError):
+        with metrics.rerun():
+            metrics.set_page("summary")
+            raise KeyError("boom")
+    assert metrics.RERUN_ERRORS.value(page="summary") == 1
+
+def test_page_label_is_per_thread():
+    seen = {}
+    def run(page):
+        metrics.set_page(page)
+        seen[page] = metrics.current_page()
+    threads = [threading.Thread(target=run, args=(p,)) for p in ("categories", "summary")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert seen == {"categories": "categories", "summary": "summary"}
+
+def test_metrics_endpoint(registry):
+    registry.counter("served_total", "Served.").inc()
+    server = metrics.start_metrics_server("127.0.0.1", 0, registry=registry)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        resp = requests.get(url + "/metrics", timeout=5)
+        assert resp.status_code == 200
+        assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "served_total 1" in resp.text
+        assert requests.get(url + "/other", timeout=5).status_code == 404
+        # Port already taken: no second server, no exception
+        assert metrics.start_metrics_server("127.0.0.1", server.server_address[1], registry=registry) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_stop_metrics_server_frees_the_port(monkeypatch):
+    monkeypatch.setattr(metrics, "_servers", {})
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = metrics.ensure_metrics_server("127.0.0.1", port)
+    assert metrics.ensure_metrics_server("127.0.0.1", port) is server
+    metrics.stop_metrics_server("127.0.0.1", port)
+    assert metrics._servers == {}
+    with pytest.raises(requests.ConnectionError):
+        requests.get(f"http://127.0.0.1:{port}/metrics", timeout=5)
+    # Stopping again is a no-op, and the port can be bound again
+    metrics.stop_metrics_server("127.0.0.1", port)
+    restarted = metrics.ensure_metrics_server("127.0.0.1", port)
+    try:
+        assert restarted is not None and restarted is not server
+    finally:
+        metrics.stop_metrics_server("127.0.0.1", port)
@@ -0,0 +1,34 @@
+import dataclasses
+import pickle
+import pytest
+from app.utils.models import Category, split_list
+
+
+def test_split_list():
+    assert split_list(" a, b ,,a , c") == ("a", "b", "c")
+    assert split_list("") == ()
+    assert split_list(None) == ()
+
+
+def test_category_fields_are_parsed_once_at_construction():
+    category = Category(
+        id=1, name="Lighting", text="Lamp, Street LIGHT,lamp", image_url="",
+        event_call_desc="Lamp is off , Lamp flickers,",
+    )
+    assert category.options == ("Lamp is off", "Lamp flickers")
+    assert category.synonyms == ("lamp", "street light")
+    assert category.search_key == "lighting\x1flamp\x1fstreet light"
+    # Derived fields stay out of equality and repr
+    assert category == Category(1, "Lighting", "Lamp, Street LIGHT,lamp", "", "Lamp is off , Lamp flickers,")
+    assert "options" not in repr(category)
+    assert pickle.loads(pickle.dumps(category)).options == category.options
+
+
+def test_category_is_frozen():
+    category = Category(id=1, name="Lighting", text="Lamp", image_url="", event_call_desc="Lamp is off")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        category.event_call_desc = "Lamp flickers"
+    # replace() builds a new category with freshly parsed fields
+    changed = dataclasses.replace(category, event_call_desc="Lamp flickers")
+    assert changed.options == ("Lamp flickers",)
+    assert category.options == ("Lamp is off",)
@@ -0,0 +1,63 @@
+import json
+import os
+import time
+import pytest
+from app.utils import profiling
+from app.utils.profiling import ProfileStore, SamplingProfiler
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def test_token_round_trip_and_expiry():
+    token = profiling.sign_token("s3cret", 2_000)
+    assert profiling.verify_token("s3cret", token, now=1_000)
+    assert not profiling.verify_token("s3cret", token, now=3_000)
+    assert not profiling.verify_token("other", token, now=1_000)
+    assert not profiling.verify_token("s3cret", token[:-1] + "0", now=1_000)
+    assert not profiling.verify_token("", token, now=1_000)
+    assert not profiling.verify_token("s3cret", "garbage", now=1_000)
+
+def test_should_profile():
+    token = profiling.sign_token("k", int(time.time()) + 60)
+    assert profiling.should_profile(0.0, "k", token)
+    assert not profiling.should_profile(0.0, "k", "1.bad")
+    assert profiling.should_profile(0.5, rng=lambda: 0.1)
+    assert not profiling.should_profile(0.5, rng=lambda: 0.9)
+
+def test_sampler_sees_the_busy_function():
+    profiler = SamplingProfiler(interval=0.001).start()
+    busy(0.1)
+    profiler.stop()
+    assert profiler.samples > 10
+    assert "busy (" in profiler.collapsed()
+    doc = profiler.speedscope("test")
+    names = {f["name"] for f in doc["shared"]["frames"]}
+    assert "busy" in names
+    assert len(doc["profiles"][0]["samples"]) == len(doc["profiles"][0]["weights"])
+
+@pytest.mark.parametrize("fmt", profiling.FORMATS)
+def test_store_keeps_recent_and_slowest(tmp_path, fmt):
+    store = ProfileStore(str(tmp_path), fmt, keep_recent=3, keep_slowest=2)
+    for duration in (0.3, 0.1, 0.5, 0.2, 0.4):
+        profiler = SamplingProfiler()
+        profiler.stacks[(("main", "app/main.py", 1),)] = 5
+        profiler.duration = duration
+        store.save(profiler, "streets")
+    recent = os.listdir(tmp_path / "recent")
+    slowest = sorted(os.listdir(tmp_path / "slowest" / "streets"))
+    assert len(recent) == 3
+    assert [int(n.split("ms_")[0]) for n in slowest] == [400, 500]
+    if fmt == "speedscope":
+        json.loads((tmp_path / "slowest" / "streets" / slowest[0]).read_text(encoding="utf-8"))
+
+def test_profile_run_saves_under_the_final_page(tmp_path):
+    store = ProfileStore(str(tmp_path), "collapsed")
+    page = ["categories"]
+    with profiling.profile_run(store, True, lambda: page[0], interval=0.001):
+        busy(0.02)
+        page[0] = "summary/../x"
+    assert os.listdir(tmp_path / "slowest") == ["summary_.._x"]
+    with profiling.profile_run(store, False, lambda: "never") as profiler:
+        assert profiler is None
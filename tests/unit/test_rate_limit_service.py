@@ -0,0 +1,73 @@
+import pytest
+from app.services.rate_limit_service import (
+    MemoryBucketStore, RateLimit, RateLimiter, RedisBucketStore, create_bucket_store,
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+    def __call__(self):
+        return self.now
+
+def test_parse_rate_limit():
+    assert RateLimit.parse("5/60") == RateLimit(capacity=5, refill_rate=5 / 60)
+    assert RateLimit.parse("10") == RateLimit(capacity=10, refill_rate=10)
+    assert RateLimit.parse("") is None
+    assert RateLimit.parse("0") is None
+    with pytest.raises(ValueError):
+        RateLimit.parse("-1/60")
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    if request.param == "memory":
+        return MemoryBucketStore()
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return RedisBucketStore(fakeredis.FakeRedis())
+
+def test_session_bucket_refills(store):
+    clock = FakeClock()
+    limiter = RateLimiter(store, session_limit=RateLimit.parse("2/60"), clock=clock)
+    assert limiter.check(session_id="s1").allowed
+    assert limiter.check(session_id="s1").allowed
+    decision = limiter.check(session_id="s1")
+    assert not decision.allowed
+    assert decision.scope == "session"
+    assert decision.retry_after == pytest.approx(30)
+    assert RateLimiter.retry_after_seconds(decision) == 30
+    # Other sessions have their own bucket
+    assert limiter.check(session_id="s2").allowed
+    clock.now += 30
+    assert limiter.check(session_id="s1").allowed
+
+def test_phone_bucket_spans_sessions(store):
+    limiter = RateLimiter(store, session_limit=RateLimit.parse("5/60"), phone_limit=RateLimit.parse("1/3600"), clock=FakeClock())
+    assert limiter.check(session_id="a", phone="052-1234567").allowed
+    decision = limiter.check(session_id="b", phone="+972521234567")
+    assert not decision.allowed and decision.scope == "phone"
+
+def test_global_cap_and_all_or_nothing(store):
+    clock = FakeClock()
+    limiter = RateLimiter(store, session_limit=RateLimit.parse("1/60"), global_limit=RateLimit.parse("2/60"), clock=clock)
+    assert limiter.check(session_id="a").allowed
+    assert limiter.check(session_id="b").allowed
+    decision = limiter.check(session_id="c")
+    assert not decision.allowed and decision.scope == "global"
+    # The refused request did not spend session c's token
+    clock.now += 30
+    assert limiter.check(session_id="c").allowed
+
+def test_no_limits_configured():
+    limiter = RateLimiter(MemoryBucketStore())
+    assert all(limiter.check(session_id="s", phone="0521234567").allowed for _ in range(100))
+
+def test_store_errors_fail_open():
+    class BrokenStore:
+        def take(self, buckets, now, cost=1.0):
+            raise ConnectionError("down")
+    limiter = RateLimiter(BrokenStore(), global_limit=RateLimit.parse("1/60"))
+    assert limiter.check().allowed
+
+def test_create_bucket_store_falls_back_to_memory():
+    assert isinstance(create_bucket_store(""), MemoryBucketStore)
+    assert isinstance(create_bucket_store("redis://127.0.0.1:9/0"), MemoryBucketStore)
@@ -0,0 +1,108 @@
+import dataclasses
+import os
+import pytest
+from app.config import settings
+from app.config.settings import AppConfig, ConfigError, load_config
+
+VALID = {"SUPABASE_URL": "https://example.supabase.co", "SUPABASE_KEY": "key"}
+
+
+def test_defaults_and_types():
+    config = load_config({**VALID, "API_TIMEOUT": "12", "DEBUG": "true", "CATALOG_TTL": "60.5"})
+    assert config.api_timeout == 12
+    assert config.debug_mode is True
+    assert config.catalog_ttl == 60.5
+    assert config.metrics_port == 9464
+    # Set but empty disables
+    assert load_config({**VALID, "METRICS_PORT": ""}).metrics_port == 0
+
+
+def test_config_is_frozen_and_hashable():
+    config = load_config(VALID)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.api_timeout = 5
+    assert hash(config) == hash(load_config(dict(VALID)))
+
+
+def test_every_field_has_an_environment_variable():
+    assert set(settings.ENVIRONMENT) == {f.name for f in dataclasses.fields(AppConfig)}
+
+
+def test_invalid_values_are_reported_together():
+    with pytest.raises(ConfigError) as e:
+        load_config({
+            "SUPABASE_URL": "example.supabase.co", "API_ENDPOINT": "ftp://x", "API_TIMEOUT": "0",
+            "RATE_LIMIT_PHONE": "often", "PROFILE_SAMPLE_RATE": "2",
+        })
+    message = str(e.value)
+    for name in ("SUPABASE_URL", "SUPABASE_KEY", "API_ENDPOINT", "API_TIMEOUT", "RATE_LIMIT_PHONE", "PROFILE_SAMPLE_RATE"):
+        assert name in message
+    assert "RATE_LIMIT_SESSION" not in message
+
+
+def test_unparsable_number_names_the_variable():
+    with pytest.raises(ConfigError, match="METRICS_PORT: expected int, got 'http'"):
+        load_config({**VALID, "METRICS_PORT": "http"})
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    """A .env file and a fresh process-wide config around it."""
+    path = tmp_path / ".env"
+    path.write_text("SUPABASE_URL=https://one.supabase.co\nSUPABASE_KEY=key\n")
+    monkeypatch.setattr(settings, "ENV_PATH", str(path))
+    monkeypatch.setattr(settings, "_config", None)
+    monkeypatch.setattr(settings, "_listeners", {})
+    monkeypatch.setattr(settings, "_dotenv_keys", set())
+    for name in ("SUPABASE_URL", "SUPABASE_KEY", "API_TIMEOUT"):
+        monkeypatch.delenv(name, raising=False)
+    yield path
+    for name in settings._dotenv_keys:
+        os.environ.pop(name, None)
+
+
+def test_get_config_is_loaded_once(env):
+    settings.load_env()
+    config = settings.get_config()
+    env.write_text("SUPABASE_URL=https://two.supabase.co\nSUPABASE_KEY=key\n")
+    assert settings.get_config() is config
+
+
+def test_reload_applies_env_file_and_notifies(env):
+    settings.load_env()
+    old = settings.get_config()
+    seen = []
+    settings.on_change("test", lambda a, b: seen.append((a.supabase_url, b.supabase_url)))
+    env.write_text("SUPABASE_URL=https://two.supabase.co\nSUPABASE_KEY=key\nAPI_TIMEOUT=5\n")
+    new = settings.reload_config()
+    assert settings.get_config() is new
+    assert (new.supabase_url, new.api_timeout) == ("https://two.supabase.co", 5)
+    assert seen == [(old.supabase_url, "https://two.supabase.co")]
+    # Unchanged: same object, no callback
+    assert settings.reload_config() is new
+    assert len(seen) == 1
+    # Removed from .env: back to the default
+    env.write_text("SUPABASE_URL=https://two.supabase.co\nSUPABASE_KEY=key\n")
+    assert settings.reload_config().api_timeout == 30
+
+
+def test_environment_wins_over_env_file(env, monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://real.supabase.co")
+    settings.load_env()
+    assert settings.get_config().supabase_url == "https://real.supabase.co"
+
+
+def test_invalid_reload_keeps_current_config(env):
+    settings.load_env()
+    config = settings.get_config()
+    env.write_text("SUPABASE_URL=nope\nSUPABASE_KEY=key\n")
+    assert settings.reload_config() is config
+
+
+def test_reload_request_is_served_by_next_get_config(env, monkeypatch):
+    settings.load_env()
+    settings.get_config()
+    env.write_text("SUPABASE_URL=https://two.supabase.co\nSUPABASE_KEY=key\n")
+    monkeypatch.setattr(settings, "_reload_requested", True)
+    assert settings.get_config().supabase_url == "https://two.supabase.co"
+    assert settings._reload_requested is False
@@ -0,0 +1,56 @@
+import hashlib
+import logging
+import os
+import tomllib
+from types import SimpleNamespace
+from app.utils import static_assets
+from app.utils.image_assets import IMAGES_DIR, load_manifest
+
+
+def test_asset_url_carries_content_hash():
+    with open(os.path.join(static_assets.STATIC_DIR, "app.css"), "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    assert static_assets.asset_url("app.css") == f"app/static/app.css?v={digest}"
+
+
+def test_stylesheet_html_links_or_inlines():
+    linked = static_assets.stylesheet_html("rtl.css")
+    assert linked == f'<style>@import url("{static_assets.asset_url("rtl.css")}");</style>'
+    inlined = static_assets.stylesheet_html("rtl.css", linked=False)
+    assert inlined.startswith("<style>") and "direction: rtl" in inlined
+
+
+def test_no_static_serving_outside_a_script_run():
+    assert not static_assets.static_serving_available()
+
+
+def test_streamlit_app_entry_point_serves_static_dir(monkeypatch):
+    # Streamlit Cloud and app.serve both run streamlit_app.py with this config
+    with open(os.path.join(static_assets.ROOT, ".streamlit", "config.toml"), "rb") as f:
+        assert tomllib.load(f)["server"]["enableStaticServing"] is True
+    monkeypatch.setattr(static_assets.st, "get_option", lambda name: True)
+    ctx = SimpleNamespace(main_script_path=os.path.join(static_assets.ROOT, "streamlit_app.py"))
+    monkeypatch.setattr(static_assets, "get_script_run_ctx", lambda: ctx)
+    assert static_assets.static_serving_available()
+    # The banner's files are in the served directory
+    assert os.path.dirname(IMAGES_DIR) == static_assets.STATIC_DIR
+    assert load_manifest()["banner"]["variants"]
+    ctx.main_script_path = os.path.join(static_assets.ROOT, "app", "main.py")
+    assert not static_assets.static_serving_available()
+
+
+def test_inline_fallback_warns_once(monkeypatch):
+    monkeypatch.setattr(static_assets.st, "html", lambda body: None)
+    static_assets._warn_inlined.cache_clear()
+    warnings = []
+    handler = logging.Handler()
+    handler.emit = lambda record: warnings.append(record) if record.getMessage().startswith("Static files are not served") else None
+    static_assets.logger.addHandler(handler)
+    try:
+        static_assets.stylesheet("app.css")
+        static_assets.stylesheet("rtl.css")
+    finally:
+        static_assets.logger.removeHandler(handler)
+        static_assets._warn_inlined.cache_clear()
+    assert len(warnings) == 1
+    assert warnings[0].entry_point == static_assets.ENTRY_POINT
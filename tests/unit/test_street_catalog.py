@@ -0,0 +1,84 @@
+import pickle
+import pytest
+from app.services.catalog_service import SearchIndex
+from app.utils import synthetic_data
+from app.utils.memory import deep_size
+from app.utils.models import StreetNumber
+from app.utils.street_catalog import StreetCatalog, StreetSelection
+
+ROWS = [
+    (1, "Herzl 10", "herzl.png", "10"),
+    (2, "Herzl 12a", "herzl.png", "12a"),
+    (3, "Ben Gurion 22A", "", "22A"),
+    (4, "Straße 5", None, None),
+]
+
+
+@pytest.fixture
+def catalog():
+    return StreetCatalog(ROWS)
+
+
+def test_rows_round_trip(catalog):
+    assert len(catalog) == 4
+    assert catalog[1] == StreetNumber(id=2, name="Herzl 12a", image_url="herzl.png", house_number="12a")
+    assert catalog[-1].house_number is None
+    assert [s.id for s in catalog] == [1, 2, 3, 4]
+    assert catalog.column("name") == [r[1] for r in ROWS]
+
+
+def test_from_rows_and_records_agree(catalog):
+    dicts = [dict(zip(synthetic_data.STREET_COLUMNS, row)) for row in ROWS]
+    assert list(StreetCatalog.from_rows(dicts)) == list(catalog)
+    assert list(StreetCatalog.from_records(list(catalog))) == list(catalog)
+
+
+def test_repeated_values_are_stored_once(catalog):
+    assert catalog._image_urls.values == ["herzl.png", "", None]
+
+
+def test_search(catalog):
+    assert catalog.search("") is catalog
+    result = catalog.search("herzl")
+    assert isinstance(result, StreetSelection)
+    assert result.column("id") == [1, 2]
+    assert catalog.search("22a").column("id") == [3]
+    assert catalog.search("STRASSE").column("id") == [4]
+    assert len(catalog.search("nowhere")) == 0
+    # Never across the name/house number boundary or between rows
+    assert len(catalog.search("1010")) == 0
+    assert len(catalog.search("a2")) == 0
+
+
+def test_selection_behaves_like_a_list(catalog):
+    result = catalog.search("herzl")
+    assert [s.name for s in result] == ["Herzl 10", "Herzl 12a"]
+    assert result[-1].id == 2
+    assert result[:1].column("id") == [1]
+    with pytest.raises(IndexError):
+        result[2]
+
+
+def test_search_matches_row_by_row_index():
+    streets = synthetic_data.street_numbers(2_000, seed=3)
+    catalog = StreetCatalog.from_records(streets)
+    index = SearchIndex(streets, ("name", "house_number"))
+    for query in ("הרצל", "12", "א", "ויצמן 3", "no-such-street"):
+        assert catalog.search(query).column("id") == [s.id for s in index.search(query)]
+
+
+def test_lookup_by_id(catalog):
+    assert catalog.get("3").name == "Ben Gurion 22A"
+    assert catalog.get(4).id == 4
+    assert catalog.get("99") is None
+    assert catalog.get("abc") is None
+
+
+def test_pickles(catalog):
+    assert list(pickle.loads(pickle.dumps(catalog))) == list(catalog)
+
+
+def test_smaller_than_row_objects():
+    streets = synthetic_data.street_numbers(10_000)
+    catalog = StreetCatalog.from_records(streets)
+    assert deep_size(catalog) * 3 < deep_size(streets)
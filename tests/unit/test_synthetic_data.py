@@ -0,0 +1,62 @@
+import pytest
+from app.utils import synthetic_data
+from app.utils.models import Category, StreetNumber, UserData
+from app.utils.validation import validate_user_data
+
+def test_same_seed_same_rows():
+    assert list(synthetic_data.street_rows(500, seed=3)) == list(synthetic_data.street_rows(500, seed=3))
+    assert list(synthetic_data.user_rows(50, seed=3)) == list(synthetic_data.user_rows(50, seed=3))
+    assert list(synthetic_data.user_rows(50, seed=3)) != list(synthetic_data.user_rows(50, seed=4))
+
+def test_street_rows_are_unique_and_sequential():
+    rows = list(synthetic_data.street_rows(20_000))
+    assert [r[0] for r in rows] == list(range(1, 20_001))
+    assert len({r[1] for r in rows}) == len(rows)
+    # Name ends with the house number it carries
+    assert all(name.endswith(" " + house) for _, name, _, house in rows)
+    assert len({name.rsplit(" ", 1)[0] for _, name, _, _ in rows}) > 100
+
+def test_street_names_stay_unique_past_the_base_list():
+    count = len(synthetic_data.STREET_NAMES) * len(synthetic_data.STREET_PREFIXES) * 3
+    names = [synthetic_data.street_name(i) for i in range(count)]
+    assert len(set(names)) == count
+
+def test_categories_have_comma_separated_lists():
+    categories = synthetic_data.categories(30)
+    assert all(isinstance(c, Category) for c in categories)
+    assert len({c.name for c in categories}) == 30
+    assert all(len(c.text.split(",")) >= 2 and c.event_call_desc for c in categories)
+
+def test_users_pass_validation():
+    users = synthetic_data.users(1000, seed=1)
+    assert all(isinstance(u, UserData) for u in users)
+    assert all(validate_user_data(u).is_valid for u in users)
+    assert all(synthetic_data.is_valid_israeli_id(u.user_id) for u in users)
+    assert all(u.phone.startswith("05") and len(u.phone) == 10 for u in users)
+
+def test_israeli_id_check_digit():
+    assert synthetic_data.is_valid_israeli_id("123456782")
+    assert not synthetic_data.is_valid_israeli_id("123456789")
+    assert not synthetic_data.is_valid_israeli_id("12345678")
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_write_rows(tmp_path, fmt):
+    path = tmp_path / f"streets.{fmt}"
+    written = synthetic_data.write_rows(str(path), synthetic_data.STREET_COLUMNS, synthetic_data.street_rows(120), batch_size=50)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert written == 120
+    assert len(lines) == (121 if fmt == "csv" else 120)
+
+def test_street_numbers_models():
+    streets = synthetic_data.street_numbers(10)
+    assert all(isinstance(s, StreetNumber) for s in streets)
+
+def test_sqlite_cli_writes_catalog(tmp_path):
+    db_path = str(tmp_path / "catalog.sqlite")
+    synthetic_data.main(["--categories", "5", "--streets", "30", "--sqlite", db_path])
+    conn = synthetic_data.connect(db_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0] == 5
+        assert conn.execute("SELECT COUNT(*) FROM street_numbers").fetchone()[0] == 30
+    finally:
+        conn.close()
@@ -0,0 +1,105 @@
+import json
+import pytest
+import requests
+from app.services import warmup
+from app.services.warmup import Warmup
+from app.utils import metrics
+from app.utils.metrics import MetricsRegistry
+
+
+def test_failed_steps_are_retried_until_ready():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("not yet")
+
+    ran = []
+    w = Warmup([("first", lambda: ran.append("first")), ("flaky", flaky)], retry_interval=0)
+    w.run()
+    assert w.ready.is_set()
+    assert ran == ["first"]  # succeeded steps are not repeated
+    assert len(attempts) == 3
+    assert w.status()["errors"] == {}
+
+
+def test_status_reports_pending_steps_and_errors():
+    w = Warmup([("ok", lambda: None), ("broken", lambda: 1 / 0)])
+    for name, step in w.steps:
+        w._run_step(name, step)
+    state = w.status()
+    assert state["ready"] is False
+    assert state["pending"] == ["broken"]
+    assert state["errors"]["broken"].startswith("ZeroDivisionError")
+
+
+@pytest.fixture
+def current(monkeypatch):
+    w = Warmup([("step", lambda: None)])
+    monkeypatch.setattr(warmup, "_warmup", w)
+    return w
+
+
+def test_ready_endpoint(current):
+    server = metrics.start_metrics_server(
+        "127.0.0.1", 0, registry=MetricsRegistry(), routes={"/ready": warmup.readiness}
+    )
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/ready"
+        resp = requests.get(url, timeout=5)
+        assert resp.status_code == 503
+        assert resp.json()["pending"] == ["step"]
+        current.run()
+        resp = requests.get(url, timeout=5)
+        assert resp.status_code == 200
+        assert resp.headers["Content-Type"] == "application/json"
+        assert json.loads(resp.text)["ready"] is True
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_config_change_reruns_dependent_steps(monkeypatch):
+    from types import SimpleNamespace
+    endpoints = []
+    monkeypatch.setattr(warmup, "_warm_api", lambda config: endpoints.append(config.api_endpoint))
+    monkeypatch.setattr(warmup, "_load_catalog", lambda config: None)
+    monkeypatch.setattr(warmup.i18n, "compile_translations", lambda lang: None)
+    fields = {name: "" for settings in warmup.CONFIG_STEPS.values() for name in settings}
+    old = SimpleNamespace(**{**fields, "api_endpoint": "http://old", "warmup_retry_interval": 0})
+    w = Warmup(warmup.build_steps(old), retry_interval=0)
+    w.run()
+    monkeypatch.setattr(warmup, "_warmup", w)
+    # Unrelated settings rerun nothing
+    warmup._on_config_change(old, SimpleNamespace(**vars(old)))
+    assert w._thread is None and endpoints == ["http://old"]
+
+    warmup._on_config_change(old, SimpleNamespace(**{**vars(old), "api_endpoint": "http://new"}))
+    # Still ready while the step reruns against the new endpoint
+    assert w.status()["ready"] is True
+    thread = w._thread  # None once the rerun has already finished
+    if thread is not None:
+        thread.join(5)
+    assert endpoints == ["http://old", "http://new"]
+    assert w.status()["pending"] == [] and w.status()["ready"] is True
+
+
+def test_failed_step_retries_with_reloaded_config(monkeypatch):
+    from types import SimpleNamespace
+    monkeypatch.setattr(warmup, "_load_catalog", lambda config: None)
+    monkeypatch.setattr(warmup.i18n, "compile_translations", lambda lang: None)
+    def warm_api(config):
+        if config.api_endpoint == "http://typo":
+            raise ConnectionError("unreachable")
+    monkeypatch.setattr(warmup, "_warm_api", warm_api)
+    fields = {name: "" for settings in warmup.CONFIG_STEPS.values() for name in settings}
+    bad = SimpleNamespace(**{**fields, "api_endpoint": "http://typo", "warmup_retry_interval": 0})
+    fixed = SimpleNamespace(**{**vars(bad), "api_endpoint": "http://incidents"})
+    # The operator fixes .env; the retry round's config check picks it up
+    w = Warmup(warmup.build_steps(bad), retry_interval=0,
+               before_retry=lambda: warmup._on_config_change(bad, fixed))
+    monkeypatch.setattr(warmup, "_warmup", w)
+    w.run()
+    assert w.status()["ready"] is True
+    assert w.status()["errors"] == {}